@@ -0,0 +1 @@
+# 오프라인 벤치마크: 기록/합성된 Notion 응답을 재생하는 스텁 클라이언트 위에서 성능을 측정합니다.
@@ -0,0 +1,191 @@
+import json
+import random
+import asyncio
+from collections import Counter
+
+FIXTURE_VERSION = 1
+
+class FixtureRateLimitError(Exception):
+    """429 응답을 흉내 내는 예외. notion_client의 rate_limited 오류와 같은 code/status를 가집니다."""
+    code = "rate_limited"
+    status = 429
+
+    def __init__(self, retry_after=1.0):
+        super().__init__("Rate limited (fixture)")
+        self.retry_after = retry_after
+
+class _Endpoint:
+    def __init__(self, client):
+        self._client = client
+
+class _PagesEndpoint(_Endpoint):
+    async def retrieve(self, page_id, **kwargs):
+        return await self._client._respond("pages.retrieve", lambda: self._client._object("pages", page_id))
+
+class _BlocksChildrenEndpoint(_Endpoint):
+    async def list(self, block_id, page_size=100, start_cursor=None, **kwargs):
+        return await self._client._respond(
+            "blocks.children.list",
+            lambda: self._client.children_response(block_id, page_size, start_cursor),
+        )
+
+class _BlocksEndpoint(_Endpoint):
+    def __init__(self, client):
+        super().__init__(client)
+        self.children = _BlocksChildrenEndpoint(client)
+
+    async def retrieve(self, block_id, **kwargs):
+        return await self._client._respond("blocks.retrieve", lambda: self._client._object("blocks", block_id))
+
+class _DatabasesEndpoint(_Endpoint):
+    async def retrieve(self, database_id, **kwargs):
+        return await self._client._respond("databases.retrieve", lambda: self._client._object("databases", database_id))
+
+class _DataSourcesEndpoint(_Endpoint):
+    async def query(self, data_source_id, page_size=100, start_cursor=None, **kwargs):
+        return await self._client._respond(
+            "data_sources.query",
+            lambda: self._client.query_response(data_source_id, page_size, start_cursor),
+        )
+
+class FixtureNotionClient:
+    """notion_client.AsyncClient와 같은 모양(search, pages.retrieve, blocks.children.list, databases.retrieve,
+    data_sources.query 등)으로
+    픽스처 데이터를 돌려주는 스텁입니다.
+    - latency_ms / jitter_ms: 호출마다 지연을 흉내 냅니다.
+    - rate_limit_ratio: 해당 비율로 429(FixtureRateLimitError)를 발생시킵니다.
+    응답은 미리 직렬화된 JSON을 매번 디코딩해 실제 클라이언트처럼 새 dict를 반환합니다.
+    """
+
+    def __init__(self, fixture, latency_ms=0.0, jitter_ms=0.0, rate_limit_ratio=0.0, seed=0):
+        self.fixture = fixture
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.calls = Counter()
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._encoded = {
+            kind: {obj_id: json.dumps(obj, ensure_ascii=False) for obj_id, obj in fixture.get(kind, {}).items()}
+            for kind in ("pages", "blocks", "databases")
+        }
+        self.pages = _PagesEndpoint(self)
+        self.blocks = _BlocksEndpoint(self)
+        self.databases = _DatabasesEndpoint(self)
+        self.data_sources = _DataSourcesEndpoint(self)
+
+    async def _respond(self, endpoint, build):
+        self.calls[endpoint] += 1
+        if self.latency_ms or self.jitter_ms:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            await asyncio.sleep(delay / 1000)
+        if self.rate_limit_ratio and self._rng.random() < self.rate_limit_ratio:
+            self.rate_limited += 1
+            raise FixtureRateLimitError()
+        return build()
+
+    def _object(self, kind, obj_id):
+        encoded = self._encoded[kind].get(obj_id)
+        if encoded is None:
+            raise KeyError(f"픽스처에 없는 {kind} ID: {obj_id}")
+        return json.loads(encoded)
+
+    def _list_page(self, kind, ids, page_size, start_cursor):
+        offset = int(start_cursor) if start_cursor else 0
+        page_ids = ids[offset:offset + page_size]
+        next_offset = offset + len(page_ids)
+        has_more = next_offset < len(ids)
+        return {
+            "object": "list",
+            "results": [self._object(kind, obj_id) for obj_id in page_ids],
+            "next_cursor": str(next_offset) if has_more else None,
+            "has_more": has_more,
+        }
+
+    def search_response(self, query=None, sort=None, page_size=100, start_cursor=None):
+        pages = list(self.fixture["pages"].values())
+        if query:
+            pages = [p for p in pages if query.lower() in json.dumps(p.get("properties", {}), ensure_ascii=False).lower()]
+        if sort and sort.get("timestamp") == "last_edited_time":
+            pages.sort(key=lambda p: p.get("last_edited_time", ""), reverse=sort.get("direction") != "ascending")
+        return self._list_page("pages", [p["id"] for p in pages], page_size, start_cursor)
+
+    def children_response(self, block_id, page_size=100, start_cursor=None):
+        return self._list_page("blocks", self.fixture["children"].get(block_id, []), page_size, start_cursor)
+
+    def query_response(self, data_source_id, page_size=100, start_cursor=None):
+        rows = self.fixture.get("data_source_rows", {}).get(data_source_id)
+        if rows is None:
+            raise KeyError(f"픽스처에 없는 data_sources ID: {data_source_id}")
+        return self._list_page("pages", rows, page_size, start_cursor)
+
+    async def search(self, query=None, filter=None, sort=None, page_size=100, start_cursor=None, **kwargs):
+        return await self._respond("search", lambda: self.search_response(query, sort, page_size, start_cursor))
+
+    def stats(self):
+        return {"calls": dict(self.calls), "rate_limited": self.rate_limited}
+
+def empty_fixture():
+    return {"version": FIXTURE_VERSION, "pages": {}, "blocks": {}, "children": {}, "databases": {}, "data_source_rows": {}}
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        fixture = json.load(f)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"지원하지 않는 픽스처 버전: {fixture.get('version')}")
+    return fixture
+
+def save_fixture(fixture, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False)
+
+async def record_workspace(notion, max_pages=None):
+    """실제 AsyncClient로 워크스페이스를 순회하며 search/pages/blocks 응답을 픽스처로 기록합니다."""
+    fixture = empty_fixture()
+    start_cursor = None
+    while True:
+        response = await notion.search(filter={"property": "object", "value": "page"}, page_size=100, start_cursor=start_cursor)
+        for page in response.get("results", []):
+            fixture["pages"][page["id"]] = page
+        start_cursor = response.get("next_cursor")
+        if not start_cursor or (max_pages and len(fixture["pages"]) >= max_pages):
+            break
+
+    async def record_database(database_id):
+        database = await notion.databases.retrieve(database_id=database_id)
+        fixture["databases"][database_id] = database
+        for data_source in database.get("data_sources") or []:
+            rows = []
+            next_cursor = None
+            while True:
+                response = await notion.data_sources.query(data_source_id=data_source["id"], page_size=100,
+                                                            start_cursor=next_cursor)
+                for row in response.get("results", []):
+                    fixture["pages"].setdefault(row["id"], row)
+                    rows.append(row["id"])
+                next_cursor = response.get("next_cursor")
+                if not next_cursor:
+                    break
+            fixture["data_source_rows"][data_source["id"]] = rows
+
+    async def record_children(block_id):
+        ids = []
+        next_cursor = None
+        while True:
+            response = await notion.blocks.children.list(block_id=block_id, page_size=100, start_cursor=next_cursor)
+            for block in response.get("results", []):
+                fixture["blocks"][block["id"]] = block
+                ids.append(block["id"])
+                if block.get("type") == "child_database" and block["id"] not in fixture["databases"]:
+                    await record_database(block["id"])
+                # 하위 페이지 본문은 해당 페이지 차례에서 기록
+                if block.get("has_children") and block.get("type") != "child_page":
+                    await record_children(block["id"])
+            next_cursor = response.get("next_cursor")
+            if not next_cursor:
+                break
+        fixture["children"][block_id] = ids
+
+    for page_id in list(fixture["pages"]):
+        await record_children(page_id)
+    return fixture
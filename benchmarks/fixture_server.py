@@ -0,0 +1,133 @@
+"""픽스처를 Notion API처럼 HTTP로 제공하는 로컬 서버.
+
+    python -m benchmarks.fixture_server --port 8765                # 합성 워크스페이스
+    python -m benchmarks.fixture_server --fixture ws.json
+
+실제 notion_client를 base_url=http://127.0.0.1:<port> 로 연결해 전송 계층(연결 풀, JSON 디코딩)까지 측정할 때 씁니다.
+지원: POST /v1/search, GET /v1/pages/<id>, GET /v1/blocks/<id>, GET /v1/blocks/<id>/children,
+      GET /v1/databases/<id>, POST /v1/data_sources/<id>/query
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.fixture_client import FixtureNotionClient, load_fixture
+from benchmarks.workspace import generate_workspace
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive 연결을 유지해야 클라이언트 연결 풀의 효과가 드러남
+    protocol_version = "HTTP/1.1"
+    server_version = "NotionFixture/1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        fixture = self.server.fixture_client
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        try:
+            if method == "POST" and parts == ["v1", "search"]:
+                response = fixture.search_response(body.get("query"), body.get("sort"), int(body.get("page_size", 100)),
+                                                   body.get("start_cursor"))
+            elif method == "GET" and len(parts) == 3 and parts[:2] == ["v1", "pages"]:
+                response = fixture._object("pages", parts[2])
+            elif method == "GET" and len(parts) == 3 and parts[:2] == ["v1", "blocks"]:
+                response = fixture._object("blocks", parts[2])
+            elif method == "GET" and len(parts) == 4 and parts[:2] == ["v1", "blocks"] and parts[3] == "children":
+                response = fixture.children_response(parts[2], int(query.get("page_size", 100)), query.get("start_cursor"))
+            elif method == "GET" and len(parts) == 3 and parts[:2] == ["v1", "databases"]:
+                response = fixture._object("databases", parts[2])
+            elif method == "POST" and len(parts) == 4 and parts[:2] == ["v1", "data_sources"] and parts[3] == "query":
+                response = fixture.query_response(parts[2], int(body.get("page_size", 100)), body.get("start_cursor"))
+            else:
+                self._send(400, {"object": "error", "status": 400, "code": "invalid_request_url",
+                                 "message": f"지원하지 않는 요청: {method} {url.path}"})
+                return
+        except KeyError as e:
+            self._send(404, {"object": "error", "status": 404, "code": "object_not_found", "message": str(e)})
+            return
+        self.server.requests += 1
+        self._send(200, response)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+class FixtureServer:
+    """픽스처를 제공하는 HTTP 서버를 백그라운드 스레드에서 실행합니다. with 블록으로 쓰거나 start()/stop()을 호출합니다."""
+
+    def __init__(self, fixture, host="127.0.0.1", port=0, latency_ms=0.0):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixture_client = FixtureNotionClient(fixture)
+        self.httpd.latency_ms = latency_ms
+        self.httpd.requests = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="픽스처를 Notion API처럼 제공하는 로컬 HTTP 서버")
+    parser.add_argument("--fixture", help="기록된 픽스처 JSON 경로 (없으면 합성 워크스페이스 사용)")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-rows", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    if args.fixture:
+        fixture = load_fixture(args.fixture)
+    else:
+        fixture = generate_workspace(args.width, args.depth, args.blocks, args.seed, args.database_rows)
+    server = FixtureServer(fixture, args.host, args.port, args.latency_ms)
+    # 벤치마크가 포트를 읽을 수 있도록 첫 줄에 주소를 출력
+    print(server.base_url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
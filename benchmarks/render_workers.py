@@ -0,0 +1,105 @@
+"""렌더링 워커 수에 따른 내보내기 처리량 측정 (픽스처 워크스페이스 대상).
+
+    python -m benchmarks.render_workers --workers 1 2 4 --slots 2 --pages 40
+    python -m benchmarks.render_workers --workers 3 --kill-after 10          # 렌더링 10개 후 워커 하나를 종료
+    python -m benchmarks.render_workers --url http://host1:9100 --url http://host2:9100
+
+워커 수마다 로컬 워커 프로세스(python -m render_worker)를 띄워 전체 내보내기를 실행하고,
+초당 페이지 수와 워커별 렌더링 수, 다른 워커로 다시 보낸 횟수를 출력합니다. --url을 주면 이미 실행 중인 워커를 씁니다.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.startup import ROOT_DIR
+from benchmarks.workspace import generate_workspace
+from render_worker import RenderWorkerPool, set_render_worker_pool
+from tracing import Tracer, use_tracer
+
+def start_workers(count, slots):
+    """워커 프로세스를 count개 띄우고 [(프로세스, URL)]을 반환합니다."""
+    workers = []
+    try:
+        for _ in range(count):
+            command = [sys.executable, "-m", "render_worker", "--port", "0", "--slots", str(slots)]
+            proc = subprocess.Popen(command, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True)
+            url = proc.stdout.readline().strip()
+            if not url:
+                proc.kill()
+                raise RuntimeError("렌더링 워커를 시작하지 못했습니다")
+            workers.append((proc, url))
+    except BaseException:
+        stop_workers(workers)
+        raise
+    return workers
+
+def stop_workers(workers):
+    for proc, _ in workers:
+        if proc.poll() is None:
+            proc.terminate()
+        proc.wait()
+
+async def run_export(fixture, urls, pages, kill_after=None, on_kill=None):
+    """urls의 워커로 pages개 페이지를 내보내고 (소요 초, 워커 풀, 트레이서)를 반환합니다."""
+    from exporter import export_and_merge_pdf
+    client = FixtureNotionClient(fixture)
+    page_ids = list(fixture["pages"])[:pages]
+    pool = RenderWorkerPool(urls)
+    set_render_worker_pool(pool)
+    tracer = Tracer("render_workers")
+
+    def progress(current, total):
+        if kill_after is not None and current == kill_after and on_kill is not None:
+            on_kill()
+
+    try:
+        with tempfile.TemporaryDirectory() as out_dir, use_tracer(tracer):
+            start = time.perf_counter()
+            await export_and_merge_pdf(page_ids, os.path.join(out_dir, "bench.pdf"), progress, notion_client=client)
+            elapsed = time.perf_counter() - start
+    finally:
+        set_render_worker_pool(None)
+    return elapsed, pool, tracer
+
+def report(label, pages, elapsed, pool, tracer):
+    rendered = ", ".join(f"{worker.url.rsplit(':', 1)[-1]}={worker.rendered}" for worker in pool.workers)
+    retries = tracer.counters.get("render.worker_retries", 0)
+    print(f"{label:<10}{pages / elapsed:>10.2f}{retries:>8}  {rendered}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="렌더링 워커 수에 따른 내보내기 처리량")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--slots", type=int, default=2, help="워커당 동시 렌더링 수")
+    parser.add_argument("--url", action="append", help="이미 실행 중인 워커 주소 (여러 번 지정 가능)")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--kill-after", type=int, default=None, help="이만큼 렌더링한 뒤 첫 번째 로컬 워커를 종료")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    fixture = generate_workspace(args.width, args.depth, args.blocks)
+    pages = min(args.pages, len(fixture["pages"]))
+    print(f"{pages}개 페이지 내보내기")
+    print(f"{'워커':<10}{'페이지/초':>10}{'재전송':>8}  워커별 렌더링 수")
+    if args.url:
+        elapsed, pool, tracer = asyncio.run(run_export(fixture, args.url, pages))
+        report(f"{len(args.url)}개", pages, elapsed, pool, tracer)
+        return 0
+    for count in args.workers:
+        workers = start_workers(count, args.slots)
+        try:
+            kill = (lambda: workers[0][0].kill()) if args.kill_after else None
+            elapsed, pool, tracer = asyncio.run(run_export(fixture, [url for _, url in workers], pages,
+                                                           args.kill_after, kill))
+            report(f"{count}개", pages, elapsed, pool, tracer)
+        finally:
+            stop_workers(workers)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
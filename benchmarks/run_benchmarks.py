@@ -0,0 +1,263 @@
+"""오프라인 벤치마크 실행기.
+
+    python -m benchmarks.run_benchmarks                       # 합성 워크스페이스
+    python -m benchmarks.run_benchmarks --fixture ws.json     # 기록된 픽스처 재생
+    python -m benchmarks.run_benchmarks --record ws.json      # 실제 워크스페이스 기록 (NOTION_API_KEY 필요)
+    python -m benchmarks.run_benchmarks --update-baseline     # 현재 결과를 기준값으로 저장
+
+기준값보다 tolerance 이상 느려진 항목이 있거나, 앱 시작 시 무거운 모듈을 가져오면 종료 코드 1을 반환합니다.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from benchmarks.fixture_client import FixtureNotionClient, load_fixture, save_fixture, record_workspace
+from benchmarks.workspace import generate_workspace
+from benchmarks.startup import measure_startup
+from block_cache import BlockCache, set_block_cache
+from block_model import BLOCK_MODEL_VERSION, Block, blocks_to_json, blocks_from_json
+from page_cache import PageCache, set_page_cache
+from notion_api import get_root_pages, build_page_tree, fetch_all_child_blocks
+from utils import PageMeta
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+async def bench_get_root_pages(client, ctx):
+    root_pages, all_pages = await get_root_pages(client)
+    ctx["root_pages"] = root_pages
+    ctx["all_pages"] = all_pages
+
+async def bench_build_page_tree(client, ctx):
+    await build_page_tree(client, ctx["root_pages"])
+
+async def bench_fetch_all_child_blocks(client, ctx):
+    ctx["blocks"] = {}
+    for page in ctx["all_pages"]:
+        ctx["blocks"][page.id] = await fetch_all_child_blocks(client, page.id)
+
+async def bench_blocks_to_html(client, ctx):
+    from exporter import blocks_to_html
+    for blocks in ctx["blocks"].values():
+        await blocks_to_html(blocks, client)
+
+SEARCH_QUERIES = ["프로", "ㅍㄹㅈ", "프로제", "api", "1.2", "설계 1"]
+
+async def bench_search_index(client, ctx):
+    # 색인 구축 후 검색어별 조회 (트리 필터링의 핵심 비용)
+    from search_index import PageSearchIndex
+    index = PageSearchIndex()
+    for page in ctx["all_pages"]:
+        index.add_page(page)
+    index.prepare()
+    for query in SEARCH_QUERIES:
+        index.search(query)
+
+async def bench_export_end_to_end(client, ctx):
+    from exporter import export_and_merge_pdf
+    page_ids = [p.id for p in ctx["all_pages"]][:ctx["export_pages"]]
+    with tempfile.TemporaryDirectory() as out_dir:
+        result = await export_and_merge_pdf(page_ids, os.path.join(out_dir, "bench.pdf"), notion_client=client)
+        if not result:
+            raise RuntimeError("PDF가 생성되지 않았습니다")
+
+CASES = [
+    ("get_root_pages", bench_get_root_pages),
+    ("build_page_tree", bench_build_page_tree),
+    ("fetch_all_child_blocks", bench_fetch_all_child_blocks),
+    ("blocks_to_html", bench_blocks_to_html),
+    ("search_index", bench_search_index),
+    ("export_end_to_end", bench_export_end_to_end),
+]
+
+def run_suite(fixture, args):
+    """각 케이스를 repeat번 실행해 {케이스: [초, ...]}를 반환합니다. 실패한 케이스는 건너뜁니다."""
+    results = {}
+    skipped = {}
+    for _ in range(args.repeat):
+        client = FixtureNotionClient(fixture, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                     rate_limit_ratio=args.rate_limit_ratio, seed=args.seed)
+        ctx = {"export_pages": args.export_pages}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # 매 반복마다 빈 블록/페이지 캐시에서 시작 (이전 반복의 캐시가 측정을 가리지 않도록)
+            set_block_cache(BlockCache(cache_dir=cache_dir))
+            set_page_cache(PageCache())
+            for name, case in CASES:
+                if name in skipped or (name == "export_end_to_end" and args.skip_export):
+                    continue
+                loop = asyncio.new_event_loop()
+                try:
+                    start = time.perf_counter()
+                    loop.run_until_complete(case(client, ctx))
+                    results.setdefault(name, []).append(time.perf_counter() - start)
+                except Exception as e:
+                    skipped[name] = (str(e).splitlines() or [type(e).__name__])[0]
+                finally:
+                    loop.close()
+            set_block_cache(None)
+            set_page_cache(None)
+        stats = client.stats()
+    return results, skipped, stats
+
+def measure_page_memory(fixture):
+    """페이지 하나를 보관하는 데 드는 메모리(바이트)를 (원본 JSON, PageMeta)로 반환합니다."""
+    raw_json = json.dumps(list(fixture["pages"].values()))
+    count = max(len(fixture["pages"]), 1)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        raw_pages = json.loads(raw_json)
+        raw_bytes = tracemalloc.get_traced_memory()[0] - before
+        before = tracemalloc.get_traced_memory()[0]
+        metas = [PageMeta.from_page(page) for page in raw_pages]
+        meta_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del raw_pages, metas
+    return raw_bytes / count, meta_bytes / count
+
+def _raw_block_tree(fixture, block_id):
+    """예전 fetch_all_child_blocks처럼 하위 블록을 'children'에 넣은 원본 JSON 트리."""
+    blocks = []
+    for child_id in fixture["children"].get(block_id, []):
+        block = dict(fixture["blocks"][child_id])
+        if block.get("has_children"):
+            block["children"] = _raw_block_tree(fixture, child_id)
+        blocks.append(block)
+    return blocks
+
+def _model_tree(raw_blocks):
+    return tuple(Block.from_notion(block, _model_tree(block["children"]) if "children" in block else None)
+                 for block in raw_blocks)
+
+def measure_block_memory(fixture):
+    """페이지 블록 트리 하나의 (메모리, 캐시 파일 크기)를 원본 JSON과 블록 모델로 비교해
+    (원본 메모리, 모델 메모리, 원본 캐시 바이트, 모델 캐시 바이트)를 페이지당 평균으로 반환합니다."""
+    trees = [_raw_block_tree(fixture, page_id) for page_id in fixture["pages"]]
+    count = max(len(trees), 1)
+    # 캐시 파일 형식: 예전은 원본 JSON 그대로, 지금은 블록 모델의 to_json (block_cache.BlockCache._save와 같은 설정)
+    raw_cache = sum(len(json.dumps({"last_edited_time": None, "blocks": tree}, ensure_ascii=False).encode("utf-8"))
+                    for tree in trees)
+    model_json = [blocks_to_json(_model_tree(tree)) for tree in trees]
+    model_cache = sum(len(json.dumps({"version": BLOCK_MODEL_VERSION, "last_edited_time": None, "blocks": data}, ensure_ascii=False,
+                                     separators=(",", ":")).encode("utf-8")) for data in model_json)
+    raw_json = json.dumps(trees)
+    model_json = json.dumps(model_json)
+    del trees
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        raw_trees = json.loads(raw_json)
+        raw_bytes = tracemalloc.get_traced_memory()[0] - before
+        before = tracemalloc.get_traced_memory()[0]
+        models = [blocks_from_json(data) for data in json.loads(model_json)]
+        model_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del raw_trees, models
+    return raw_bytes / count, model_bytes / count, raw_cache / count, model_cache / count
+
+def scenario_key(args):
+    if args.fixture:
+        source = os.path.basename(args.fixture)
+    else:
+        source = f"synthetic-w{args.width}-d{args.depth}-b{args.blocks}"
+        if args.database_rows:
+            source += f"-db{args.database_rows}"
+    return f"{source}/lat{args.latency_ms:g}ms/rl{args.rate_limit_ratio:g}"
+
+def load_baselines(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def compare(medians, baseline, tolerance):
+    """기준값 대비 (케이스, 현재, 기준, 비율, 회귀 여부) 목록을 반환합니다."""
+    rows = []
+    for name, current in medians.items():
+        base = baseline.get(name)
+        ratio = current / base if base else None
+        rows.append((name, current, base, ratio, ratio is not None and ratio > 1 + tolerance))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Notion PDF Exporter 오프라인 벤치마크")
+    parser.add_argument("--fixture", help="기록된 픽스처 JSON 경로 (없으면 합성 워크스페이스 사용)")
+    parser.add_argument("--record", metavar="PATH", help="실제 워크스페이스를 픽스처로 기록하고 종료")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=30, help="페이지당 블록 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-rows", type=int, default=0, help="루트 페이지마다 둘 인라인 데이터베이스 행 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 응답 주입 비율 (0~1)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--export-pages", type=int, default=5, help="end-to-end 내보내기 대상 페이지 수")
+    parser.add_argument("--skip-export", action="store_true", help="Playwright가 필요한 end-to-end 측정 생략")
+    parser.add_argument("--skip-startup", action="store_true", help="앱 시작 시간(import, 첫 화면) 측정 생략")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율 (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        from dotenv import load_dotenv
+        from notion_api import create_notion_client
+        load_dotenv()
+        fixture = asyncio.run(record_workspace(create_notion_client()))
+        save_fixture(fixture, args.record)
+        print(f"기록 완료: 페이지 {len(fixture['pages'])}개, 블록 {len(fixture['blocks'])}개 -> {args.record}")
+        return 0
+
+    if args.fixture:
+        fixture = load_fixture(args.fixture)
+    else:
+        fixture = generate_workspace(args.width, args.depth, args.blocks, args.seed, args.database_rows)
+    key = scenario_key(args)
+    print(f"시나리오: {key} (페이지 {len(fixture['pages'])}개, 블록 {len(fixture['blocks'])}개)")
+
+    results, skipped, stats = run_suite(fixture, args)
+    medians = {name: statistics.median(times) for name, times in results.items()}
+    startup_loaded = []
+    if not args.skip_startup:
+        try:
+            startup, startup_loaded = measure_startup(args.repeat)
+            medians.update(startup)
+        except Exception as e:
+            skipped["startup"] = (str(e).splitlines() or [type(e).__name__])[0]
+    baselines = load_baselines(args.baseline)
+    rows = compare(medians, baselines.get(key, {}), args.tolerance)
+
+    print(f"{'케이스':<24}{'중앙값(ms)':>12}{'기준(ms)':>12}{'비율':>8}")
+    for name, current, base, ratio, regressed in rows:
+        base_text = f"{base * 1000:.1f}" if base else "-"
+        ratio_text = f"{ratio:.2f}" if ratio else "-"
+        print(f"{name:<24}{current * 1000:>12.1f}{base_text:>12}{ratio_text:>8}{'  << 회귀' if regressed else ''}")
+    for name, reason in skipped.items():
+        print(f"{name:<24}  건너뜀: {reason}")
+    print(f"API 호출: {stats['calls']} / 429 주입: {stats['rate_limited']}")
+    raw_bytes, meta_bytes = measure_page_memory(fixture)
+    print(f"페이지당 메모리: 원본 JSON {raw_bytes:.0f} B -> PageMeta {meta_bytes:.0f} B")
+    raw_bytes, model_bytes, raw_cache, model_cache = measure_block_memory(fixture)
+    print(f"페이지당 블록 트리: 메모리 원본 JSON {raw_bytes / 1024:.1f} KB -> 블록 모델 {model_bytes / 1024:.1f} KB, "
+          f"캐시 파일 {raw_cache / 1024:.1f} KB -> {model_cache / 1024:.1f} KB")
+    if startup_loaded:
+        print(f"시작 시 가져오면 안 되는 모듈: {', '.join(startup_loaded)}  << 회귀")
+
+    if args.update_baseline:
+        baselines[key] = medians
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+    return 1 if startup_loaded or any(row[4] for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
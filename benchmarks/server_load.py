@@ -0,0 +1,113 @@
+"""내보내기 서버 부하 테스트: 동시 클라이언트 수에 따른 분당 작업 수.
+
+    python -m benchmarks.server_load --concurrency 1 2 4 8 --jobs 16 --pages 5
+    python -m benchmarks.server_load --url http://127.0.0.1:8800 --page-id <id> --page-id <id>
+
+기본값은 이 프로세스 안에서 픽스처 워크스페이스를 쓰는 ExportServer를 띄웁니다 (Playwright 필요).
+클라이언트마다 작업을 제출하고(POST /jobs), 진행 스트림(/events)으로 끝날 때까지 기다린 뒤 PDF를 내려받습니다.
+작업마다 워크스페이스에서 돌아가며 다른 페이지 묶음을 고르므로, 뒤쪽 작업일수록 공유 캐시의 효과가 드러납니다.
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.workspace import generate_workspace
+
+def run_job(client, base_url, page_ids, headers):
+    """작업 하나를 제출하고 끝날 때까지 기다려 (성공 여부, 소요 초)를 반환합니다."""
+    start = time.perf_counter()
+    response = client.post(f"{base_url}/jobs", json={"page_ids": page_ids, "output_name": "load"}, headers=headers)
+    response.raise_for_status()
+    job_id = response.json()["id"]
+    status = None
+    with client.stream("GET", f"{base_url}/jobs/{job_id}/events", headers=headers, timeout=None) as stream:
+        for line in stream.iter_lines():
+            if line.startswith("data: "):
+                status = json.loads(line[len("data: "):])["status"]
+    if status == "done":
+        client.get(f"{base_url}/jobs/{job_id}/download", headers=headers).raise_for_status()
+    return status == "done", time.perf_counter() - start
+
+def run_level(base_url, page_sets, concurrency, headers):
+    import httpx
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+    remaining = list(page_sets)
+
+    def client_loop():
+        nonlocal failures
+        with httpx.Client(timeout=600) as client:
+            while True:
+                with lock:
+                    if not remaining:
+                        return
+                    page_ids = remaining.pop(0)
+                ok, elapsed = run_job(client, base_url, page_ids, headers)
+                with lock:
+                    latencies.append(elapsed)
+                    failures += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(client_loop) for _ in range(concurrency)]:
+            future.result()
+    return time.perf_counter() - start, latencies, failures
+
+def page_sets_for(page_ids, jobs, pages):
+    return [[page_ids[(i * pages + k) % len(page_ids)] for k in range(pages)] for i in range(jobs)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내보내기 서버 부하 테스트")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--jobs", type=int, default=16, help="동시 실행 수마다 제출할 작업 수")
+    parser.add_argument("--pages", type=int, default=5, help="작업당 페이지 수")
+    parser.add_argument("--server-jobs", type=int, default=2, help="서버가 동시에 실행할 작업 수 (로컬 서버)")
+    parser.add_argument("--no-render-cache", action="store_true", help="렌더링 캐시 없이 측정 (로컬 서버)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소")
+    parser.add_argument("--page-id", action="append", help="--url 서버에서 내보낼 페이지 ID (여러 번 지정)")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=30)
+    args = parser.parse_args(argv)
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+
+    server = None
+    temp_dir = tempfile.TemporaryDirectory()
+    if args.url:
+        if not args.page_id:
+            parser.error("--url에는 --page-id가 필요합니다")
+        base_url, page_ids = args.url.rstrip("/"), args.page_id
+    else:
+        from server import ExportServer
+        from render_cache import RenderCache, set_render_cache
+        fixture = generate_workspace(args.width, args.depth, args.blocks)
+        page_ids = list(fixture["pages"])
+        if not args.no_render_cache:
+            set_render_cache(RenderCache(f"{temp_dir.name}/render"))
+        server = ExportServer(port=0, output_dir=f"{temp_dir.name}/out", max_jobs=args.server_jobs,
+                              notion_client=FixtureNotionClient(fixture), render_cache=not args.no_render_cache)
+        base_url = server.start()
+    try:
+        print(f"서버: {base_url} (작업 {args.jobs}개 x 페이지 {args.pages}개)")
+        print(f"{'동시 실행':<10}{'작업/분':>10}{'p50(초)':>10}{'p95(초)':>10}{'실패':>6}")
+        for concurrency in args.concurrency:
+            elapsed, latencies, failures = run_level(base_url, page_sets_for(page_ids, args.jobs, args.pages),
+                                                     concurrency, headers)
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) >= 2 else latencies[0]
+            print(f"{concurrency:<10}{len(latencies) / elapsed * 60:>10.1f}{statistics.median(latencies):>10.2f}"
+                  f"{p95:>10.2f}{failures:>6}")
+    finally:
+        if server is not None:
+            server.shutdown()
+        temp_dir.cleanup()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
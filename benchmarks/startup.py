@@ -0,0 +1,110 @@
+"""앱 시작 시간 측정.
+
+    python -m benchmarks.startup
+
+- import: `python -X importtime -c "import main"`으로 잰 main 모듈 import 시간
+- first_paint: 프로세스를 띄운 순간부터 MainWindow가 처음 그려질 때까지의 시간 (offscreen, 네트워크 없음)
+시작 시에는 DEFERRED_MODULES를 가져오지 않아야 하며, 가져오면 회귀로 봅니다.
+"""
+import os
+import sys
+import time
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 사용 시점이나 WarmupThread에서만 가져와야 하는 무거운 모듈 (최상위 패키지 이름)
+DEFERRED_MODULES = ("notion_client", "httpx", "playwright", "PyPDF2", "pikepdf", "pdf_optimize")
+
+FIRST_PAINT_SCRIPT = """
+import os, sys, time
+from PySide6.QtCore import QObject, QEvent, QTimer
+import main
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            # 그리기가 끝난 뒤 시각을 기록
+            QTimer.singleShot(0, report)
+            app.removeEventFilter(self)
+        return False
+
+def report():
+    print(time.time(), flush=True)
+    os._exit(0)
+
+# 네트워크 없이 창만 띄움
+main.MainWindow.load_pages = lambda self, force_full=False: None
+app = main.create_app(sys.argv[:1])
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window = main.MainWindow()
+window.show()
+QTimer.singleShot(10000, lambda: os._exit(1))
+app.exec()
+"""
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PYTHONPATH"] = ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def parse_importtime(stderr):
+    """-X importtime 출력을 {모듈: (자체 us, 누적 us)}로 변환합니다."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+def measure_import_time(module="main"):
+    """module을 새 프로세스에서 가져와 (누적 import 초, 가져온 DEFERRED_MODULES 목록)을 반환합니다."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT_DIR, env=_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError((proc.stderr.strip().splitlines() or ["import 실패"])[-1])
+    times = parse_importtime(proc.stderr)
+    loaded = sorted({name.split(".")[0] for name in times} & set(DEFERRED_MODULES))
+    return times[module][1] / 1e6, loaded
+
+def measure_first_paint(timeout=30):
+    """프로세스 시작부터 첫 paint 이벤트가 처리될 때까지의 시간(초)을 반환합니다."""
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-c", FIRST_PAINT_SCRIPT], cwd=ROOT_DIR, env=_env(),
+                          capture_output=True, text=True, timeout=timeout)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError((proc.stderr.strip().splitlines() or ["첫 화면이 그려지지 않았습니다"])[-1])
+    return float(lines[-1]) - start
+
+def measure_startup(repeat=3):
+    """{"startup_import_main": 초, "startup_first_paint": 초}(각 중앙값)와 시작 시 가져온 무거운 모듈 목록을 반환합니다."""
+    import_times, paint_times, loaded = [], [], set()
+    for _ in range(repeat):
+        seconds, modules = measure_import_time()
+        import_times.append(seconds)
+        loaded.update(modules)
+        paint_times.append(measure_first_paint())
+    import_times.sort()
+    paint_times.sort()
+    return {
+        "startup_import_main": import_times[len(import_times) // 2],
+        "startup_first_paint": paint_times[len(paint_times) // 2],
+    }, sorted(loaded)
+
+def main():
+    results, loaded = measure_startup()
+    for name, seconds in results.items():
+        print(f"{name:<24}{seconds * 1000:>12.1f} ms")
+    if loaded:
+        print(f"시작 시 가져오면 안 되는 모듈: {', '.join(loaded)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Notion 클라이언트 전송 설정 비교 (로컬 픽스처 서버 대상).
+
+    python -m benchmarks.transport --requests 2000 --concurrency 16
+    python -m benchmarks.transport --latency-ms 20                 # 서버 지연 주입
+
+실제 notion_client를 별도 프로세스의 benchmarks.fixture_server에 연결해 pages.retrieve / blocks.children.list를 반복 호출하고,
+설정별 초당 요청 수와 응답당 CPU 시간(이 프로세스 기준, 서버 제외)을 출력합니다.
+HTTP/2는 TLS 서버가 필요해 로컬 픽스처 서버(평문 HTTP/1.1)에서는 측정하지 않습니다.
+"""
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+import importlib.util
+from benchmarks.startup import ROOT_DIR
+from notion_transport import create_client, create_http_client
+
+def start_server(args):
+    """픽스처 서버를 별도 프로세스로 띄우고 (프로세스, base_url)을 반환합니다."""
+    command = [sys.executable, "-m", "benchmarks.fixture_server", "--port", "0",
+               "--width", str(args.width), "--depth", str(args.depth), "--blocks", str(args.blocks),
+               "--latency-ms", str(args.latency_ms)]
+    proc = subprocess.Popen(command, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True)
+    base_url = proc.stdout.readline().strip()
+    if not base_url:
+        proc.kill()
+        raise RuntimeError("픽스처 서버를 시작하지 못했습니다")
+    return proc, base_url
+
+def transport_configs(base_url):
+    """(이름, 클라이언트 생성 함수) 목록."""
+    from notion_client import AsyncClient
+    configs = [
+        ("keep-alive 없음", lambda: create_client("bench", create_http_client(max_keepalive=0), fast_json=False, base_url=base_url)),
+        ("기본 (notion_client)", lambda: AsyncClient(auth="bench", base_url=base_url)),
+        ("연결 풀", lambda: create_client("bench", fast_json=False, base_url=base_url)),
+    ]
+    if importlib.util.find_spec("orjson") is not None:
+        configs.append(("연결 풀 + orjson", lambda: create_client("bench", fast_json=True, base_url=base_url)))
+    return configs
+
+async def run_load(client, page_ids, total, concurrency):
+    """pages.retrieve와 blocks.children.list를 번갈아 total번 호출합니다."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        page_id = page_ids[i % len(page_ids)]
+        async with semaphore:
+            if i % 2:
+                await client.blocks.children.list(block_id=page_id, page_size=100)
+            else:
+                await client.pages.retrieve(page_id=page_id)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+
+async def measure(make_client, page_ids, total, concurrency):
+    client = make_client()
+    try:
+        # 연결 수립과 첫 호출 비용은 제외
+        await run_load(client, page_ids, concurrency, concurrency)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        await run_load(client, page_ids, total, concurrency)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    finally:
+        await client.aclose()
+    return total / wall, cpu / total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Notion 클라이언트 전송 설정 비교")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    from benchmarks.workspace import generate_workspace
+    page_ids = list(generate_workspace(args.width, args.depth, args.blocks)["pages"])
+    proc, base_url = start_server(args)
+    try:
+        print(f"픽스처 서버: {base_url} (요청 {args.requests}회, 동시 {args.concurrency})")
+        print(f"{'설정':<24}{'요청/초':>10}{'CPU/응답(us)':>14}")
+        for name, make_client in transport_configs(base_url):
+            rps, cpu = asyncio.run(measure(make_client, page_ids, args.requests, args.concurrency))
+            print(f"{name:<24}{rps:>10.0f}{cpu * 1e6:>14.0f}")
+    finally:
+        proc.terminate()
+        proc.wait()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
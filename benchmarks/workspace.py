@@ -0,0 +1,171 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from benchmarks.fixture_client import empty_fixture
+
+_WORDS = ["프로젝트", "포트폴리오", "설계", "회고", "Backend", "Frontend", "데이터", "파이프라인",
+          "성능", "개선", "API", "테스트", "배포", "운영", "Notion", "자동화", "문서", "리뷰"]
+_LANGS = ["python", "javascript", "sql", "bash"]
+_COLORS = ["default", "gray", "blue", "red", "green_background", "yellow_background"]
+
+class _Builder:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.fixture = empty_fixture()
+        self.clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def new_id(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def timestamp(self):
+        self.clock += timedelta(minutes=self.rng.randint(1, 600))
+        return self.clock.strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+    def words(self, n):
+        return " ".join(self.rng.choice(_WORDS) for _ in range(n))
+
+    def rich_text(self, text, color=None, bold=False, href=None):
+        return {
+            "type": "text",
+            "text": {"content": text, "link": {"url": href} if href else None},
+            "annotations": {"bold": bold, "italic": False, "strikethrough": False, "underline": False,
+                            "code": False, "color": color or "default"},
+            "plain_text": text,
+            "href": href,
+        }
+
+    def block(self, parent_id, block_type, payload, has_children=False):
+        block_id = self.new_id()
+        ts = self.timestamp()
+        block = {
+            "object": "block", "id": block_id,
+            "parent": {"type": "page_id", "page_id": parent_id},
+            "created_time": ts, "last_edited_time": ts,
+            "created_by": {"object": "user", "id": "bench-user"},
+            "last_edited_by": {"object": "user", "id": "bench-user"},
+            "has_children": has_children, "archived": False, "in_trash": False,
+            "type": block_type, block_type: payload,
+        }
+        self.fixture["blocks"][block_id] = block
+        self.fixture["children"].setdefault(parent_id, []).append(block_id)
+        return block
+
+    def text_block(self, parent_id, block_type, n_words=8, **extra):
+        rng = self.rng
+        rich = [self.rich_text(self.words(n_words), color=rng.choice(_COLORS), bold=rng.random() < 0.2)]
+        if rng.random() < 0.1:
+            rich.append(self.rich_text(" 링크", href="https://example.com"))
+        return self.block(parent_id, block_type, {"rich_text": rich, "color": "default", **extra})
+
+    def content_block(self, page_id):
+        kind = self.rng.randrange(10)
+        if kind == 0:
+            return [self.text_block(page_id, self.rng.choice(["heading_1", "heading_2", "heading_3"]), 3)]
+        if kind == 1:
+            return [self.text_block(page_id, "bulleted_list_item") for _ in range(3)]
+        if kind == 2:
+            return [self.text_block(page_id, "numbered_list_item") for _ in range(3)]
+        if kind == 3:
+            toggle = self.text_block(page_id, "toggle", 4)
+            toggle["has_children"] = True
+            for _ in range(2):
+                self.text_block(toggle["id"], "paragraph", 12)
+            return [toggle]
+        if kind == 4:
+            return [self.block(page_id, "code", {"rich_text": [self.rich_text("print('hello')\n" * 3)],
+                                                 "language": self.rng.choice(_LANGS), "caption": []})]
+        if kind == 5:
+            return [self.text_block(page_id, "quote", 10)]
+        if kind == 6:
+            return [self.text_block(page_id, "callout", 10, icon={"type": "emoji", "emoji": "💡"})]
+        if kind == 7:
+            table = self.block(page_id, "table", {"table_width": 3, "has_column_header": True, "has_row_header": False},
+                               has_children=True)
+            for _ in range(4):
+                cells = [[self.rich_text(self.words(self.rng.randint(1, 4)))] for _ in range(3)]
+                self.block(table["id"], "table_row", {"cells": cells})
+            return [table]
+        if kind == 8:
+            return [self.block(page_id, "divider", {})]
+        return [self.text_block(page_id, "paragraph", self.rng.randint(6, 30))]
+
+    def page(self, parent, title):
+        page_id = self.new_id()
+        ts = self.timestamp()
+        icon = {"type": "emoji", "emoji": "✅"} if self.rng.random() < 0.05 else None
+        self.fixture["pages"][page_id] = {
+            "object": "page", "id": page_id,
+            "created_time": ts, "last_edited_time": ts,
+            "created_by": {"object": "user", "id": "bench-user"},
+            "last_edited_by": {"object": "user", "id": "bench-user"},
+            "cover": None, "icon": icon, "parent": parent, "archived": False, "in_trash": False,
+            "properties": {"title": {"id": "title", "type": "title", "title": [self.rich_text(title)]}},
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+        }
+        self.fixture["children"].setdefault(page_id, [])
+        return page_id
+
+    def database(self, page_id, rows, blocks_per_row):
+        """page_id 본문에 인라인 데이터베이스(child_database 블록, 데이터 소스 하나)와 행 페이지를 만듭니다."""
+        title = f"{self.words(1)} 목록"
+        block = self.block(page_id, "child_database", {"title": title})
+        database_id, data_source_id = block["id"], self.new_id()
+        self.fixture["databases"][database_id] = {
+            "object": "database", "id": database_id,
+            "title": [self.rich_text(title)],
+            "parent": {"type": "block_id", "block_id": page_id},
+            "created_time": block["created_time"], "last_edited_time": self.timestamp(),
+            "data_sources": [{"id": data_source_id, "name": title}],
+        }
+        row_ids = []
+        for i in range(rows):
+            row_id = self.page({"type": "data_source_id", "data_source_id": data_source_id,
+                                "database_id": database_id}, f"{self.words(2)} {i + 1}")
+            self.fixture["pages"][row_id]["properties"].update({
+                "상태": {"id": "s", "type": "status", "status": {"name": self.rng.choice(["진행 중", "완료"])}},
+                "태그": {"id": "t", "type": "multi_select",
+                       "multi_select": [{"name": self.rng.choice(_WORDS)} for _ in range(2)]},
+                "마감": {"id": "d", "type": "date", "date": {"start": "2024-03-01", "end": None}},
+            })
+            count = 0
+            while count < blocks_per_row:
+                count += len(self.content_block(row_id))
+            row_ids.append(row_id)
+        self.fixture["data_source_rows"][data_source_id] = row_ids
+        return database_id
+
+def generate_workspace(width=4, depth=3, blocks_per_page=30, seed=0, database_rows=0):
+    """합성 워크스페이스 픽스처를 만듭니다.
+    - width: 루트 페이지 수이자 각 페이지의 하위 페이지 수
+    - depth: 트리 깊이 (1이면 루트만)
+    - blocks_per_page: 페이지당 본문 블록 수(대략)
+    - database_rows: 0보다 크면 루트 페이지마다 이만큼 행이 있는 인라인 데이터베이스를 하위 페이지 목록 끝에 둠
+    하위 페이지는 child_page 블록으로 본문 맨 앞에 오고, 빈 줄 뒤에 본문이 이어집니다.
+    """
+    b = _Builder(seed)
+
+    def make_page(parent, level, path):
+        title = f"{b.words(2)} {path}"
+        page_id = b.page(parent, title)
+        if level < depth:
+            for i in range(width):
+                child_id = make_page({"type": "page_id", "page_id": page_id}, level + 1, f"{path}.{i + 1}")
+                child_title = b.fixture["pages"][child_id]["properties"]["title"]["title"][0]["plain_text"]
+                # child_page 블록은 하위 페이지와 같은 ID를 가짐
+                block = b.block(page_id, "child_page", {"title": child_title})
+                b.fixture["blocks"].pop(block["id"])
+                ids = b.fixture["children"][page_id]
+                ids[ids.index(block["id"])] = child_id
+                block["id"] = child_id
+                b.fixture["blocks"][child_id] = block
+            if level == 1 and database_rows:
+                b.database(page_id, database_rows, blocks_per_page)
+            b.block(page_id, "paragraph", {"rich_text": [], "color": "default"})
+        count = 0
+        while count < blocks_per_page:
+            count += len(b.content_block(page_id))
+        return page_id
+
+    for i in range(width):
+        make_page({"type": "workspace", "workspace": True}, 1, str(i + 1))
+    return b.fixture
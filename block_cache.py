@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from block_model import BLOCK_MODEL_VERSION, blocks_to_json, blocks_from_json, earliest_expiry
+from config import BLOCK_CACHE_DIR, FILE_URL_EXPIRY_MARGIN_SEC
+from notion_api import fetch_all_child_blocks
+from tracing import count
+
+class BlockCache:
+    """페이지 블록 트리 캐시 (메모리 + 디스크).
+    - 키는 페이지 ID, 유효성은 페이지의 last_edited_time으로 판별합니다.
+    - last_edited_time 없이 조회하면 저장된 값을 그대로 반환합니다.
+    - 메모리에는 블록 모델(block_model.Block)을, 디스크에는 encode로 바꾼 JSON을 둡니다.
+      디스크의 형식 버전(version)이 다르면 없는 것으로 봅니다 (예전 원본 JSON 캐시 등).
+    - 페이지가 그대로여도 Notion에 올린 이미지의 서명된 URL은 한 시간쯤 뒤 만료되므로, expiry(블록 -> 가장 이른 만료 시각)로
+      저장할 때 만료 시각을 기록하고 그 시각이 margin초 안으로 다가오면 없는 것으로 봅니다 (다시 가져와 새 URL을 받음).
+    """
+
+    def __init__(self, cache_dir=BLOCK_CACHE_DIR, encode=blocks_to_json, decode=blocks_from_json,
+                 version=BLOCK_MODEL_VERSION, expiry=earliest_expiry, margin=FILE_URL_EXPIRY_MARGIN_SEC, clock=time.time):
+        self.cache_dir = cache_dir
+        self.encode = encode
+        self.decode = decode
+        self.version = version
+        self.expiry = expiry
+        self.margin = margin
+        self.clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, page_id):
+        return os.path.join(self.cache_dir, f"{page_id.replace('-', '')}.json")
+
+    def get(self, page_id, last_edited_time=None):
+        with self._lock:
+            entry = self._entries.get(page_id)
+        if entry is None:
+            entry = self._load(page_id)
+        if entry is None:
+            return None
+        if last_edited_time and entry.get("last_edited_time") != last_edited_time:
+            return None
+        if self._expired(entry):
+            count("block_cache.expired_urls")
+            return None
+        return entry["blocks"]
+
+    def _expired(self, entry):
+        expires = entry.get("expires")
+        if not expires:
+            return False
+        try:
+            expires_at = datetime.fromisoformat(expires.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return True
+        return expires_at - self.margin <= self.clock()
+
+    def put(self, page_id, blocks, last_edited_time=None):
+        entry = {"last_edited_time": last_edited_time, "blocks": blocks,
+                 "expires": self.expiry(blocks) if self.expiry else None}
+        with self._lock:
+            self._entries[page_id] = entry
+        self._save(page_id, entry)
+
+    def invalidate(self, page_id):
+        with self._lock:
+            self._entries.pop(page_id, None)
+        try:
+            os.remove(self._path(page_id))
+        except OSError:
+            pass
+
+    def _load(self, page_id):
+        try:
+            with open(self._path(page_id), encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != self.version:
+                return None
+            entry["blocks"] = self.decode(entry["blocks"])
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return None
+        with self._lock:
+            self._entries[page_id] = entry
+        return entry
+
+    def _save(self, page_id, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 미리 가져오기와 내보내기 스레드가 같은 페이지를 동시에 저장할 수 있으므로 임시 파일은 스레드별로
+            tmp_path = f"{self._path(page_id)}.{threading.get_ident()}.tmp"
+            data = {"version": self.version, "last_edited_time": entry["last_edited_time"], "expires": entry["expires"],
+                    "blocks": self.encode(entry["blocks"])}
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self._path(page_id))
+        except (OSError, TypeError) as e:
+            print(f"블록 캐시 저장 오류: {e}")
+
+_block_cache = None
+_block_cache_lock = threading.Lock()
+
+def get_block_cache() -> BlockCache:
+    """프로세스 전역 블록 캐시를 반환합니다."""
+    global _block_cache
+    with _block_cache_lock:
+        if _block_cache is None:
+            _block_cache = BlockCache()
+        return _block_cache
+
+def set_block_cache(cache):
+    """전역 블록 캐시를 교체합니다 (벤치마크에서 임시 디렉터리를 쓰는 경우 등)."""
+    global _block_cache
+    with _block_cache_lock:
+        _block_cache = cache
+
+async def fetch_page_blocks_cached(notion, page_id, last_edited_time=None):
+    """캐시에 유효한 블록 트리가 있으면 재사용하고, 없으면 가져와 저장합니다."""
+    cache = get_block_cache()
+    blocks = cache.get(page_id, last_edited_time)
+    if blocks is not None:
+        count("block_cache.hits")
+        return blocks
+    count("block_cache.misses")
+    blocks = await fetch_all_child_blocks(notion, page_id)
+    if blocks:
+        cache.put(page_id, blocks, last_edited_time)
+    return blocks
@@ -0,0 +1,216 @@
+"""Notion 블록 JSON을 렌더링에 필요한 값만 남긴 작은 블록 모델로 바꿉니다.
+
+블록 JSON에는 생성/수정 시각, 사용자 객체, 부모 포인터 등 PDF에 쓰이지 않는 값이 대부분이라,
+가져오는 즉시 Block/Span으로 줄여 메모리와 블록 캐시에는 이 모델만 남깁니다.
+- Span: rich_text 조각 하나 (텍스트, 링크, 꾸밈 비트, 색)
+- Block: 블록 하나 (종류, 텍스트, 종류별 값, 하위 블록). id는 렌더링 중 다시 조회할 때만 필요하므로 그런 블록만 보관합니다.
+디스크에는 to_json/from_json의 중첩 리스트 형식으로 저장합니다 (BLOCK_MODEL_VERSION이 바뀌면 캐시를 다시 만듦).
+"""
+
+BLOCK_MODEL_VERSION = 2
+
+BOLD, ITALIC, STRIKETHROUGH, UNDERLINE, CODE = 1, 2, 4, 8, 16
+_ANNOTATION_FLAGS = (("bold", BOLD), ("italic", ITALIC), ("strikethrough", STRIKETHROUGH),
+                     ("underline", UNDERLINE), ("code", CODE))
+# 렌더링 중 id로 다시 조회하는 블록 (인라인 데이터베이스, 하위 페이지 목록)
+_KEEP_ID_TYPES = frozenset(("child_database", "child_page"))
+
+class Span:
+    """rich_text 조각. flags는 BOLD/ITALIC/... 비트 조합입니다."""
+    __slots__ = ("text", "href", "flags", "color")
+
+    def __init__(self, text, href=None, flags=0, color="default"):
+        self.text = text
+        self.href = href
+        self.flags = flags
+        self.color = color
+
+    @classmethod
+    def from_notion(cls, chunk):
+        annotations = chunk.get("annotations") or {}
+        flags = 0
+        for name, flag in _ANNOTATION_FLAGS:
+            if annotations.get(name):
+                flags |= flag
+        return cls(chunk.get("plain_text", ""), chunk.get("href"), flags, annotations.get("color") or "default")
+
+    @property
+    def bold(self):
+        return bool(self.flags & BOLD)
+
+    @property
+    def italic(self):
+        return bool(self.flags & ITALIC)
+
+    @property
+    def strikethrough(self):
+        return bool(self.flags & STRIKETHROUGH)
+
+    @property
+    def underline(self):
+        return bool(self.flags & UNDERLINE)
+
+    @property
+    def code(self):
+        return bool(self.flags & CODE)
+
+    def to_json(self):
+        # 기본값인 뒷부분은 생략 (대부분 ["텍스트"]만 남음)
+        data = [self.text, self.flags, self.color, self.href]
+        while len(data) > 1 and data[-1] in (None, 0, "default"):
+            data.pop()
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data[0], data[3] if len(data) > 3 else None, data[1] if len(data) > 1 else 0,
+                   data[2] if len(data) > 2 else "default")
+
+    def __eq__(self, other):
+        if not isinstance(other, Span):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"Span({self.text!r})"
+
+def spans_from_notion(rich_text):
+    return tuple(Span.from_notion(chunk) for chunk in rich_text or ())
+
+def spans_to_json(spans):
+    return [span.to_json() for span in spans]
+
+def spans_from_json(data):
+    return tuple(Span.from_json(item) for item in data or ())
+
+class Block:
+    """블록 하나.
+    - text: 블록 본문 rich_text (Span 튜플, 없으면 빈 튜플)
+    - attrs: 종류별 값 dict (code의 language, image의 url/caption, table_row의 cells 등). 없으면 None
+    - children: 하위 블록 튜플. 하위 블록이 있는데 아직 가져오지 않았으면 None
+    - id: child_database/child_page와 하위 블록을 아직 가져오지 않은 블록만 보관 (나머지는 None)
+    """
+    __slots__ = ("type", "text", "attrs", "children", "id")
+
+    def __init__(self, type, text=(), attrs=None, children=(), id=None):
+        self.type = type
+        self.text = text
+        self.attrs = attrs
+        self.children = children
+        self.id = id
+
+    def attr(self, name, default=None):
+        return self.attrs.get(name, default) if self.attrs else default
+
+    @classmethod
+    def from_notion(cls, block, children=None):
+        """Notion 블록 JSON과 (이미 변환한) 하위 블록 목록으로 만듭니다.
+        children이 None이고 블록에 하위 블록이 있으면 '아직 가져오지 않음'으로 둡니다."""
+        block_type = block["type"]
+        payload = block.get(block_type) or {}
+        if children is not None:
+            children = tuple(children)
+        elif not block.get("has_children"):
+            children = ()
+        attrs = _attrs_from_notion(block_type, payload)
+        keep_id = block_type in _KEEP_ID_TYPES or children is None
+        return cls(block_type, spans_from_notion(payload.get("rich_text")), attrs or None, children,
+                   block["id"] if keep_id else None)
+
+    def to_json(self):
+        # [종류, 텍스트, 종류별 값, 하위 블록, id] 중 뒤쪽의 빈 값은 생략
+        attrs = self.attrs
+        if attrs:
+            attrs = {name: _attr_to_json(name, value) for name, value in attrs.items()}
+        children = None if self.children is None else [child.to_json() for child in self.children]
+        data = [self.type, spans_to_json(self.text), attrs or 0, 0 if children == [] else children, self.id]
+        while len(data) > 1 and data[-1] in (None, 0, []):
+            data.pop()
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        attrs = data[2] if len(data) > 2 and data[2] else None
+        if attrs:
+            attrs = {name: _attr_from_json(name, value) for name, value in attrs.items()}
+        children = data[3] if len(data) > 3 else 0
+        return cls(
+            data[0],
+            spans_from_json(data[1]) if len(data) > 1 else (),
+            attrs,
+            () if children == 0 else None if children is None else tuple(cls.from_json(child) for child in children),
+            data[4] if len(data) > 4 else None,
+        )
+
+    def __repr__(self):
+        return f"Block({self.type!r}, children={None if self.children is None else len(self.children)})"
+
+def _attrs_from_notion(block_type, payload):
+    if block_type == "code":
+        return {"language": payload.get("language", "")}
+    if block_type == "image":
+        hosted = payload.get("file") or {}
+        url = hosted.get("url") or (payload.get("external") or {}).get("url", "")
+        attrs = {"url": url}
+        if hosted.get("expiry_time"):
+            # Notion에 올린 파일의 URL은 서명된 임시 URL이라 이 시각이 지나면 열리지 않음
+            attrs["expiry"] = hosted["expiry_time"]
+        caption = spans_from_notion(payload.get("caption"))
+        if caption:
+            attrs["caption"] = caption
+        return attrs
+    if block_type == "table":
+        return {"has_column_header": bool(payload.get("has_column_header")),
+                "has_row_header": bool(payload.get("has_row_header"))}
+    if block_type == "table_row":
+        attrs = {"cells": tuple(spans_from_notion(cell) for cell in payload.get("cells") or ())}
+        if payload.get("background", "default") != "default":
+            attrs["background"] = payload["background"]
+        return attrs
+    if block_type == "callout":
+        icon = payload.get("icon") or {}
+        attrs = {"icon": icon.get("emoji") if icon.get("type") == "emoji" else ""}
+        if payload.get("color"):
+            attrs["color"] = payload["color"]
+        return attrs
+    if block_type in ("child_database", "child_page"):
+        return {"title": payload.get("title", "")}
+    return None
+
+# Span 값을 담는 attrs 항목 (그 밖의 값은 JSON 그대로 저장)
+def _attr_to_json(name, value):
+    if name == "caption":
+        return spans_to_json(value)
+    if name == "cells":
+        return [spans_to_json(cell) for cell in value]
+    return value
+
+def _attr_from_json(name, value):
+    if name == "caption":
+        return spans_from_json(value)
+    if name == "cells":
+        return tuple(spans_from_json(cell) for cell in value)
+    return value
+
+def blocks_from_notion(blocks):
+    """하위 블록을 붙이지 않은 Notion 블록 JSON 목록을 변환합니다 (하위 블록이 있는 블록은 '아직 가져오지 않음')."""
+    return tuple(Block.from_notion(block) for block in blocks)
+
+def blocks_to_json(blocks):
+    return [block.to_json() for block in blocks]
+
+def blocks_from_json(data):
+    return tuple(Block.from_json(item) for item in data)
+
+def earliest_expiry(blocks):
+    """블록 트리에 있는 Notion 파일 URL 중 가장 먼저 만료되는 시각(ISO 문자열). 없으면 None."""
+    expiries = [block.attrs["expiry"] for block in iter_blocks(blocks) if block.attrs and block.attrs.get("expiry")]
+    return min(expiries) if expiries else None
+
+def iter_blocks(blocks):
+    """블록 트리를 깊이 우선으로 순회합니다."""
+    pending = list(reversed(blocks))
+    while pending:
+        block = pending.pop()
+        yield block
+        pending.extend(reversed(block.children or ()))
@@ -0,0 +1,168 @@
+"""앱 실행 중 headless Chromium을 미리 띄워 두고 내보내기에 빌려주는 백그라운드 브라우저.
+
+Playwright 객체는 만든 이벤트 루프에서만 쓸 수 있으므로, 전용 스레드의 이벤트 루프에서 브라우저를 띄우고
+내보내기 스레드의 렌더링 요청은 그 루프로 넘겨 실행합니다.
+"""
+import atexit
+import asyncio
+import threading
+from config import BROWSER_IDLE_TIMEOUT_SEC
+from tracing import span, count, get_tracer, use_tracer
+
+class WarmBrowser:
+    """미리 띄운 브라우저.
+    - start(): 백그라운드에서 Playwright와 브라우저를 띄우고, 빈 페이지를 한 번 인쇄해 폰트/CSS 엔진을 준비합니다.
+    - render(): 어느 이벤트 루프에서든 await하면 미리 띄운 브라우저의 새 탭에서 PDF를 인쇄합니다.
+    - 렌더링이 없는 상태로 idle_timeout초가 지나면 브라우저를 닫아 메모리를 돌려주고, 다음 렌더링 때 다시 띄웁니다.
+    """
+
+    def __init__(self, idle_timeout=BROWSER_IDLE_TIMEOUT_SEC):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._launch_future = None
+        self._playwright = None
+        self._browser = None
+        # 아래 값들은 브라우저 루프 스레드에서만 변경
+        self._active = 0
+        self._idle_handle = None
+
+    def start(self):
+        """브라우저를 띄우기 시작하고 concurrent.futures.Future(결과: 브라우저)를 반환합니다.
+        이미 떠 있거나 띄우는 중이면 그 Future를 그대로 반환합니다."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="warm-browser", daemon=True)
+                self._thread.start()
+            if self._launch_future is None:
+                future = asyncio.run_coroutine_threadsafe(self._launch(), self._loop)
+                future.add_done_callback(self._on_launch_done)
+                self._launch_future = future
+            return self._launch_future
+
+    def is_ready(self):
+        future = self._launch_future
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def _on_launch_done(self, future):
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                print(f"브라우저 미리 실행 오류: {future.exception()}")
+            # 다음 렌더링 때 다시 시도
+            with self._lock:
+                if self._launch_future is future:
+                    self._launch_future = None
+
+    async def _launch(self):
+        from playwright.async_api import async_playwright
+        from exporter import build_full_html, get_styles
+        with span("browser.warmup"):
+            playwright = await async_playwright().start()
+            try:
+                browser = await playwright.chromium.launch(headless=True)
+                # 빈 페이지를 한 번 인쇄해 폰트와 CSS 엔진을 준비
+                page = await browser.new_page()
+                try:
+                    await page.set_content(build_full_html("", "", get_styles()), wait_until="networkidle")
+                    await page.pdf(format="A4", print_background=True)
+                finally:
+                    await page.close()
+            except BaseException:
+                await playwright.stop()
+                raise
+        self._playwright, self._browser = playwright, browser
+        self._schedule_idle_close()
+        return browser
+
+    async def render(self, full_html, pdf_path, page_index=0, pdf_options=None, assets=None):
+        """미리 띄운 브라우저로 HTML을 PDF로 인쇄합니다 (브라우저가 닫혀 있으면 다시 띄움)."""
+        from exporter import render_pdf
+        tracer = get_tracer()
+
+        async def run():
+            # 호출한 쪽의 트레이서로 구간을 기록
+            with use_tracer(tracer):
+                self._active += 1
+                self._cancel_idle_close()
+                try:
+                    browser = await asyncio.wrap_future(self.start())
+                    count("browser.warm_renders")
+                    return await render_pdf(browser, full_html, pdf_path, page_index, pdf_options, assets)
+                finally:
+                    self._active -= 1
+                    self._schedule_idle_close()
+
+        self.start()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(run(), self._loop))
+
+    def _cancel_idle_close(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _schedule_idle_close(self):
+        self._cancel_idle_close()
+        if self._active == 0 and self.idle_timeout and self._browser is not None:
+            self._idle_handle = self._loop.call_later(self.idle_timeout, lambda: self._loop.create_task(self._close_idle()))
+
+    async def _close_idle(self):
+        self._idle_handle = None
+        if self._active == 0:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        with self._lock:
+            launch_future = self._launch_future
+            self._launch_future = None
+        if launch_future is not None and not launch_future.done():
+            launch_future.cancel()
+        # 닫는 동안 새 렌더링이 다시 띄운 브라우저를 건드리지 않도록 먼저 떼어 냄
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        try:
+            if browser is not None:
+                await browser.close()
+            if playwright is not None:
+                await playwright.stop()
+        except Exception as e:
+            print(f"브라우저 종료 오류: {e}")
+
+    def close(self, timeout=5):
+        """브라우저와 백그라운드 루프를 종료합니다."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+_warm_browser = None
+_warm_browser_lock = threading.Lock()
+
+def get_warm_browser():
+    """start_warm_browser()로 켠 브라우저를 반환합니다. 켜지 않았으면 None."""
+    return _warm_browser
+
+def start_warm_browser(idle_timeout=BROWSER_IDLE_TIMEOUT_SEC):
+    """백그라운드 브라우저를 켜고 바로 띄우기 시작합니다."""
+    global _warm_browser
+    with _warm_browser_lock:
+        if _warm_browser is None:
+            _warm_browser = WarmBrowser(idle_timeout)
+            atexit.register(_warm_browser.close)
+        _warm_browser.start()
+        return _warm_browser
+
+def stop_warm_browser():
+    """백그라운드 브라우저를 끕니다 (종료는 백그라운드 스레드에서 진행)."""
+    global _warm_browser
+    with _warm_browser_lock:
+        warm_browser, _warm_browser = _warm_browser, None
+    if warm_browser is not None:
+        atexit.unregister(warm_browser.close)
+        threading.Thread(target=warm_browser.close, name="warm-browser-close", daemon=True).start()
@@ -1,3 +1,64 @@
 TEMP_DIR = ".etc/temp"
 FINAL_PDF_NAME = "My_Portfolio_Final.pdf"
-FINAL_PDF_PATH = ".etc/" + FINAL_PDF_NAME 
\ No newline at end of file
+FINAL_PDF_PATH = ".etc/" + FINAL_PDF_NAME
+CACHE_DIR = ".etc/cache"
+BLOCK_CACHE_DIR = CACHE_DIR + "/blocks"
+DATABASE_CACHE_DIR = CACHE_DIR + "/databases"
+STYLE_CSS_NAME = "portfolio_style.css"
+PREVIEW_DEBOUNCE_MS = 150
+TRACE_DIR = ".etc/trace"
+WORKSPACE_SNAPSHOT_PATH = CACHE_DIR + "/workspace.json"
+NOTION_RATE_LIMIT_PER_SEC = 3.0
+NOTION_RATE_LIMIT_BURST = 30
+NOTION_RATE_LIMIT_RETRIES = 3
+CHILD_FETCH_CONCURRENCY = 8
+PDF_OPTIMIZE_PRESET = "ebook"
+PDF_OPTIMIZE_WORKERS = None
+RENDER_MIN_CONCURRENCY = 1
+RENDER_MAX_CONCURRENCY = None
+RENDER_INITIAL_CONCURRENCY = 4
+MEMORY_PRESSURE_PERCENT = 85
+LOAD_PRESSURE_RATIO = 1.5
+PIPELINE_FETCH_CONCURRENCY = 6
+PIPELINE_HTML_CONCURRENCY = 2
+PIPELINE_QUEUE_SIZE = 8
+LOW_PRIORITY_RESERVED_TOKENS = 10
+PREFETCH_DEBOUNCE_MS = 400
+PREFETCH_MAX_PAGES = 30
+STARTUP_WARMUP_MODULES = ("notion_client", "PyPDF2", "pdf_optimize", "playwright.async_api")
+BROWSER_IDLE_TIMEOUT_SEC = 300
+WATCH_MIN_INTERVAL_SEC = 15
+WATCH_MAX_INTERVAL_SEC = 300
+WATCH_BACKOFF = 1.5
+WATCH_DEBOUNCE_SEC = 20
+NOTION_HTTP_MAX_CONNECTIONS = 20
+NOTION_HTTP_MAX_KEEPALIVE = 20
+NOTION_HTTP_KEEPALIVE_EXPIRY_SEC = 30
+NOTION_HTTP2 = False
+NOTION_FAST_JSON = True
+PAGE_CACHE_TTL_SEC = 30
+PAGE_CACHE_MAX_ENTRIES = 5000
+MEMORY_BUDGET_MB = None
+MEMORY_BUDGET_THROTTLE_RATIO = 0.8
+MEMORY_SAMPLE_INTERVAL_SEC = 0.5
+MEMORY_TRACEMALLOC = False
+RENDER_WORKER_URLS = ()
+RENDER_WORKER_TIMEOUT_SEC = 120
+RENDER_WORKER_HEALTH_TIMEOUT_SEC = 5
+RENDER_WORKER_RECHECK_SEC = 30
+RENDER_CACHE_DIR = CACHE_DIR + "/render"
+RENDER_CACHE_MAX_MB = 500
+SERVER_PORT = 8800
+SERVER_OUTPUT_DIR = ".etc/server"
+SERVER_MAX_CONCURRENT_JOBS = 2
+SERVER_MAX_FINISHED_JOBS = 200
+RENDER_FETCH_TIMEOUT_SEC = 180
+RENDER_LOAD_TIMEOUT_SEC = 60
+RENDER_PRINT_TIMEOUT_SEC = 120
+RENDER_TIMEOUT_RETRIES = 1
+SLOW_PAGE_FACTOR = 3.0
+SLOW_PAGE_MIN_SEC = 2.0
+EXPORT_JOB_MAX_AGE_DAYS = 7
+EXPORT_JOB_MAX_COUNT = 20
+FILE_URL_EXPIRY_MARGIN_SEC = 600
+PREVIEW_CACHE_TTL_SEC = 1800
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from config import TEMP_DIR, EXPORT_JOB_MAX_AGE_DAYS, EXPORT_JOB_MAX_COUNT
+
+MANIFEST_VERSION = 2
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+class ExportManifest:
+    """내보내기 작업의 체크포인트 파일.
+    - 작업 ID는 출력 경로와 페이지 목록으로 정해지므로, 같은 내보내기를 다시 실행하면 이어서 진행합니다.
+    - pages: [{"page_id", "status", "artifact", "error", "last_edited_time"}] (페이지 순서 그대로)
+    - 렌더링된 PDF는 작업 폴더(TEMP_DIR/<작업 ID>)에 두고, 모두 성공하면 폴더째 지웁니다.
+    - last_edited_time은 렌더링한 시점의 페이지 수정 시각으로, 다시 실행할 때 달라졌으면 결과를 버리고 다시 렌더링합니다.
+    - 실패하거나 취소된 채 남은 작업 폴더는 open()할 때 오래된 것부터 정리합니다 (EXPORT_JOB_MAX_AGE_DAYS, EXPORT_JOB_MAX_COUNT).
+    """
+
+    def __init__(self, job_id, page_ids, output_path, pages=None, created=None, base_dir=TEMP_DIR):
+        self.job_id = job_id
+        self.page_ids = list(page_ids)
+        self.output_path = output_path
+        self.pages = pages or [{"page_id": page_id, "status": STATUS_PENDING, "artifact": None, "error": None,
+                                "last_edited_time": None} for page_id in self.page_ids]
+        self.created = created or time.time()
+        self.job_dir = os.path.join(base_dir, job_id)
+        self.path = os.path.join(self.job_dir, "manifest.json")
+
+    @staticmethod
+    def job_id_for(page_ids, output_path):
+        key = os.path.abspath(output_path) + "\n" + "\n".join(page_ids)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def open(cls, page_ids, output_path, base_dir=TEMP_DIR):
+        """같은 작업의 매니페스트가 남아 있으면 불러오고, 없으면 새로 만듭니다."""
+        job_id = cls.job_id_for(page_ids, output_path)
+        prune_jobs(base_dir, keep=job_id)
+        manifest = cls(job_id, page_ids, output_path, base_dir=base_dir)
+        try:
+            with open(manifest.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") != MANIFEST_VERSION or [p.get("page_id") for p in data.get("pages", [])] != manifest.page_ids:
+            return manifest
+        return cls(job_id, page_ids, output_path, data["pages"], data.get("created"), base_dir)
+
+    def save(self):
+        try:
+            os.makedirs(self.job_dir, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "job_id": self.job_id, "output_path": self.output_path,
+                           "created": self.created, "pages": self.pages}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"내보내기 매니페스트 저장 오류: {e}")
+
+    def _is_done(self, entry):
+        return entry["status"] == STATUS_DONE and bool(entry["artifact"]) and os.path.exists(entry["artifact"])
+
+    def pending_indexes(self):
+        """아직 렌더링된 결과가 없는 페이지의 인덱스 (실패했거나 결과 파일이 사라진 페이지 포함)."""
+        return [idx for idx, entry in enumerate(self.pages) if not self._is_done(entry)]
+
+    def done_count(self):
+        return sum(entry["status"] == STATUS_DONE for entry in self.pages)
+
+    def mark_done(self, idx, artifact, last_edited_time=None):
+        self.pages[idx].update(status=STATUS_DONE, artifact=artifact, error=None, last_edited_time=last_edited_time)
+        self.save()
+
+    def mark_failed(self, idx, error):
+        self.pages[idx].update(status=STATUS_FAILED, artifact=None, error=str(error))
+        self.save()
+
+    def invalidate(self, page_ids):
+        """page_ids에 해당하는 페이지를 다시 렌더링하도록 표시하고, 표시한 페이지 수를 반환합니다."""
+        page_ids = set(page_ids)
+        invalidated = 0
+        for entry in self.pages:
+            if entry["page_id"] in page_ids and entry["status"] != STATUS_PENDING:
+                entry.update(status=STATUS_PENDING, error=None)
+                invalidated += 1
+        if invalidated:
+            self.save()
+        return invalidated
+
+    def done_page_ids(self):
+        return [entry["page_id"] for entry in self.pages if self._is_done(entry)]
+
+    def drop_stale(self, edited_times):
+        """edited_times({페이지 ID: 현재 last_edited_time})와 렌더링 당시 수정 시각이 다른 페이지의 결과 PDF를 지우고
+        다시 렌더링하도록 표시합니다. 현재 수정 시각을 모르는 페이지는 그대로 둡니다. 버린 페이지 수를 반환합니다."""
+        dropped = 0
+        for entry in self.pages:
+            current = edited_times.get(entry["page_id"])
+            if entry["status"] != STATUS_DONE or current is None or entry.get("last_edited_time") == current:
+                continue
+            if entry["artifact"]:
+                try:
+                    os.remove(entry["artifact"])
+                except OSError:
+                    pass
+            entry.update(status=STATUS_PENDING, artifact=None, error=None, last_edited_time=None)
+            dropped += 1
+        if dropped:
+            self.save()
+        return dropped
+
+    def artifacts(self):
+        """성공한 페이지의 PDF 경로를 페이지 순서대로 반환합니다."""
+        return [entry["artifact"] for entry in self.pages if self._is_done(entry)]
+
+    def failures(self):
+        """[(인덱스, 페이지 ID, 오류)] - 실패했거나 끝나지 않은 페이지."""
+        return [(idx, entry["page_id"], entry["error"] or "완료되지 않음")
+                for idx, entry in enumerate(self.pages) if entry["status"] != STATUS_DONE]
+
+    def is_complete(self):
+        return not self.pending_indexes()
+
+    def format_failure_report(self):
+        failures = self.failures()
+        if not failures:
+            return ""
+        lines = [f"실패한 페이지 {len(failures)}개 (성공한 {self.done_count()}개만 병합됨):"]
+        for idx, page_id, error in failures:
+            lines.append(f"  {idx + 1}. {page_id}: {error.splitlines()[0] if error else ''}")
+        lines.append("같은 페이지를 다시 내보내면 실패한 페이지만 다시 렌더링합니다.")
+        return "\n".join(lines)
+
+    def remove(self):
+        """모든 페이지가 병합된 뒤 작업 폴더(매니페스트와 중간 PDF)를 지웁니다."""
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+def prune_jobs(base_dir=TEMP_DIR, max_age_days=EXPORT_JOB_MAX_AGE_DAYS, max_count=EXPORT_JOB_MAX_COUNT, keep=None, now=None):
+    """base_dir에 남은 작업 폴더(매니페스트가 있는 폴더) 중 max_age_days보다 오래되었거나 최근 max_count개 밖인 것을 지웁니다.
+    keep(지금 여는 작업 ID)은 지우지 않습니다. 지운 작업 수를 반환합니다."""
+    try:
+        names = os.listdir(base_dir)
+    except OSError:
+        return 0
+    jobs = []
+    for name in names:
+        if name == keep:
+            continue
+        try:
+            jobs.append((os.path.getmtime(os.path.join(base_dir, name, "manifest.json")), name))
+        except OSError:
+            continue
+    jobs.sort(reverse=True)
+    cutoff = (now or time.time()) - max_age_days * 86400
+    # 지금 여는 작업도 개수에 포함
+    keep_count = max(max_count - (keep is not None), 0)
+    removed = 0
+    for rank, (mtime, name) in enumerate(jobs):
+        if rank >= keep_count or mtime < cutoff:
+            shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+            removed += 1
+    return removed
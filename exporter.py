@@ -1,12 +1,23 @@
 import os
 import re
 import asyncio
-from notion_client import AsyncClient
-from playwright.async_api import async_playwright
-from PyPDF2 import PdfMerger
-from config import TEMP_DIR, FINAL_PDF_PATH
-from notion_api import fetch_all_child_blocks, get_synced_block_original_and_top_parent
+from config import (FINAL_PDF_PATH, STYLE_CSS_NAME, PIPELINE_FETCH_CONCURRENCY, PIPELINE_HTML_CONCURRENCY,
+                    PIPELINE_QUEUE_SIZE, RENDER_FETCH_TIMEOUT_SEC, RENDER_LOAD_TIMEOUT_SEC, RENDER_PRINT_TIMEOUT_SEC)
+from export_manifest import ExportManifest
+from output_variant import OutputVariant
+from render_scheduler import AdaptiveScheduler, estimate_page_weight, system_pressure
+from notion_api import get_synced_block_original_and_top_parent, create_notion_client
 from utils import extract_page_title
+from block_cache import fetch_page_blocks_cached
+from block_model import Block, Span, blocks_from_notion
+from notion_database import get_database_table
+from page_cache import get_page_cache
+from browser_warmup import get_warm_browser
+from render_worker import get_render_worker_pool
+from render_cache import get_render_cache
+from memory_monitor import MemoryMonitor
+from render_watchdog import PageTimings, RenderTimeout, with_timeout, close_quietly, render_with_retry
+from tracing import span, count, traced_api_call
 
 NOTION_COLOR_MAP = {
     'default': '#000000',
@@ -33,8 +44,11 @@ NOTION_BG_MAP = {
     'red_background': '#FDEBEC'
 }
 
-def get_styles():
-    css_path = os.path.join(os.getcwd(), 'portfolio_style.css')
+def get_style_path():
+    return os.path.join(os.getcwd(), STYLE_CSS_NAME)
+
+def get_styles(css_path=None):
+    css_path = css_path or get_style_path()
     try:
         with open(css_path, encoding='utf-8') as f:
             return f.read()
@@ -45,12 +59,13 @@ def get_styles():
 # extract_page_title 함수는 utils.py로 이동됨
 
 def rich_text_to_html(rich_text_array, process_nested_bullets=False):
+    """Span 튜플(block_model)을 HTML로 만듭니다."""
     if not rich_text_array:
         return ""
     html = ""
     for chunk in rich_text_array:
-        href = chunk.get("href")
-        text = chunk.get('plain_text', '').replace('\n', '<br>')
+        href = chunk.href
+        text = chunk.text.replace('\n', '<br>')
         if href:
             html += f'<a href="{href}" target="_blank">{text}</a>'
         else:
@@ -59,15 +74,14 @@ def rich_text_to_html(rich_text_array, process_nested_bullets=False):
 
 def apply_annotations(text, chunk):
     """
-    Notion rich_text 'annotations'를 HTML로 변환.
+    Span의 꾸밈(Notion rich_text 'annotations')을 HTML로 변환.
     - bold / italic / underline / strikethrough / code
     - color / *_background (인라인 스타일)
     """
     if not text:
         return ""
 
-    ann = (chunk.get("annotations") or {})
-    color_key = ann.get("color", "default")
+    color_key = chunk.color
 
     # --- 색상 매핑 (간단/안전한 기본값) ---
     fg_map = {
@@ -95,15 +109,15 @@ def apply_annotations(text, chunk):
     }
 
     # --- 텍스트 스타일 태그 ---
-    if ann.get("bold"):
+    if chunk.bold:
         text = f"<strong>{text}</strong>"
-    if ann.get("italic"):
+    if chunk.italic:
         text = f"<em>{text}</em>"
-    if ann.get("underline"):
+    if chunk.underline:
         text = f"<u>{text}</u>"
-    if ann.get("strikethrough"):
+    if chunk.strikethrough:
         text = f"<s>{text}</s>"
-    if ann.get("code"):
+    if chunk.code:
         text = f"<code>{text}</code>"
 
     # --- 전경/배경 색상 인라인 스타일 ---
@@ -130,11 +144,10 @@ def apply_annotations(text, chunk):
 def get_cell_style(cell, row_bg=None):
     if not cell:
         return ""
-    first = cell[0] if cell else {}
-    annotations = first.get('annotations', {})
-    color = annotations.get('color', 'default')
-    font_weight = 'bold' if annotations.get('bold') else 'normal'
-    font_style = 'italic' if annotations.get('italic') else 'normal'
+    first = cell[0]
+    color = first.color
+    font_weight = 'bold' if first.bold else 'normal'
+    font_style = 'italic' if first.italic else 'normal'
     text_color = NOTION_COLOR_MAP.get(color.replace('_background', ''), '#000')
     if 'background' in color:
         bg_color = NOTION_BG_MAP.get(color, '#fff')
@@ -146,18 +159,18 @@ def get_cell_style(cell, row_bg=None):
     return style
 
 def get_plain_text_from_cell(cell):
-    return ''.join([t.get('plain_text', '') for t in cell])
+    return ''.join([t.text for t in cell])
 
 def estimate_column_widths_with_pixel_heuristic(table_rows):
     if not table_rows:
         return []
     col_lengths = []
-    max_cols = max(len(row['table_row']['cells']) for row in table_rows) if table_rows else 0
+    max_cols = max(len(row.attr('cells', ())) for row in table_rows) if table_rows else 0
     if max_cols == 0: return []
     for col_idx in range(max_cols):
         max_length = 0
         for row in table_rows:
-            cells = row['table_row']['cells']
+            cells = row.attr('cells', ())
             if col_idx < len(cells):
                 cell_text = get_plain_text_from_cell(cells[col_idx])
                 line_lengths = [len(line) for line in cell_text.split('\n')]
@@ -176,7 +189,7 @@ def estimate_column_widths_with_pixel_heuristic(table_rows):
     wrap_cols = set()
     for col_idx in range(max_cols):
         for row in table_rows:
-            cells = row['table_row']['cells']
+            cells = row.attr('cells', ())
             if col_idx < len(cells):
                 cell_text = get_plain_text_from_cell(cells[col_idx])
                 if '\n' in cell_text:
@@ -193,14 +206,49 @@ def estimate_column_widths_with_pixel_heuristic(table_rows):
         percent_widths[0] += diff
     return percent_widths
 
+def table_to_html(row_blocks, has_column_header=False, has_row_header=False):
+    """table_row 블록 목록을 열 너비를 추정한 <table>로 만듭니다 (표 블록과 인라인 데이터베이스가 함께 씀)."""
+    width_ratios = estimate_column_widths_with_pixel_heuristic(row_blocks)
+    colgroup_html = ''.join([f'<col style="width:{ratio:.2f}%">' for ratio in width_ratios]) if width_ratios else ""
+    table_html_content = f"<table><colgroup>{colgroup_html}</colgroup>"
+    for i_row, row_block in enumerate(row_blocks):
+        if row_block.type == 'table_row':
+            cells = row_block.attr('cells', ())
+            row_bg = row_block.attr('background', 'default')
+            table_html_content += f"<tr style='background:{NOTION_BG_MAP.get(row_bg, '#fff')}'>"
+            for col_idx, cell in enumerate(cells):
+                style = get_cell_style(cell, row_bg=row_bg)
+                tag = 'th' if (has_column_header and i_row == 0) or (has_row_header and col_idx == 0) else 'td'
+                if tag == 'th':
+                    table_html_content += f"<th class='table-header-cell' style='{style}'>{rich_text_to_html(cell)}</th>"
+                else:
+                    table_html_content += f"<td style='{style}'>{rich_text_to_html(cell)}</td>"
+            table_html_content += "</tr>"
+    table_html_content += "</table>"
+    return table_html_content
+
+async def database_to_html(block, notion_client):
+    """인라인 데이터베이스(child_database)를 속성 이름을 머리글로 한 표로 만듭니다."""
+    try:
+        table = await get_database_table(notion_client, block.id)
+    except Exception as e:
+        print(f"데이터베이스 가져오기 오류 ({block.id}): {e}")
+        return ""
+    title = table['title'] or block.attr('title', '')
+    header = Block('table_row', attrs={'cells': tuple((Span(name),) for name in table['columns'])})
+    rows = [Block('table_row', attrs={'cells': tuple(row['cells'])}) for row in table['rows']]
+    title_html = f"<h3 class='database-title'>{title}</h3>" if title else ""
+    return title_html + table_to_html([header] + rows, has_column_header=True)
+
 async def ensure_children(block, notion_client):
-    if block.get('has_children') and not block.get('children'):
+    # 가져올 때 하위 블록을 받지 못한 블록(children이 None)만 다시 조회
+    if block.children is None:
         try:
-            resp = await notion_client.blocks.children.list(block_id=block['id'])
-            block['children'] = resp.get('results', [])
+            resp = await traced_api_call("notion.blocks.children.list", notion_client.blocks.children.list(block_id=block.id))
+            block.children = blocks_from_notion(resp.get('results', []))
         except Exception:
-            block['children'] = []
-    return block.get('children') or []
+            block.children = ()
+    return block.children
 
 async def blocks_to_html(blocks, notion_client):
     if not blocks:
@@ -209,7 +257,7 @@ async def blocks_to_html(blocks, notion_client):
     i = 0
     while i < len(blocks):
         block = blocks[i]
-        block_type = block['type']
+        block_type = block.type
         if block_type == 'synced_block':
             synced_children = await ensure_children(block, notion_client)
             synced_block_content = await blocks_to_html(synced_children, notion_client) if synced_children else ""
@@ -220,9 +268,9 @@ async def blocks_to_html(blocks, notion_client):
             list_tag = 'ul' if block_type == 'bulleted_list_item' else 'ol'
             list_items = []
             j = i
-            while j < len(blocks) and blocks[j]['type'] == block_type:
+            while j < len(blocks) and blocks[j].type == block_type:
                 current_block = blocks[j]
-                item_content = rich_text_to_html(current_block[block_type]['rich_text'])
+                item_content = rich_text_to_html(current_block.text)
                 children = await ensure_children(current_block, notion_client)
                 if children:
                     item_content += await blocks_to_html(children, notion_client)
@@ -233,66 +281,49 @@ async def blocks_to_html(blocks, notion_client):
             continue
         block_html = ""
         if block_type == 'heading_1':
-            block_html = f"<h1>{rich_text_to_html(block['heading_1']['rich_text'])}</h1>"
+            block_html = f"<h1>{rich_text_to_html(block.text)}</h1>"
         elif block_type == 'heading_2':
-            block_html = f"<h2>{rich_text_to_html(block['heading_2']['rich_text'])}</h2>"
+            block_html = f"<h2>{rich_text_to_html(block.text)}</h2>"
         elif block_type == 'heading_3':
-            block_html = f"<h3>{rich_text_to_html(block['heading_3']['rich_text'])}</h3>"
+            block_html = f"<h3>{rich_text_to_html(block.text)}</h3>"
         elif block_type == 'paragraph':
-            text = rich_text_to_html(block['paragraph']['rich_text'])
+            text = rich_text_to_html(block.text)
             block_html = f"<p>{text if text.strip() else ' '}</p>"
             children = await ensure_children(block, notion_client)
             if children:
                 block_html += f"<div style='margin-left: 2em;'>{await blocks_to_html(children, notion_client)}</div>"
         elif block_type == 'image':
-            image_data = block['image']
-            url = image_data.get('file', {}).get('url') or image_data.get('external', {}).get('url', '')
+            url = block.attr('url', '')
             block_html = f"<img src='{url}' alt='Image' class='notion-block-image' style='max-width: 100%; height: auto;'>"
             # 캡션 출력 추가
-            caption_rich_text = image_data.get('caption', [])
+            caption_rich_text = block.attr('caption')
             if caption_rich_text:
                 caption_html = rich_text_to_html(caption_rich_text)
                 block_html += f"<div class='notion-image-caption' style='text-align:left; color:#666; font-size:0.95em; margin-top:0.2em; margin-bottom:0.8em;'>{caption_html}</div>"
         elif block_type == 'code':
-            code_text = rich_text_to_html(block['code']['rich_text'])
-            language = block['code'].get('language', '')
+            code_text = rich_text_to_html(block.text)
+            language = block.attr('language', '')
             block_html = f"<pre><code class='language-{language}'>{code_text}</code></pre>"
         elif block_type == 'divider':
             block_html = "<hr>"
         elif block_type == 'quote':
-            block_html = f"<blockquote>{rich_text_to_html(block['quote']['rich_text'])}</blockquote>"
+            block_html = f"<blockquote>{rich_text_to_html(block.text)}</blockquote>"
         elif block_type == 'toggle':
-            summary = rich_text_to_html(block['toggle']['rich_text'])
+            summary = rich_text_to_html(block.text)
             children = await ensure_children(block, notion_client)
             children_html = await blocks_to_html(children, notion_client) if children else ""
             block_html = f"<details open><summary>{summary}</summary>{children_html}</details>"
         elif block_type == 'table':
-            width_ratios = estimate_column_widths_with_pixel_heuristic(block.get('children', []))
-            colgroup_html = ''.join([f'<col style="width:{ratio:.2f}%">' for ratio in width_ratios]) if width_ratios else ""
-            table_html_content = f"<table><colgroup>{colgroup_html}</colgroup>"
-            if block.get('children'):
-                for i_row, row_block in enumerate(block['children']):
-                    if row_block['type'] == 'table_row':
-                        cells = row_block['table_row']['cells']
-                        row_bg = row_block['table_row'].get('background', 'default')
-                        table_html_content += f"<tr style='background:{NOTION_BG_MAP.get(row_bg, '#fff')}'>"
-                        for col_idx, cell in enumerate(cells):
-                            style = get_cell_style(cell, row_bg=row_bg)
-                            tag = 'th' if (block['table'].get('has_column_header') and i_row == 0) or (block['table'].get('has_row_header') and col_idx == 0) else 'td'
-                            if tag == 'th':
-                                table_html_content += f"<th class='table-header-cell' style='{style}'>{rich_text_to_html(cell)}</th>"
-                            else:
-                                table_html_content += f"<td style='{style}'>{rich_text_to_html(cell)}</td>"
-                        table_html_content += "</tr>"
-            table_html_content += "</table>"
-            block_html = table_html_content
+            block_html = table_to_html(block.children or (), block.attr('has_column_header'),
+                                       block.attr('has_row_header'))
+        elif block_type == 'child_database':
+            block_html = await database_to_html(block, notion_client)
         elif block_type == 'callout':
-            callout = block['callout']
-            icon_html = callout['icon']['emoji'] if callout.get('icon') and callout['icon'].get('type') == 'emoji' else ''
-            callout_text = rich_text_to_html(callout.get('rich_text', []))
+            icon_html = block.attr('icon', '')
+            callout_text = rich_text_to_html(block.text)
             children = await ensure_children(block, notion_client)
             children_html = await blocks_to_html(children, notion_client) if children else ""
-            color_cls = f" callout--{callout.get('color')}" if callout.get('color') else ""
+            color_cls = f" callout--{block.attr('color')}" if block.attr('color') else ""
             block_html = (
                 f"<div class='callout{color_cls}'>"
                 f"  <div class='callout-icon'>{icon_html}</div>"
@@ -303,22 +334,36 @@ async def blocks_to_html(blocks, notion_client):
         i += 1
     return '\n'.join(html_parts)
 
-async def export_single_pdf(notion_client, page_id, page_index, temp_dir):
-    """단일 페이지의 PDF를 생성합니다."""
-    page_info = await notion_client.pages.retrieve(page_id=page_id)
+async def fetch_page_source(notion_client, page_id):
+    """페이지 제목과 블록 트리를 가져옵니다. 페이지 정보와 블록 트리는 캐시를 거칩니다."""
+    with span("page.fetch_info", page_id=page_id):
+        page_info = await get_page_cache().retrieve(notion_client, page_id)
     page_title = extract_page_title(page_info)
-    blocks = await fetch_all_child_blocks(notion_client, page_id)
-    content_html = await blocks_to_html(blocks, notion_client)
-    styles = get_styles()
-    
+    with span("page.fetch_blocks", page_id=page_id):
+        blocks = await fetch_page_blocks_cached(notion_client, page_id, page_info.last_edited_time)
     clean_title = page_title.strip() if page_title else ""
+    return clean_title, blocks
+
+async def build_page_html(notion_client, page_id, blocks):
+    with span("page.html", page_id=page_id) as span_args:
+        content_html = await blocks_to_html(blocks, notion_client)
+        span_args["html_bytes"] = len(content_html.encode("utf-8"))
+    return content_html
+
+async def build_page_content(notion_client, page_id):
+    """페이지 제목과 본문 HTML을 만듭니다."""
+    clean_title, blocks = await fetch_page_source(notion_client, page_id)
+    return clean_title, await build_page_html(notion_client, page_id, blocks)
+
+def build_full_html(clean_title, content_html, styles, page_index=0):
+    """본문 HTML에 스타일시트와 제목을 입혀 완성된 HTML 문서를 만듭니다."""
     # 제목이 없거나 'Untitled'면 h1을 출력하지 않음
     if clean_title and clean_title.lower() != "untitled":
         title_section = f'<h1>{clean_title}</h1><div style="height: 0.3em;"></div>'
     else:
         title_section = ""
     
-    full_html = f"""
+    return f"""
     <!DOCTYPE html>
     <html lang=\"ko\">
     <head>
@@ -332,54 +377,348 @@ async def export_single_pdf(notion_client, page_id, page_index, temp_dir):
     </body>
     </html>
     """
-    
-    pdf_path = os.path.join(temp_dir, f"My_Portfolio_{page_index}.pdf")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.set_content(full_html, wait_until="networkidle")
-        await page.pdf(path=pdf_path, format="A4", print_background=True)
-        await browser.close()
-    
+
+async def render_pdf(browser, full_html, pdf_path, page_index=0, pdf_options=None, assets=None,
+                     load_timeout=RENDER_LOAD_TIMEOUT_SEC, print_timeout=RENDER_PRINT_TIMEOUT_SEC):
+    """열려 있는 브라우저에서 새 컨텍스트의 탭으로 HTML을 PDF로 인쇄합니다. pdf_options는 page.pdf 옵션(기본 A4)입니다.
+    assets({URL: bytes})를 넘기면 그 URL 요청은 네트워크 대신 넘겨받은 내용으로 응답합니다 (원격 렌더링 워커용).
+    로드(load_timeout)나 인쇄(print_timeout)가 제한 시간을 넘기면 컨텍스트째 닫고 RenderTimeout을 일으킵니다."""
+    context = await with_timeout(browser.new_context(), load_timeout, "load")
+    try:
+        page = await context.new_page()
+        for url, body in (assets or {}).items():
+            await page.route(url, lambda route, body=body: route.fulfill(body=body))
+        with span("render.load", page_index=page_index):
+            await with_timeout(page.set_content(full_html, wait_until="networkidle"), load_timeout, "load")
+        with span("render.print", page_index=page_index) as span_args:
+            await with_timeout(page.pdf(path=pdf_path, **(pdf_options or {"format": "A4", "print_background": True})),
+                               print_timeout, "print")
+            span_args["pdf_bytes"] = os.path.getsize(pdf_path)
+        count("pdf.rendered_bytes", span_args["pdf_bytes"])
+    finally:
+        # 멈춘 탭은 컨텍스트를 닫아 정리 (닫기도 멈추면 시간 제한 후 포기)
+        await close_quietly(context)
     return pdf_path
 
+_STAGE_DONE = object()
+
+async def run_export_pipeline(notion, page_ids, pending, variants, job_dirs, on_done, on_failed,
+                              pressure_check=system_pressure, timings=None, edited_times=None):
+    """가져오기 -> HTML 생성 -> PDF 렌더링 단계를 제한된 큐로 연결해 동시에 실행합니다.
+    - 각 단계는 동시 실행 수가 따로 정해져 있어, 네트워크를 기다리는 동안에도 브라우저가 쉬지 않습니다.
+    - 페이지는 한 번만 가져와 본문 HTML을 만들고, 출력 형식(variants)마다 스타일시트를 입혀 따로 렌더링합니다.
+    - 렌더링 큐는 HTML이 큰 페이지부터 꺼내고, 렌더링 슬롯 수는 AdaptiveScheduler가 조절합니다.
+    - 결과는 on_done(idx, variant_index, pdf_path) / on_failed(idx, [variant_index, ...], error)로 알립니다.
+    - 렌더링 워커(render_worker, RENDER_WORKER_URLS)가 있으면 워커들에 나눠 맡기고, 슬롯 수 상한은 워커 슬롯 합계가 됩니다.
+    - 미리 띄운 브라우저(browser_warmup)가 켜져 있으면 새로 띄우지 않고 그 브라우저로 렌더링합니다.
+    - 렌더링 캐시(render_cache)가 켜져 있으면 같은 HTML과 옵션으로 인쇄한 PDF를 재사용합니다.
+    - 가져오기와 렌더링(로드/인쇄)은 단계별 시간 제한이 있고, 멈춘 렌더링은 새 브라우저 컨텍스트에서 한 번 더 시도합니다.
+      timings(PageTimings)를 넘기면 페이지별 단계 소요 시간과 시간 초과를 기록합니다.
+    - edited_times(dict)를 넘기면 가져온 페이지의 last_edited_time을 {페이지 ID: 수정 시각}으로 채웁니다.
+    pending은 [(페이지 인덱스, [렌더링할 variant 인덱스, ...])] 목록입니다 (앞에 있는 것부터 가져옴).
+    job_dirs는 variant별 중간 PDF 폴더입니다.
+    """
+    source_queue = asyncio.Queue()
+    for item in pending:
+        source_queue.put_nowait(item)
+    html_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    render_queue = asyncio.PriorityQueue(maxsize=PIPELINE_QUEUE_SIZE)
+    scheduler = None
+    render_cache = get_render_cache()
+    timings = timings or PageTimings(page_ids)
+    # 같은 스타일시트를 쓰는 variant는 CSS를 한 번만 읽음
+    styles_by_path = {}
+    for variant in variants:
+        if variant.stylesheet not in styles_by_path:
+            styles_by_path[variant.stylesheet] = get_styles(variant.stylesheet)
+
+    async def fetch(page_id):
+        # 블록 트리와 같은 수정 시각을 기록하도록 페이지 정보를 먼저 가져옴 (fetch_page_source에서는 캐시 적중)
+        page_info = await get_page_cache().retrieve(notion, page_id)
+        if edited_times is not None:
+            edited_times[page_id] = page_info.last_edited_time
+        return await fetch_page_source(notion, page_id)
+
+    async def fetch_worker():
+        while not source_queue.empty():
+            idx, variant_indexes = source_queue.get_nowait()
+            try:
+                with timings.measure(idx, "fetch"):
+                    clean_title, blocks = await with_timeout(fetch(page_ids[idx]), RENDER_FETCH_TIMEOUT_SEC, "fetch")
+            except Exception as e:
+                if isinstance(e, RenderTimeout):
+                    timings.record_timeout(idx, e)
+                on_failed(idx, variant_indexes, e)
+                continue
+            timings.titles[idx] = clean_title
+            await html_queue.put((idx, variant_indexes, clean_title, blocks))
+
+    async def html_worker():
+        while True:
+            item = await html_queue.get()
+            if item is _STAGE_DONE:
+                return
+            idx, variant_indexes, clean_title, blocks = item
+            try:
+                with timings.measure(idx, "html"):
+                    content_html = await build_page_html(notion, page_ids[idx], blocks)
+            except Exception as e:
+                on_failed(idx, variant_indexes, e)
+                continue
+            for variant_index in variant_indexes:
+                full_html = build_full_html(clean_title, content_html, styles_by_path[variants[variant_index].stylesheet], idx)
+                # (우선순위, 페이지, variant, HTML): 큰 페이지가 먼저
+                await render_queue.put((-len(full_html), idx, variant_index, full_html))
+
+    async def render_worker(render):
+        while True:
+            await scheduler.acquire()
+            _, idx, variant_index, full_html = await render_queue.get()
+            if full_html is _STAGE_DONE:
+                scheduler.release(completed=False)
+                return
+            completed = False
+            pdf_path = os.path.join(job_dirs[variant_index], f"My_Portfolio_{idx}.pdf")
+            pdf_options = variants[variant_index].pdf_options()
+            try:
+                cache_key = render_cache.key(full_html, pdf_options) if render_cache is not None else None
+                if cache_key is not None and await asyncio.to_thread(render_cache.get, cache_key, pdf_path):
+                    # 캐시 적중은 처리량 측정에 넣지 않음
+                    on_done(idx, variant_index, pdf_path)
+                    continue
+                with timings.measure(idx, "render"):
+                    await render_with_retry(render, full_html, pdf_path, idx, pdf_options, label=page_ids[idx],
+                                            on_timeout=lambda e, idx=idx: timings.record_timeout(idx, e))
+                completed = True
+                if cache_key is not None:
+                    await asyncio.to_thread(render_cache.put, cache_key, pdf_path)
+                on_done(idx, variant_index, pdf_path)
+            except Exception as e:
+                on_failed(idx, [variant_index], e)
+            finally:
+                scheduler.release(completed)
+
+    async def run_stage(workers, next_queue, stop_count, make_stop):
+        # 단계의 모든 작업자가 끝나면 다음 단계 작업자 수만큼 종료 표시를 넣음
+        await asyncio.gather(*workers)
+        for i in range(stop_count):
+            await next_queue.put(make_stop(i))
+
+    async def run_stages(render, max_slots=None):
+        nonlocal scheduler
+        if max_slots:
+            scheduler = AdaptiveScheduler(max_slots=max_slots, initial_slots=max_slots, pressure_check=pressure_check)
+        else:
+            scheduler = AdaptiveScheduler(pressure_check=pressure_check)
+        render_workers = scheduler.max_slots
+        await asyncio.gather(
+            run_stage([fetch_worker() for _ in range(PIPELINE_FETCH_CONCURRENCY)],
+                      html_queue, PIPELINE_HTML_CONCURRENCY, lambda i: _STAGE_DONE),
+            run_stage([html_worker() for _ in range(PIPELINE_HTML_CONCURRENCY)],
+                      render_queue, render_workers, lambda i: (float("inf"), i, 0, _STAGE_DONE)),
+            *(render_worker(render) for _ in range(render_workers)),
+        )
+
+    worker_pool = get_render_worker_pool()
+    if worker_pool is not None:
+        async with worker_pool.session() as session:
+            if session.capacity:
+                await run_stages(session.render, session.capacity)
+                return
+        print("렌더링 워커에 연결할 수 없어 이 컴퓨터에서 렌더링합니다")
+
+    warm_browser = get_warm_browser()
+    if warm_browser is not None:
+        # 유휴 시간 초과로 닫혀 있었다면 첫 페이지를 가져오는 동안 다시 띄움
+        warm_browser.start()
+        await run_stages(warm_browser.render)
+        return
+
+    # Playwright는 가져오는 데 시간이 걸리므로 실제로 렌더링할 때 가져옴 (앱 시작 시간 단축)
+    from playwright.async_api import async_playwright
+    async with async_playwright() as p:
+        async def launch_browser():
+            with span("browser.launch"):
+                return await p.chromium.launch(headless=True)
+        # 브라우저는 첫 페이지를 가져오는 동안 미리 띄움
+        browser_task = asyncio.create_task(launch_browser())
+
+        async def render(full_html, pdf_path, page_index, pdf_options):
+            return await render_pdf(await browser_task, full_html, pdf_path, page_index, pdf_options)
+
+        try:
+            await run_stages(render)
+        finally:
+            if not browser_task.done():
+                browser_task.cancel()
+            try:
+                browser = await browser_task
+                await browser.close()
+            except BaseException:
+                pass
+
 def merge_pdfs(pdf_paths, output_path):
     """여러 PDF 파일을 하나로 병합합니다."""
     if not pdf_paths:
         return None
     
-    merger = PdfMerger()
-    for pdf in pdf_paths:
-        merger.append(pdf)
-    merger.write(output_path)
-    merger.close()
+    with span("merge_pdfs", inputs=len(pdf_paths)) as span_args:
+        from PyPDF2 import PdfMerger
+        merger = PdfMerger()
+        for pdf in pdf_paths:
+            merger.append(pdf)
+        merger.write(output_path)
+        merger.close()
+        span_args["output_bytes"] = os.path.getsize(output_path)
     return output_path
 
-async def export_and_merge_pdf(page_ids, output_pdf_path="My_Portfolio_Final.pdf", progress_callback=None):
-    """여러 페이지의 PDF를 생성하고 병합합니다. progress_callback은 (current, total) 인수를 받습니다."""
-    NOTION_API_KEY = os.getenv("NOTION_API_KEY")
-    if not NOTION_API_KEY:
-        raise ValueError("NOTION_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
-    notion = AsyncClient(auth=NOTION_API_KEY)
-    
-    temp_dir = TEMP_DIR
-    os.makedirs(temp_dir, exist_ok=True)
-    temp_pdf_paths = []
-    
-    total_pages = len(page_ids)
-    semaphore = asyncio.Semaphore(4)
-    async def export_with_semaphore(page_id, idx):
-        async with semaphore:
-            if progress_callback:
-                progress_callback(idx, total_pages)
-            return await export_single_pdf(notion, page_id, idx, temp_dir)
-    tasks = [export_with_semaphore(page_id, idx) for idx, page_id in enumerate(page_ids)]
-    temp_pdf_paths = await asyncio.gather(*tasks)
-    temp_pdf_paths = [path for path in temp_pdf_paths if isinstance(path, str) and os.path.exists(path)]
-    
-    # 병합 완료 시 진행률 100%
-    if progress_callback:
-        progress_callback(total_pages, total_pages)
-    
+async def export_and_merge_pdf(page_ids, output_pdf_path="My_Portfolio_Final.pdf", progress_callback=None, notion_client=None,
+                               optimize_preset=None, manifest=None, keep_artifacts=False, edited_times=None):
+    """여러 페이지의 PDF를 생성하고 병합합니다. progress_callback은 (current, total) 인수를 받습니다.
+    notion_client를 넘기면 그 클라이언트를 사용합니다 (벤치마크용 고정 응답 클라이언트 등).
+    optimize_preset(screen/ebook/print)을 넘기면 병합 후 pdf_optimize로 용량을 줄입니다.
+    진행 상황은 ExportManifest에 기록되어, 실패하거나 취소된 작업을 다시 실행하면 남은 페이지만 렌더링합니다.
+    일부 페이지가 실패해도 나머지로 병합하며, 실패 내역은 manifest.format_failure_report()로 확인합니다.
+    keep_artifacts=True면 모두 성공해도 페이지별 PDF를 남겨, 바뀐 페이지만 다시 렌더링할 수 있게 합니다 (watch 모드).
+    edited_times({페이지 ID: last_edited_time})를 넘기면 이어서 진행할 때 그 수정 시각으로 바뀐 페이지를 가려냅니다.
+    """
     final_pdf_path = FINAL_PDF_PATH if output_pdf_path == "My_Portfolio_Final.pdf" else output_pdf_path
-    return merge_pdfs(temp_pdf_paths, final_pdf_path) 
\ No newline at end of file
+    merged_paths = await export_variants(page_ids, [OutputVariant(final_pdf_path)], progress_callback, notion_client,
+                                         optimize_preset, [manifest] if manifest is not None else None, keep_artifacts,
+                                         edited_times)
+    return merged_paths[0]
+
+async def export_variants(page_ids, variants, progress_callback=None, notion_client=None, optimize_preset=None, manifests=None,
+                          keep_artifacts=False, edited_times=None):
+    """같은 페이지들을 여러 출력 형식(OutputVariant: 용지 크기, 스타일시트, 여백)으로 한 번에 내보냅니다.
+    페이지는 한 번만 가져와 HTML을 만들고, variant별 렌더링은 같은 브라우저에서 함께 진행한 뒤 variant별로 동시에 병합합니다.
+    variant마다 ExportManifest(출력 경로 기준)가 따로 있어, 다시 실행하면 variant별로 남은 페이지만 렌더링합니다.
+    이전 실행에서 렌더링한 뒤 수정된 페이지(수정 시각이 다른 페이지)는 결과를 버리고 다시 렌더링합니다.
+    수정 시각은 edited_times에 없으면 페이지 캐시로 조회합니다.
+    반환값: variant 순서대로 병합된 PDF 경로 (성공한 페이지가 없으면 None)
+    """
+    notion = notion_client
+    if notion is None:
+        NOTION_API_KEY = os.getenv("NOTION_API_KEY")
+        if not NOTION_API_KEY:
+            raise ValueError("NOTION_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        notion = create_notion_client(NOTION_API_KEY)
+
+    if manifests is None:
+        manifests = [ExportManifest.open(page_ids, variant.output_path) for variant in variants]
+    edited_times = dict(edited_times or {})
+    unknown = {page_id for manifest in manifests for page_id in manifest.done_page_ids()} - set(edited_times)
+    if unknown:
+        edited_times.update(await fetch_edited_times(notion, unknown))
+    dropped = sum(manifest.drop_stale(edited_times) for manifest in manifests)
+    if dropped:
+        print(f"이전 실행 뒤 수정된 페이지 {dropped}건을 다시 렌더링합니다")
+    pending_variants = {}
+    for variant_index, manifest in enumerate(manifests):
+        os.makedirs(manifest.job_dir, exist_ok=True)
+        for idx in manifest.pending_indexes():
+            pending_variants.setdefault(idx, []).append(variant_index)
+
+    total_renders = len(page_ids) * len(variants)
+    done_renders = total_renders - sum(len(indexes) for indexes in pending_variants.values())
+    if progress_callback and done_renders:
+        # 이전 실행에서 끝난 페이지는 건너뜀
+        progress_callback(done_renders, total_renders)
+
+    # 큰 페이지부터 가져와 마지막에 큰 페이지 하나만 남아 기다리는 일을 줄임 (캐시에 없는 페이지는 평균 크기로 가정)
+    pending = list(pending_variants)
+    weights = {idx: estimate_page_weight(page_ids[idx]) for idx in pending}
+    known = [weight for weight in weights.values() if weight is not None]
+    default_weight = sum(known) / len(known) if known else 0
+    weights = {idx: default_weight if weight is None else weight for idx, weight in weights.items()}
+    pending.sort(key=lambda idx: weights[idx], reverse=True)
+    completed = done_renders
+    failed = 0
+
+    def report_progress(renders=1):
+        nonlocal completed
+        completed += renders
+        if progress_callback:
+            progress_callback(completed, total_renders)
+
+    fetched_times = {}
+
+    def on_done(idx, variant_index, pdf_path):
+        manifests[variant_index].mark_done(idx, pdf_path, fetched_times.get(page_ids[idx]))
+        report_progress()
+
+    def on_failed(idx, variant_indexes, error):
+        # 한 페이지의 실패가 나머지를 멈추지 않도록 기록만 하고 계속 진행
+        nonlocal failed
+        failed += len(variant_indexes)
+        print(f"페이지 PDF 생성 오류 ({page_ids[idx]}): {error}")
+        for variant_index in variant_indexes:
+            manifests[variant_index].mark_failed(idx, f"{type(error).__name__}: {error}")
+        report_progress(len(variant_indexes))
+
+    # 단계별 최대 메모리를 재고, 메모리 예산(MEMORY_BUDGET_MB)에 가까워지면 렌더링 슬롯을 줄임
+    timings = PageTimings(page_ids)
+    with MemoryMonitor() as monitor:
+        with monitor.stage("export_pages"), span("export_pages", pages=len(page_ids), variants=len(variants),
+                                                 resumed=done_renders) as span_args:
+            if pending:
+                await run_export_pipeline(notion, page_ids, [(idx, pending_variants[idx]) for idx in pending],
+                                          variants, [manifest.job_dir for manifest in manifests], on_done, on_failed,
+                                          pressure_check=monitor.pressure_check, timings=timings, edited_times=fetched_times)
+            span_args["failed"] = failed
+        # 다른 페이지보다 유난히 느렸거나 시간 제한에 걸린 페이지를 내보내기 보고서에 표시
+        timings.publish()
+
+        # 병합 완료 시 진행률 100%
+        if progress_callback:
+            progress_callback(total_renders, total_renders)
+
+        # variant별 병합/최적화는 스레드에서 동시에 진행 (to_thread는 현재 트레이서도 함께 넘김)
+        # 단계별 메모리를 나눠 재기 위해 모든 병합이 끝난 뒤 최적화를 시작
+        with monitor.stage("merge_pdfs"):
+            merged_paths = list(await asyncio.gather(*(
+                asyncio.to_thread(_merge_variant, variant, manifest, keep_artifacts)
+                for variant, manifest in zip(variants, manifests)
+            )))
+        if optimize_preset and any(merged_paths):
+            with monitor.stage("optimize_pdf"):
+                await asyncio.gather(*(
+                    asyncio.to_thread(_optimize_merged, merged_path, optimize_preset)
+                    for merged_path in merged_paths if merged_path
+                ))
+    return merged_paths
+
+async def fetch_edited_times(notion, page_ids):
+    """페이지들의 현재 last_edited_time을 {페이지 ID: 수정 시각}으로 반환합니다 (조회에 실패한 페이지는 빠짐)."""
+    semaphore = asyncio.Semaphore(PIPELINE_FETCH_CONCURRENCY)
+    edited_times = {}
+
+    async def fetch(page_id):
+        async with semaphore:
+            try:
+                edited_times[page_id] = (await get_page_cache().retrieve(notion, page_id)).last_edited_time
+            except Exception as e:
+                print(f"페이지 수정 시각 조회 오류 ({page_id}): {e}")
+
+    with span("export.check_edited", pages=len(page_ids)):
+        await asyncio.gather(*(fetch(page_id) for page_id in page_ids))
+    return edited_times
+
+def _merge_variant(variant, manifest, keep_artifacts=False):
+    """실패한 페이지가 있어도 성공한 페이지만으로 병합합니다 (작업 폴더는 다음 실행을 위해 남김)."""
+    merged_path = merge_pdfs(manifest.artifacts(), variant.output_path)
+    if manifest.is_complete() and not keep_artifacts:
+        manifest.remove()
+    return merged_path
+
+def _optimize_merged(merged_path, optimize_preset):
+    with span("optimize_pdf", preset=optimize_preset) as span_args:
+        try:
+            from pdf_optimize import optimize_pdf, format_optimize_result
+            result = optimize_pdf(merged_path, None, optimize_preset)
+            span_args.update(before_bytes=result["before_bytes"], after_bytes=result["after_bytes"])
+            count("pdf.before_optimize_bytes", result["before_bytes"])
+            count("pdf.after_optimize_bytes", result["after_bytes"])
+            print(format_optimize_result(result))
+        except Exception as e:
+            print(f"PDF 최적화 오류: {e}")
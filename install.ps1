@@ -27,6 +27,13 @@ Write-Host "pip 업그레이드 및 requirements.txt 설치..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# 선택 패키지: 설치에 실패해도 대체 방식으로 동작하므로 계속 진행
+Write-Host "선택 패키지(requirements-optional.txt) 설치..."
+pip install -r requirements-optional.txt
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "선택 패키지 일부를 설치하지 못했습니다. 대체 방식으로 실행됩니다 (README의 '선택 패키지' 참고)."
+}
+
 # 5. Playwright 브라우저 설치
 Write-Host "Playwright 브라우저 바이너리 설치..."
 playwright install
@@ -2,41 +2,74 @@ import sys
 import os
 import asyncio
 import time
+import threading
+import importlib
 from dotenv import load_dotenv
-from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem, QLabel, QMessageBox, QProgressBar, QStyleFactory, QTreeWidget, QTreeWidgetItem, QSplitter, QTreeView, QFileSystemModel, QFileDialog
-from PySide6.QtCore import Qt, QThread, Signal, Slot, QTimer, QDir, QSettings
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem, QLabel, QMessageBox, QProgressBar, QStyleFactory, QSplitter, QTreeView, QFileSystemModel, QFileDialog, QTextBrowser, QLineEdit, QCheckBox
+from PySide6.QtCore import Qt, QThread, Signal, Slot, QTimer, QDir, QSettings, QFileSystemWatcher, QElapsedTimer, QItemSelectionModel
 from PySide6.QtGui import QPalette, QColor, QDesktopServices
 from PySide6.QtCore import QUrl
-from notion_client import AsyncClient
-from exporter import export_and_merge_pdf
-from notion_api import get_root_pages, get_first_child_page_ids
-from config import FINAL_PDF_NAME, FINAL_PDF_PATH
-from utils import extract_page_title, extract_page_title_raw, extract_page_title_for_tree, has_hide_marker
+from exporter import export_and_merge_pdf, build_page_content, build_full_html, get_styles, get_style_path
+from notion_api import create_notion_client, get_root_pages, get_first_child_page_ids, build_page_tree, search_pages_edited_since, retrieve_pages_in_order, retrieve_children_of
+from config import (FINAL_PDF_NAME, FINAL_PDF_PATH, PREVIEW_DEBOUNCE_MS, TRACE_DIR, PDF_OPTIMIZE_PRESET,
+                    PREFETCH_DEBOUNCE_MS, PREFETCH_MAX_PAGES, STARTUP_WARMUP_MODULES, PREVIEW_CACHE_TTL_SEC)
+from notion_database import fetch_pages_blocks
+from page_cache import get_page_cache
+from rate_limit import ThrottledNotionClient
+from browser_warmup import start_warm_browser, stop_warm_browser
+from watch import ExportWatcher
+from tracing import Tracer, use_tracer
+from workspace_store import WorkspaceSnapshot
+from export_manifest import ExportManifest
+from optional_packages import format_fallbacks
+from page_tree_model import PageTreeModel, FLAG_HAS_CHILDREN
+from utils import extract_page_title, extract_page_title_raw, has_hide_marker, PageMeta
+
+try:
+    # WebEngine이 없는 환경에서는 QTextBrowser로 대체 (CSS 지원 제한)
+    from PySide6.QtWebEngineWidgets import QWebEngineView
+except ImportError:
+    QWebEngineView = None
 
 load_dotenv()
 
 class LoadPagesThread(QThread):
     pages_loaded = Signal(list, list)
+    snapshot_loaded = Signal(object)
+    delta_ready = Signal(list)
     error = Signal(str)
 
+    def __init__(self, force_full: bool = False):
+        super().__init__()
+        self.force_full = force_full
+
     def run(self):
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            root_pages, all_pages = loop.run_until_complete(get_root_pages())
-            self.pages_loaded.emit(root_pages, all_pages)
+            snapshot = None if self.force_full else WorkspaceSnapshot.load()
+            if snapshot is None or not snapshot.last_sync:
+                root_pages, all_pages = loop.run_until_complete(get_root_pages())
+                self.pages_loaded.emit(root_pages, all_pages)
+                return
+            # 스냅샷으로 즉시 표시한 뒤, 마지막 동기화 이후 수정된 페이지만 요청
+            self.snapshot_loaded.emit(snapshot)
+            notion_client = create_notion_client()
+            changed = loop.run_until_complete(search_pages_edited_since(notion_client, snapshot.last_sync))
+            self.delta_ready.emit(changed)
         except Exception as e:
             self.error.emit(str(e))
 
 class ExportPDFThread(QThread):
     progress = Signal(int, int)
-    finished = Signal(str, float)
+    finished = Signal(str, float, str)
     error = Signal(str)
 
-    def __init__(self, page_ids_unique, final_pdf_name):
+    def __init__(self, page_ids_unique, final_pdf_name, optimize_preset=None):
         super().__init__()
         self.page_ids_unique = page_ids_unique
         self.final_pdf_name = final_pdf_name
+        self.optimize_preset = optimize_preset
 
     def run(self):
         try:
@@ -45,31 +78,56 @@ class ExportPDFThread(QThread):
             start_time = time.time()
             def progress_callback(current, total_pages):
                 self.progress.emit(current, total_pages)
-            result = loop.run_until_complete(export_and_merge_pdf(self.page_ids_unique, self.final_pdf_name, progress_callback))
+            tracer = Tracer("export")
+            # 같은 페이지/출력 경로로 중단된 작업이 있으면 이어서 진행
+            manifest = ExportManifest.open(self.page_ids_unique, self.final_pdf_name)
+            with use_tracer(tracer):
+                result = loop.run_until_complete(export_and_merge_pdf(self.page_ids_unique, self.final_pdf_name, progress_callback,
+                                                                  optimize_preset=self.optimize_preset, manifest=manifest))
             elapsed = time.time() - start_time
-            self.finished.emit(result, elapsed)
+            summary = tracer.format_summary()
+            failure_report = manifest.format_failure_report()
+            if failure_report:
+                summary = failure_report + "\n\n" + summary
+            fallbacks = format_fallbacks()
+            if fallbacks:
+                summary += "\n\n" + fallbacks
+            try:
+                trace_path = tracer.write(os.path.join(TRACE_DIR, f"export_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+                summary += f"\n트레이스 파일: {os.path.abspath(trace_path)}"
+            except OSError as e:
+                summary += f"\n트레이스 저장 실패: {e}"
+            self.finished.emit(result, elapsed, summary)
         except Exception as e:
             self.error.emit(str(e))
 
 class LoadChildrenThread(QThread):
+    # 부모가 하나면 순서가 확정된 앞부분부터 여러 번 emit됩니다 (마지막이 전체 목록)
     children_loaded = Signal(str, list)
     error = Signal(str)
 
-    def __init__(self, parent_page_id: str):
+    def __init__(self, parent_page_ids: list, known_pages: dict = None):
         super().__init__()
-        self.parent_page_id = parent_page_id
+        self.parent_page_ids = parent_page_ids
+        self.known_pages = known_pages or {}
 
     def run(self):
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            notion_client = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
-            child_ids = loop.run_until_complete(get_first_child_page_ids(self.parent_page_id, notion_client))
-            children = []
-            for cid in child_ids:
-                page_info = loop.run_until_complete(notion_client.pages.retrieve(page_id=cid))
-                children.append(page_info)
-            self.children_loaded.emit(self.parent_page_id, children)
+            notion_client = create_notion_client()
+            if len(self.parent_page_ids) == 1:
+                parent_page_id = self.parent_page_ids[0]
+                child_ids = loop.run_until_complete(get_first_child_page_ids(parent_page_id, notion_client))
+                loop.run_until_complete(retrieve_pages_in_order(
+                    notion_client, child_ids, self.known_pages,
+                    lambda pages: self.children_loaded.emit(parent_page_id, pages)))
+                return
+            # 변경분 반영 시: 여러 부모의 자식을 한 스레드, 한 번의 조회로 확인
+            children = loop.run_until_complete(retrieve_children_of(
+                notion_client, self.parent_page_ids, self.known_pages))
+            for parent_page_id, pages in children.items():
+                self.children_loaded.emit(parent_page_id, pages)
         except Exception as e:
             self.error.emit(str(e))
 
@@ -85,10 +143,10 @@ class ChildPresenceThread(QThread):
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            notion_client = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
+            notion_client = create_notion_client()
             flags = {}
             for page in self.pages:
-                pid = page.get('id')
+                pid = page.id
                 try:
                     child_ids = loop.run_until_complete(get_first_child_page_ids(pid, notion_client))
                     flags[pid] = bool(child_ids)
@@ -111,51 +169,165 @@ class BuildFullTreeThread(QThread):
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            notion_client = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
-            parent_to_children = {}
-            visited = set()
-
-            async def crawl(page_id: str):
-                if page_id in visited:
-                    return
-                visited.add(page_id)
-                # 진행 보고
-                self.progress.emit(len(visited))
-                ids = await get_first_child_page_ids(page_id, notion_client)
-                children_pages = []
-                for cid in ids:
-                    page_info = await notion_client.pages.retrieve(page_id=cid)
-                    children_pages.append(page_info)
-                parent_to_children[page_id] = children_pages
-                for child in children_pages:
-                    await crawl(child['id'])
-
-            async def run_all():
-                for page in self.root_pages:
-                    await crawl(page['id'])
-
-            loop.run_until_complete(run_all())
+            notion_client = create_notion_client()
+            parent_to_children = loop.run_until_complete(build_page_tree(notion_client, self.root_pages, self.progress.emit))
             self.tree_ready.emit(parent_to_children)
         except Exception as e:
             self.error.emit(str(e))
 
+class PrefetchThread(QThread):
+    """선택한 페이지의 하위 페이지 목록과 블록 트리를 미리 블록 캐시에 채웁니다.
+    API 호출은 낮은 우선순위로 공유 레이트 리미터를 거치므로 대화형 요청 몫은 건드리지 않습니다.
+    """
+    children_ready = Signal(str, list)
+
+    def __init__(self, page_ids: list, known_pages: dict = None):
+        super().__init__()
+        self.page_ids = page_ids
+        self.known_pages = known_pages or {}
+        self._cancelled = False
+        self._loop = None
+        self._task = None
+
+    def cancel(self):
+        self._cancelled = True
+        loop, task = self._loop, self._task
+        # 이미 끝나 루프가 닫혔으면 취소할 것이 없음
+        if loop is None or task is None or not self.isRunning() or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # 확인한 직후 run()이 끝나며 루프를 닫은 경우
+            pass
+
+    async def prefetch(self, notion_client):
+        fetched = 0
+        for page_id in self.page_ids:
+            if self._cancelled:
+                return
+            # 내보내기와 같은 규칙: 본문의 하위 페이지가 있으면 그 페이지들, 없으면 자기 자신
+            child_ids = await get_first_child_page_ids(page_id, notion_client)
+            self.children_ready.emit(page_id, child_ids)
+            targets = (child_ids or [page_id])[:PREFETCH_MAX_PAGES - fetched]
+            if self._cancelled or not targets:
+                return
+            # 데이터베이스 행처럼 하위 페이지가 많으면 본문을 동시에 가져옴 (레이트 리미터가 속도를 조절)
+            pages = [self.known_pages.get(target_id) or await get_page_cache().retrieve(notion_client, target_id)
+                     for target_id in targets]
+            await fetch_pages_blocks(notion_client, pages)
+            fetched += len(targets)
+
+    def run(self):
+        try:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            notion_client = ThrottledNotionClient(create_notion_client(), low_priority=True)
+            self._task = self._loop.create_task(self.prefetch(notion_client))
+            self._loop.run_until_complete(self._task)
+        except (asyncio.CancelledError, Exception):
+            # 미리 가져오기는 실패해도 내보내기 때 다시 가져오므로 조용히 종료
+            pass
+        finally:
+            loop, self._loop, self._task = self._loop, None, None
+            loop.close()
+
+class WatchThread(QThread):
+    """선택한 페이지를 감시하며 바뀔 때마다 다시 내보냅니다 (watch.ExportWatcher). stop()으로 종료합니다."""
+    event = Signal(str)
+
+    def __init__(self, page_ids, output_path, optimize_preset=None):
+        super().__init__()
+        self.page_ids = page_ids
+        self.output_path = output_path
+        self.optimize_preset = optimize_preset
+        self._loop = None
+        self._stop_event = None
+
+    def stop(self):
+        loop, stop_event = self._loop, self._stop_event
+        # 오류 등으로 run()이 이미 끝나 루프가 닫혔으면 멈출 것이 없음
+        if loop is None or stop_event is None or not self.isRunning() or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(stop_event.set)
+        except RuntimeError:
+            pass
+
+    def run(self):
+        try:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._stop_event = asyncio.Event()
+            watcher = ExportWatcher(self.page_ids, self.output_path, create_notion_client(), self.optimize_preset,
+                                    on_event=self.event.emit)
+            self._loop.run_until_complete(watcher.run(self._stop_event))
+        except Exception as e:
+            self.event.emit(f"자동 갱신 중단: {e}")
+        finally:
+            self._loop.close()
+
+class PreviewThread(QThread):
+    ready = Signal(str, str, str, float)
+    error = Signal(str, str)
+
+    def __init__(self, page_id: str):
+        super().__init__()
+        self.page_id = page_id
+
+    def run(self):
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            notion_client = create_notion_client()
+            start_time = time.perf_counter()
+            title, content_html = loop.run_until_complete(build_page_content(notion_client, self.page_id))
+            self.ready.emit(self.page_id, title, content_html, time.perf_counter() - start_time)
+        except Exception as e:
+            self.error.emit(self.page_id, str(e))
+
+def warm_up_modules():
+    """창이 그려진 뒤 무거운 모듈(notion_client, PyPDF2, Playwright)을 미리 가져와,
+    첫 미리보기/내보내기 때 import 시간을 기다리지 않게 합니다."""
+    for module in STARTUP_WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"모듈 미리 가져오기 오류 ({module}): {e}")
+
 class MainWindow(QMainWindow):
     def __init__(self, demo_mode: bool = False, initial_out_dir: str | None = None):
         super().__init__()
         self.setWindowTitle("Notion PDF Exporter")
         self.setMinimumSize(720, 480)
-        self.root_pages = []
-        self.all_pages = []
+        self.snapshot = None
         self.demo_mode = demo_mode
         self.initial_out_dir = initial_out_dir
         self.settings = QSettings("notion_cv", "notion_pdf_exporter")
         self.init_ui()
         self.load_pages_thread = None
         self.export_pdf_thread = None
+        self.warmup_thread = None
         if self.demo_mode:
             self.setup_demo_ui()
         else:
-            self.load_pages()
+            # 창이 먼저 그려지도록 페이지 불러오기와 모듈 미리 가져오기는 이벤트 루프가 시작된 뒤에 실행
+            QTimer.singleShot(0, self.start_background_work)
+
+    def start_background_work(self):
+        self.load_pages()
+        # 시그널이 필요 없고 종료를 막으면 안 되므로 QThread 대신 데몬 스레드 사용
+        self.warmup_thread = threading.Thread(target=warm_up_modules, name="warmup", daemon=True)
+        self.warmup_thread.start()
+        if self.warm_browser_btn.isChecked():
+            start_warm_browser()
+
+    def set_warm_browser_enabled(self, enabled: bool):
+        self.settings.setValue("warm_browser", enabled)
+        if enabled:
+            start_warm_browser()
+        else:
+            stop_warm_browser()
 
     def init_ui(self):
         central = QWidget()
@@ -175,7 +347,7 @@ class MainWindow(QMainWindow):
         self.export_btn.setProperty("type", "primary")
         header.addWidget(self.export_btn)
         self.refresh_btn = QPushButton("새로고침")
-        self.refresh_btn.clicked.connect(self.load_pages)
+        self.refresh_btn.clicked.connect(lambda: self.load_pages(force_full=True))
         self.refresh_btn.setProperty("type", "secondary")
         header.addWidget(self.refresh_btn)
         self.up_btn = QPushButton("상위")
@@ -186,14 +358,66 @@ class MainWindow(QMainWindow):
         self.outdir_btn.clicked.connect(self.change_output_dir)
         self.outdir_btn.setProperty("type", "secondary")
         header.addWidget(self.outdir_btn)
+        self.preview_btn = QPushButton("미리보기")
+        self.preview_btn.setCheckable(True)
+        self.preview_btn.toggled.connect(self.set_preview_enabled)
+        self.preview_btn.setProperty("type", "secondary")
+        header.addWidget(self.preview_btn)
+        self.optimize_btn = QPushButton("용량 최적화")
+        self.optimize_btn.setCheckable(True)
+        optimize_tip = "병합한 PDF의 이미지를 줄이고 웹 보기용으로 최적화합니다"
+        optimize_fallbacks = format_fallbacks(("PIL", "pikepdf"))
+        self.optimize_btn.setToolTip(optimize_tip + ("\n\n" + optimize_fallbacks if optimize_fallbacks else ""))
+        self.optimize_btn.setChecked(self.settings.value("optimize_pdf", False, type=bool))
+        self.optimize_btn.toggled.connect(lambda checked: self.settings.setValue("optimize_pdf", checked))
+        self.optimize_btn.setProperty("type", "secondary")
+        header.addWidget(self.optimize_btn)
+        self.warm_browser_btn = QPushButton("브라우저 미리 실행")
+        self.warm_browser_btn.setCheckable(True)
+        self.warm_browser_btn.setToolTip("앱을 켜 둔 동안 PDF 렌더링용 브라우저를 미리 띄워 첫 내보내기를 빠르게 합니다")
+        self.warm_browser_btn.setChecked(self.settings.value("warm_browser", False, type=bool))
+        self.warm_browser_btn.toggled.connect(self.set_warm_browser_enabled)
+        self.warm_browser_btn.setProperty("type", "secondary")
+        header.addWidget(self.warm_browser_btn)
+        self.watch_btn = QPushButton("자동 갱신")
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.setToolTip("선택한 페이지가 Notion에서 바뀌면 바뀐 페이지만 다시 렌더링해 PDF를 갱신합니다")
+        self.watch_btn.toggled.connect(self.set_watch_enabled)
+        self.watch_btn.setProperty("type", "secondary")
+        header.addWidget(self.watch_btn)
+        self.watch_thread = None
+        self.stopping_watch_threads = set()
         layout.addLayout(header)
+        main_splitter = QSplitter(Qt.Horizontal)
         splitter = QSplitter(Qt.Vertical)
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setHeaderHidden(True)
-        self.tree_widget.setSelectionMode(QTreeWidget.ExtendedSelection)
-        self.tree_widget.setAlternatingRowColors(True)
-        self.tree_widget.itemExpanded.connect(self.on_item_expanded)
-        splitter.addWidget(self.tree_widget)
+        # 페이지 트리: 압축 인덱스 기반 모델, 행은 펼칠 때 필요한 만큼만 생성
+        self.page_model = PageTreeModel(self)
+        self.page_model.children_requested.connect(self.start_load_children)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.page_model)
+        self.tree_view.setHeaderHidden(True)
+        self.tree_view.setSelectionMode(QTreeView.ExtendedSelection)
+        self.tree_view.setAlternatingRowColors(True)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.selectionModel().selectionChanged.connect(self.on_tree_selection_changed)
+        # 페이지 제목 검색 (초성/부분 일치), 결과와 그 상위 페이지만 트리에 표시
+        tree_panel = QWidget()
+        tree_layout = QVBoxLayout(tree_panel)
+        tree_layout.setContentsMargins(0, 0, 0, 0)
+        tree_layout.setSpacing(6)
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("페이지 검색 (예: 프로젝트, ㅍㄹㅈ)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.apply_tree_search)
+        search_row.addWidget(self.search_edit, 1)
+        self.show_hidden_check = QCheckBox("숨김 포함")
+        self.show_hidden_check.setChecked(True)
+        self.show_hidden_check.toggled.connect(self.apply_tree_search)
+        search_row.addWidget(self.show_hidden_check)
+        tree_layout.addLayout(search_row)
+        tree_layout.addWidget(self.tree_view)
+        splitter.addWidget(tree_panel)
         # 파일 브라우저 (출력 폴더 표시)
         self.fs_model = QFileSystemModel()
         # 출력 폴더: 설정값 > 초기 인자 > 디폴트(.etc)
@@ -226,40 +450,183 @@ class MainWindow(QMainWindow):
         splitter.addWidget(self.file_view)
         splitter.setStretchFactor(0, 1)
         splitter.setStretchFactor(1, 1)
-        layout.addWidget(splitter)
+        main_splitter.addWidget(splitter)
+        # 미리보기 패널 (선택 페이지의 HTML을 현재 CSS로 렌더링)
+        self.preview_view = QWebEngineView() if QWebEngineView is not None else QTextBrowser()
+        if QWebEngineView is not None:
+            self.preview_view.loadFinished.connect(self.on_preview_load_finished)
+        self.preview_view.setVisible(False)
+        main_splitter.addWidget(self.preview_view)
+        main_splitter.setStretchFactor(0, 1)
+        main_splitter.setStretchFactor(1, 2)
+        layout.addWidget(main_splitter)
+        self.init_preview()
         # 초기 표시 직후 한 번 더 갱신하여 내용 보장
         QTimer.singleShot(0, self.refresh_file_view)
         
-        # 페이지 ID 매핑 캐시
-        self.page_item_map = {}
+        # 스냅샷 저장은 몰아서 한 번에
+        self.snapshot_save_timer = QTimer(self)
+        self.snapshot_save_timer.setSingleShot(True)
+        self.snapshot_save_timer.setInterval(1000)
+        self.snapshot_save_timer.timeout.connect(self.save_snapshot)
+
+    # --- Page search ---
+    def apply_tree_search(self, *_):
+        query = self.search_edit.text()
+        include_hidden = self.show_hidden_check.isChecked()
+        start_time = time.perf_counter()
+        matched = self.page_model.apply_search(query, include_hidden)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if query.strip():
+            # 결과가 많으면 전체 펼치기 대신 한 단계만
+            if matched <= 500:
+                self.tree_view.expandAll()
+            else:
+                self.tree_view.expandToDepth(0)
+            self.statusBar().showMessage(f"검색 결과 {matched}건 ({elapsed_ms:.1f} ms)")
+        else:
+            self.statusBar().clearMessage()
+
+    # --- Live preview ---
+    def init_preview(self):
+        # page_id -> (제목, 본문 HTML). CSS만 바뀌면 네트워크 없이 스타일만 다시 입힘
+        self.preview_cache = {}
+        self.preview_page_id = None
+        self._preview_threads = []
+        self._preview_timer = QElapsedTimer()
+        self.css_watcher = QFileSystemWatcher(self)
+        self.css_watcher.fileChanged.connect(self.on_css_changed)
+        self.preview_debounce = QTimer(self)
+        self.preview_debounce.setSingleShot(True)
+        self.preview_debounce.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_debounce.timeout.connect(self.render_preview)
+        self.selection_debounce = QTimer(self)
+        self.selection_debounce.setSingleShot(True)
+        self.selection_debounce.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.selection_debounce.timeout.connect(self.load_preview_for_selection)
+        # 선택 중인 페이지는 내보내기 전에 미리 가져옴
+        self.prefetch_thread = None
+        self.prefetched_children = {}
+        self.prefetch_debounce = QTimer(self)
+        self.prefetch_debounce.setSingleShot(True)
+        self.prefetch_debounce.setInterval(PREFETCH_DEBOUNCE_MS)
+        self.prefetch_debounce.timeout.connect(self.start_prefetch)
+
+    def set_preview_enabled(self, enabled: bool):
+        self.preview_view.setVisible(enabled)
+        css_path = get_style_path()
+        if enabled:
+            if os.path.exists(css_path) and css_path not in self.css_watcher.files():
+                self.css_watcher.addPath(css_path)
+            self.load_preview_for_selection()
+        elif self.css_watcher.files():
+            self.css_watcher.removePaths(self.css_watcher.files())
+
+    def on_tree_selection_changed(self):
+        if self.preview_btn.isChecked():
+            self.selection_debounce.start()
+        # 선택이 바뀌면 진행 중인 미리 가져오기는 취소하고 잠시 뒤 새 선택으로 다시 시작
+        if self.prefetch_thread is not None:
+            self.prefetch_thread.cancel()
+        self.prefetch_debounce.start()
+
+    def start_prefetch(self):
+        page_ids = [self.page_model.page_id(index) for index in self.tree_view.selectionModel().selectedRows()]
+        page_ids = [pid for pid in page_ids if isinstance(pid, str) and not pid.startswith("demo")]
+        self.prefetched_children = {}
+        if not page_ids:
+            return
+        known_pages = dict(self.snapshot.pages) if self.snapshot is not None else {}
+        thread = PrefetchThread(page_ids, known_pages)
+        thread.children_ready.connect(self.on_prefetch_children_ready)
+        thread.finished.connect(lambda t=thread: self.on_prefetch_finished(t))
+        if not hasattr(self, "_prefetch_threads"):
+            self._prefetch_threads = []
+        self._prefetch_threads.append(thread)
+        self.prefetch_thread = thread
+        thread.start()
+
+    def on_prefetch_finished(self, thread):
+        if thread in self._prefetch_threads:
+            self._prefetch_threads.remove(thread)
+        if self.prefetch_thread is thread:
+            self.prefetch_thread = None
+
+    def on_prefetch_children_ready(self, page_id: str, child_ids: list):
+        if self.sender() is self.prefetch_thread:
+            self.prefetched_children[page_id] = child_ids
+
+    def load_preview_for_selection(self):
+        indexes = self.tree_view.selectionModel().selectedRows()
+        if not indexes:
+            return
+        page_id = self.page_model.page_id(indexes[0])
+        if not isinstance(page_id, str) or page_id.startswith("demo"):
+            return
+        self.preview_page_id = page_id
+        cached = self.preview_cache.get(page_id)
+        # 미리보기 HTML의 이미지 URL은 일정 시간 뒤 만료되므로 오래된 항목은 다시 만듦
+        if cached is not None and time.monotonic() - cached[2] < PREVIEW_CACHE_TTL_SEC:
+            self.render_preview()
+            return
+        self.statusBar().showMessage("미리보기 불러오는 중...")
+        thread = PreviewThread(page_id)
+        thread.ready.connect(self.on_preview_ready)
+        thread.error.connect(self.on_preview_error)
+        thread.finished.connect(lambda t=thread: self._preview_threads.remove(t) if t in self._preview_threads else None)
+        self._preview_threads.append(thread)
+        thread.start()
+
+    @Slot(str, str, str, float)
+    def on_preview_ready(self, page_id: str, title: str, content_html: str, fetch_seconds: float):
+        self.preview_cache[page_id] = (title, content_html, time.monotonic())
+        if page_id == self.preview_page_id:
+            self.statusBar().showMessage(f"미리보기 데이터 로드: {fetch_seconds * 1000:.0f} ms")
+            self.render_preview()
+
+    @Slot(str, str)
+    def on_preview_error(self, page_id: str, msg: str):
+        if page_id == self.preview_page_id:
+            self.statusBar().showMessage(f"미리보기 실패: {msg}")
+
+    def on_css_changed(self, path: str):
+        # 일부 에디터는 저장 시 파일을 교체하므로 감시 경로를 다시 등록
+        if os.path.exists(path) and path not in self.css_watcher.files():
+            self.css_watcher.addPath(path)
+        self.preview_debounce.start()
+
+    def render_preview(self):
+        cached = self.preview_cache.get(self.preview_page_id)
+        if not cached or not self.preview_view.isVisible():
+            return
+        title, content_html, _ = cached
+        self._preview_timer.start()
+        full_html = build_full_html(title, content_html, get_styles())
+        self.preview_view.setHtml(full_html)
+        if QWebEngineView is None:
+            self.on_preview_load_finished(True)
+
+    def on_preview_load_finished(self, ok: bool):
+        if self._preview_timer.isValid():
+            elapsed_ms = self._preview_timer.elapsed()
+            self.statusBar().showMessage(f"미리보기 렌더링: {elapsed_ms} ms" if ok else "미리보기 렌더링 실패")
+            self._preview_timer.invalidate()
 
     # --- Demo mode helpers ---
     def setup_demo_ui(self):
         # 더미 데이터로 트리 채우기
-        self.tree_widget.clear()
         dummy_items = [
             "프로젝트 Alpha", "프로젝트 Beta", "프로젝트 Gamma",
             "기술 스택 정리", "시스템 설계 노트", "테스트 시나리오",
             "프로토타입 스크린샷", "회고 및 개선안"
         ]
-        for idx, name in enumerate(dummy_items):
-            root = QTreeWidgetItem([name])
-            root.setData(0, Qt.UserRole, "demo-id")
-            if idx == 1:
-                for j in range(1, 4):
-                    child = QTreeWidgetItem([f"Beta 하위 {j}"])
-                    child.setData(0, Qt.UserRole, "demo-child-id")
-                    root.addChild(child)
-            else:
-                root.addChild(QTreeWidgetItem(["..."]))
-            self.tree_widget.addTopLevelItem(root)
+        self.page_model.reset_roots([PageMeta(f"demo-{idx}", name) for idx, name in enumerate(dummy_items)], FLAG_HAS_CHILDREN)
+        self.page_model.set_children("demo-1", [PageMeta(f"demo-child-{j}", f"Beta 하위 {j}") for j in range(1, 4)])
         # 두 번째 최상위 항목만 선택
-        for i in range(self.tree_widget.topLevelItemCount()):
-            it = self.tree_widget.topLevelItem(i)
-            if it:
-                it.setSelected(False)
-        if self.tree_widget.topLevelItemCount() >= 2:
-            self.tree_widget.topLevelItem(1).setSelected(True)
+        self.tree_view.selectionModel().clearSelection()
+        second = self.page_model.index(1, 0)
+        if second.isValid():
+            self.tree_view.selectionModel().select(second, QItemSelectionModel.Select | QItemSelectionModel.Rows)
         # 진행률 표시 연출 (예: 10/25 => 40%)
         self.progress_bar.setMaximum(25)
         self.progress_bar.setValue(10)
@@ -281,94 +648,111 @@ class MainWindow(QMainWindow):
             pass
         QTimer.singleShot(150, QApplication.instance().quit)
 
-    def load_pages(self):
+    def load_pages(self, force_full: bool = False):
         self.progress_bar.setFormat("페이지 불러오는 중...")
         self.set_buttons_enabled(False)
-        self.load_pages_thread = LoadPagesThread()
+        self.load_pages_thread = LoadPagesThread(force_full)
         self.load_pages_thread.pages_loaded.connect(self.on_pages_loaded)
+        self.load_pages_thread.snapshot_loaded.connect(self.on_snapshot_loaded)
+        self.load_pages_thread.delta_ready.connect(self.on_delta_ready)
         self.load_pages_thread.error.connect(self.on_load_pages_error)
         self.load_pages_thread.start()
 
-    # --- Lazy load when expanding a node ---
-    def on_item_expanded(self, item: QTreeWidgetItem):
-        try:
-            if item.childCount() == 1 and item.child(0).text(0) == "...":
-                parent_id = item.data(0, Qt.UserRole)
-                if isinstance(parent_id, str):
-                    self.start_load_children(parent_id)
-        except Exception:
-            pass
-
+    # --- Lazy load when expanding a node (모델의 children_requested로 호출) ---
     def start_load_children(self, parent_page_id: str):
-        thread = LoadChildrenThread(parent_page_id)
+        self.start_load_children_of([parent_page_id])
+
+    def start_load_children_of(self, parent_page_ids: list):
+        if not parent_page_ids:
+            return
+        # 검색 결과로 이미 아는 페이지 메타데이터는 다시 조회하지 않음
+        known_pages = dict(self.snapshot.pages) if self.snapshot is not None else {}
+        thread = LoadChildrenThread(parent_page_ids, known_pages)
         thread.children_loaded.connect(self.on_children_loaded)
         thread.error.connect(lambda msg: None)
-        thread.start()
         if not hasattr(self, "_child_threads"):
             self._child_threads = []
         self._child_threads.append(thread)
+        thread.finished.connect(lambda t=thread: self._child_threads.remove(t) if t in self._child_threads else None)
+        thread.start()
 
     def on_children_loaded(self, parent_page_id: str, children_pages: list):
-        parent_item = self.page_item_map.get(parent_page_id)
-        if parent_item is None:
-            return
-        parent_item.takeChildren()
-        for page in children_pages:
-            title = extract_page_title_for_tree(page)
-            child = QTreeWidgetItem([title])
-            child.setData(0, Qt.UserRole, page['id'])
-            # 말단 노드는 기본적으로 삼각형(더미) 없이
-            parent_item.addChild(child)
-            self.page_item_map[page['id']] = child
+        # 이미 있던 자식은 하위 트리째 유지 (변경분만 반영)
+        self.page_model.set_children(parent_page_id, children_pages)
+        if self.snapshot is not None:
+            self.snapshot.set_children(parent_page_id, children_pages)
+            self.snapshot_save_timer.start()
 
     @Slot(list, dict)
     def on_child_presence_ready(self, pages: list, flags: dict):
         # 루트 항목들의 삼각형 유무 반영
         for page in pages:
-            pid = page.get('id')
-            item = self.page_item_map.get(pid)
-            if not item:
-                continue
-            # 기존 자식 제거
-            item.takeChildren()
-            if flags.get(pid):
-                # 자식이 있는 경우에만 더미를 넣어 확장 아이콘 표시
-                item.addChild(QTreeWidgetItem(["..."]))
+            pid = page.id
+            self.page_model.set_has_children(pid, bool(flags.get(pid)))
 
     @Slot(dict)
     def on_full_tree_ready(self, parent_to_children: dict):
-        # 완전한 트리를 한 번에 반영 (말단에는 더미를 추가하지 않음)
-        for pid, item in list(self.page_item_map.items()):
-            item.takeChildren()
-        for parent_id, children_pages in parent_to_children.items():
-            parent_item = self.page_item_map.get(parent_id)
-            if not parent_item:
-                continue
-            for page in children_pages:
-                title = extract_page_title_for_tree(page)
-                child = QTreeWidgetItem([title])
-                child.setData(0, Qt.UserRole, page['id'])
-                parent_item.addChild(child)
-                self.page_item_map[page['id']] = child
+        # 완전한 트리를 한 번에 반영 (말단에는 확장 표시 없음)
+        self.page_model.set_tree(parent_to_children)
         self.progress_bar.setFormat("")
+        if self.snapshot is not None:
+            self.snapshot.set_tree(parent_to_children)
+            self.snapshot_save_timer.start()
 
     @Slot(int)
     def on_full_tree_progress(self, visited_count: int):
         self.progress_bar.setFormat(f"트리 구성 중... {visited_count}개 로드")
 
+    def save_snapshot(self):
+        if self.snapshot is not None:
+            self.snapshot.save()
+
+    @Slot(object)
+    def on_snapshot_loaded(self, snapshot):
+        # 저장된 스냅샷으로 즉시 트리를 그리고, 이후 변경분(delta)만 반영
+        self.snapshot = snapshot
+        self.page_model.reset_roots(snapshot.root_pages())
+        self.page_model.set_tree(snapshot.tree_pages())
+        self.progress_bar.setFormat("변경 사항 확인 중...")
+        self.set_buttons_enabled(True)
+
+    @Slot(list)
+    def on_delta_ready(self, changed_pages):
+        if self.snapshot is None:
+            return
+        old_root_ids = set(self.page_model.root_ids())
+        diff = self.snapshot.apply_changes(changed_pages)
+        root_pages = self.snapshot.root_pages()
+        new_root_ids = {page.id for page in root_pages}
+        # 삭제된 페이지와 다른 페이지 아래로 옮겨진 루트는 제거 (옮겨진 곳은 부모 갱신 시 다시 추가됨)
+        demoted = [pid for pid in old_root_ids - new_root_ids if pid not in diff["removed"]]
+        for page_id in diff["removed"] + demoted:
+            self.page_model.remove_page(page_id)
+        # 바뀌거나 삭제된 페이지의 미리보기는 다시 만듦
+        for page_id in diff["updated"] + diff["removed"]:
+            self.preview_cache.pop(page_id, None)
+        if self.preview_page_id in diff["updated"] and self.preview_view.isVisible():
+            self.load_preview_for_selection()
+        for page in root_pages:
+            if page.id not in old_root_ids:
+                self.page_model.add_root(page)
+        # 수정된 페이지는 제목을 갱신하고, 본문(하위 페이지 목록)이 바뀌었을 수 있으므로 자식을 다시 확인
+        reload_ids = []
+        for page_id in diff["updated"] + diff["added"]:
+            if not self.page_model.contains(page_id):
+                continue
+            self.page_model.update_page(self.snapshot.pages[page_id])
+            reload_ids.append(page_id)
+        self.start_load_children_of(reload_ids)
+        self.snapshot_save_timer.start()
+        changed = len(diff["added"]) + len(diff["updated"]) + len(diff["removed"])
+        self.progress_bar.setFormat(f"변경 {changed}건 반영" if changed else "")
+
     @Slot(list, list)
     def on_pages_loaded(self, root_pages, all_pages):
-        self.root_pages = root_pages
-        self.all_pages = all_pages
-        self.tree_widget.clear()
-        self.page_item_map.clear()
-        for page in root_pages:
-            title = extract_page_title_for_tree(page)
-            root_item = QTreeWidgetItem([title])
-            root_item.setData(0, Qt.UserRole, page['id'])
-            # 일단 자식 더미는 넣지 않고, 존재 여부를 비동기로 판별 후 설정
-            self.tree_widget.addTopLevelItem(root_item)
-            self.page_item_map[page['id']] = root_item
+        self.snapshot = WorkspaceSnapshot.from_pages(all_pages, root_pages=root_pages)
+        # 일단 확장 표시 없이 루트만, 하위 트리는 비동기로 구성 후 반영
+        self.page_model.reset_roots(root_pages)
         # 전체 트리 비동기 사전 구성: 펼칠 때 지연 없이 즉시 표시되도록
         self.full_tree_thread = BuildFullTreeThread(root_pages)
         self.full_tree_thread.tree_ready.connect(self.on_full_tree_ready)
@@ -396,13 +780,15 @@ class MainWindow(QMainWindow):
         else:
             self.progress_bar.setFormat("")
 
-    @Slot(str, float)
-    def show_export_result(self, result, elapsed=None):
+    @Slot(str, float, str)
+    def show_export_result(self, result, elapsed=None, summary=""):
         msg = ""
         if result:
             msg = f"PDF 생성 완료: {result}"
             if elapsed is not None:
                 msg += f"\n(총 소요 시간: {elapsed:.2f}초)"
+            if summary:
+                msg += f"\n\n{summary}"
             QMessageBox.information(self, "완료", msg)
             self.progress_bar.setFormat("PDF 생성 완료!" + (f" (총 {elapsed:.2f}초)" if elapsed is not None else ""))
             # 파일 브라우저 새로고침 (감시가 늦을 수 있어 강제 갱신)
@@ -416,6 +802,8 @@ class MainWindow(QMainWindow):
             msg = "PDF 생성 실패"
             if elapsed is not None:
                 msg += f"\n(총 소요 시간: {elapsed:.2f}초)"
+            if summary:
+                msg += f"\n\n{summary}"
             QMessageBox.critical(self, "실패", msg)
             self.progress_bar.setFormat("PDF 생성 실패" + (f" (총 {elapsed:.2f}초)" if elapsed is not None else ""))
         self.set_exporting_state(False)
@@ -433,21 +821,25 @@ class MainWindow(QMainWindow):
         self.set_exporting_state(False)
         self.progress_bar.setFormat("PDF 생성 실패")
 
-    def export_pdf(self):
-        selected_items = self.tree_widget.selectedItems()
-        if not selected_items:
+    def collect_export_selection(self):
+        """선택한 페이지로 (내보낼 페이지 ID 목록, 출력 경로)를 만듭니다. 내보낼 페이지가 없으면 None."""
+        selected_indexes = self.tree_view.selectionModel().selectedRows()
+        if not selected_indexes:
             QMessageBox.warning(self, "경고", "최소 하나의 페이지를 선택하세요.")
-            return
+            return None
 
         page_ids = []
-        notion_client = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
+        notion_client = create_notion_client()
         
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
-        for item in selected_items:
-            page_id = item.data(0, Qt.UserRole)
-            first_child_ids = loop.run_until_complete(get_first_child_page_ids(page_id, notion_client))
+        for index in selected_indexes:
+            page_id = self.page_model.page_id(index)
+            # 선택하는 동안 미리 가져온 하위 페이지 목록이 있으면 재사용
+            first_child_ids = self.prefetched_children.get(page_id)
+            if first_child_ids is None:
+                first_child_ids = loop.run_until_complete(get_first_child_page_ids(page_id, notion_client))
             if first_child_ids:
                 page_ids.extend(first_child_ids)
             else:
@@ -455,33 +847,67 @@ class MainWindow(QMainWindow):
                 page_ids.append(page_id)
 
         page_ids_unique = list(dict.fromkeys(page_ids))
-        total = len(page_ids_unique)
-
-        if total == 0:
+        if not page_ids_unique:
             QMessageBox.warning(self, "경고", "출력할 페이지가 없습니다.")
-            return
-
-        self.set_exporting_state(True)
-        self.progress_bar.setMaximum(total)
-        self.progress_bar.setValue(0)
-        QApplication.processEvents()
+            return None
 
         # 선택된 최상위 노드의 이름으로 파일명 구성
-        top_selected = [it for it in selected_items if not it.parent()]
-        base_name = extract_page_title_for_tree(self.page_item_map_inv(top_selected[0]) if top_selected else {"properties":{}}) if False else None
-        # 위 한 줄은 안전을 위해 무시하고, 아래에서 텍스트 그대로 사용
-        base_name = top_selected[0].text(0) if top_selected else "My_Portfolio_Final"
+        top_selected = [index for index in selected_indexes if not index.parent().isValid()]
+        base_name = self.page_model.title(top_selected[0]) if top_selected else "My_Portfolio_Final"
         safe_name = ''.join(c for c in base_name if c not in '\\/:*?"<>|').strip() or "My_Portfolio_Final"
         # 현재 보기 중인 폴더에 저장
         current_dir = self.out_dir if hasattr(self, 'out_dir') and self.out_dir else os.path.dirname(FINAL_PDF_PATH)
-        output_name = os.path.join(current_dir, f"{safe_name}.pdf")
         # 동일 파일명이 있으면 덮어쓰기, 없으면 새로 생성 (파일명 변경 없이)
-        self.export_pdf_thread = ExportPDFThread(page_ids_unique, output_name)
+        return page_ids_unique, os.path.join(current_dir, f"{safe_name}.pdf")
+
+    def export_pdf(self):
+        selection = self.collect_export_selection()
+        if selection is None:
+            return
+        page_ids_unique, output_name = selection
+
+        self.set_exporting_state(True)
+        self.progress_bar.setMaximum(len(page_ids_unique))
+        self.progress_bar.setValue(0)
+        QApplication.processEvents()
+
+        optimize_preset = PDF_OPTIMIZE_PRESET if self.optimize_btn.isChecked() else None
+        self.export_pdf_thread = ExportPDFThread(page_ids_unique, output_name, optimize_preset)
         self.export_pdf_thread.progress.connect(self.update_progress)
         self.export_pdf_thread.finished.connect(self.show_export_result)
         self.export_pdf_thread.error.connect(self.on_export_error)
         self.export_pdf_thread.start()
 
+    def set_watch_enabled(self, enabled: bool):
+        if self.watch_thread is not None:
+            # 진행 중인 내보내기가 끝나야 멈추므로, 끝날 때까지 스레드 참조를 유지
+            thread, self.watch_thread = self.watch_thread, None
+            thread.stop()
+            self.stopping_watch_threads.add(thread)
+            thread.finished.connect(lambda: self.stopping_watch_threads.discard(thread))
+        if not enabled:
+            self.progress_bar.setFormat("자동 갱신 꺼짐")
+            return
+        selection = self.collect_export_selection()
+        if selection is None:
+            self.watch_btn.setChecked(False)
+            return
+        page_ids, output_name = selection
+        optimize_preset = PDF_OPTIMIZE_PRESET if self.optimize_btn.isChecked() else None
+        self.watch_thread = WatchThread(page_ids, output_name, optimize_preset)
+        self.watch_thread.event.connect(self.on_watch_event)
+        self.watch_thread.start()
+        self.progress_bar.setFormat(f"자동 갱신 중: {os.path.basename(output_name)}")
+
+    @Slot(str)
+    def on_watch_event(self, message):
+        if self.sender() is not self.watch_thread:
+            return
+        print(message)
+        self.progress_bar.setFormat(message.splitlines()[0])
+        if message.startswith("다시 내보내기 완료"):
+            self.refresh_file_view()
+
     def on_file_double_clicked(self, index):
         try:
             path = self.fs_model.filePath(index)
@@ -540,14 +966,9 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-def main():
-    app = QApplication(sys.argv)
-    is_demo = "--demo" in sys.argv
-    out_dir_arg = None
-    for i, a in enumerate(sys.argv):
-        if a == "--out" and i + 1 < len(sys.argv):
-            out_dir_arg = sys.argv[i + 1]
-            break
+def create_app(argv):
+    """QApplication을 만들고 테마(팔레트 + QSS)를 적용합니다."""
+    app = QApplication(argv)
     try:
         # Fusion 스타일 기반 + 팔레트 + QSS 적용
         app.setStyle(QStyleFactory.create("Fusion"))
@@ -569,6 +990,16 @@ def main():
     except Exception:
         # 스타일 적용 실패 시에도 앱은 실행되도록 방어
         pass
+    return app
+
+def main():
+    app = create_app(sys.argv)
+    is_demo = "--demo" in sys.argv
+    out_dir_arg = None
+    for i, a in enumerate(sys.argv):
+        if a == "--out" and i + 1 < len(sys.argv):
+            out_dir_arg = sys.argv[i + 1]
+            break
     window = MainWindow(demo_mode=is_demo, initial_out_dir=out_dir_arg)
     window.show()
     sys.exit(app.exec())
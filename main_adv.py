@@ -1,13 +1,11 @@
 import sys
-import os
 import asyncio
 import time
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QListWidget, QListWidgetItem, QLabel, QMessageBox, QProgressBar, QStyleFactory, QHBoxLayout
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPalette, QColor
-from notion_client import AsyncClient
 from exporter import export_and_merge_pdf
-from notion_api import get_root_pages, get_all_descendant_page_ids, get_first_child_page_ids
+from notion_api import create_notion_client, get_root_pages, get_all_descendant_page_ids, get_first_child_page_ids
 from config import FINAL_PDF_NAME
 from utils import extract_page_title
 
@@ -72,8 +70,8 @@ class MainWindowAdv(QMainWindow):
         self.list_widget.clear()
         for page in root_pages:
             title = extract_page_title(page)
-            item = QListWidgetItem(f"{title} ({page['id'][:8]})")
-            item.setData(Qt.UserRole, page['id'])
+            item = QListWidgetItem(f"{title} ({page.id[:8]})")
+            item.setData(Qt.UserRole, page.id)
             self.list_widget.addItem(item)
         self.label.setText("Notion 루트 페이지 목록 (고급):")
 
@@ -110,7 +108,7 @@ class MainWindowAdv(QMainWindow):
             return
 
         page_ids = []
-        notion_client = AsyncClient(auth=os.getenv("NOTION_API_KEY"))
+        notion_client = create_notion_client()
         
         for item in selected_items:
             page_id = item.data(Qt.UserRole)
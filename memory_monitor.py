@@ -0,0 +1,256 @@
+"""내보내기 작업의 메모리 사용량 측정.
+
+- 백그라운드 스레드가 MEMORY_SAMPLE_INTERVAL_SEC마다 이 프로세스(Python)와 하위 프로세스(Playwright 드라이버, Chromium 등)의 RSS를 잽니다.
+- stage(name) 구간마다 RSS 최대값을 따로 모으고, MEMORY_TRACEMALLOC이 켜져 있으면 구간 경계에서 tracemalloc 스냅샷을 찍어
+  Python 힙 최대값과 가장 많이 늘어난 할당 위치를 함께 남깁니다.
+- 결과는 트레이스 JSON(metadata.memory, 메모리 카운터 트랙)과 내보내기 요약에 들어갑니다.
+- MEMORY_BUDGET_MB가 정해져 있으면 사용량이 예산의 MEMORY_BUDGET_THROTTLE_RATIO를 넘는 순간부터 렌더링 스케줄러가 슬롯을 줄입니다.
+
+psutil이 없으면 리눅스에서는 /proc을 읽고, 그 밖의 환경에서는 Python 프로세스의 최대 RSS(getrusage)만 기록합니다.
+"""
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from config import MEMORY_BUDGET_MB, MEMORY_BUDGET_THROTTLE_RATIO, MEMORY_SAMPLE_INTERVAL_SEC, MEMORY_TRACEMALLOC
+from render_scheduler import system_pressure
+from tracing import get_tracer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MB = 1024 * 1024
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def _proc_rss(pid):
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * _PAGE_SIZE
+
+def _proc_children(pid):
+    """/proc에서 pid의 모든 하위 프로세스 ID를 찾습니다."""
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있으므로 마지막 ')' 뒤에서 자름
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    found, stack = [], list(children.get(pid, ()))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(children.get(child, ()))
+    return found
+
+def sample_rss():
+    """(Python 프로세스 RSS, 하위 프로세스 RSS 합계) 바이트. 잴 수 없는 값은 None."""
+    if psutil is not None:
+        process = psutil.Process()
+        children_rss = 0
+        for child in process.children(recursive=True):
+            try:
+                children_rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return process.memory_info().rss, children_rss
+    if os.path.isdir("/proc"):
+        pid = os.getpid()
+        children_rss = 0
+        for child in _proc_children(pid):
+            try:
+                children_rss += _proc_rss(child)
+            except OSError:
+                pass
+        return _proc_rss(pid), children_rss
+    if resource is not None:
+        # 현재 값이 아닌 프로세스 수명 동안의 최대값 (macOS는 바이트, 리눅스는 KB 단위)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return (peak if sys.platform == "darwin" else peak * 1024), None
+    return None, None
+
+class _StageStats:
+    __slots__ = ("python_peak", "children_peak", "total_peak", "heap_peak", "top_allocations", "_snapshot")
+
+    def __init__(self):
+        self.python_peak = self.children_peak = self.total_peak = None
+        self.heap_peak = None
+        self.top_allocations = []
+        self._snapshot = None
+
+    def observe(self, python_rss, children_rss):
+        if python_rss is not None:
+            self.python_peak = max(self.python_peak or 0, python_rss)
+        if children_rss is not None:
+            self.children_peak = max(self.children_peak or 0, children_rss)
+        if python_rss is not None:
+            total = python_rss + (children_rss or 0)
+            self.total_peak = max(self.total_peak or 0, total)
+
+    def as_dict(self):
+        def mb(value):
+            return None if value is None else round(value / MB, 1)
+        return {
+            "python_rss_peak_mb": mb(self.python_peak),
+            "browser_rss_peak_mb": mb(self.children_peak),
+            "total_rss_peak_mb": mb(self.total_peak),
+            "python_heap_peak_mb": mb(self.heap_peak),
+            "top_allocations": self.top_allocations,
+        }
+
+class MemoryMonitor:
+    """내보내기 작업 하나의 메모리 사용량을 잽니다. with 블록으로 쓰고, 안에서 단계마다 stage(name)을 엽니다.
+
+        with MemoryMonitor() as monitor:
+            with monitor.stage("export_pages"):
+                ...
+        monitor.report()  # {"budget_mb", "peak_rss_mb", "stages": {단계: {...}}}
+
+    트레이서는 만들 때의 현재 트레이서를 씁니다 (샘플링 스레드에는 contextvar가 전파되지 않으므로).
+    """
+
+    def __init__(self, budget_mb=MEMORY_BUDGET_MB, interval=MEMORY_SAMPLE_INTERVAL_SEC,
+                 use_tracemalloc=MEMORY_TRACEMALLOC, throttle_ratio=MEMORY_BUDGET_THROTTLE_RATIO, tracer=None):
+        self.budget_mb = budget_mb
+        self.interval = interval
+        self.use_tracemalloc = use_tracemalloc
+        self.throttle_ratio = throttle_ratio
+        self.tracer = tracer or get_tracer()
+        self.current = (None, None)
+        self.overall = _StageStats()
+        self.stages = {}
+        self._open_stages = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self.tracer is not None:
+            self.tracer.add_section("memory", self.report(), self.format_report())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"메모리 측정 오류: {e}")
+                return
+
+    def sample(self):
+        """RSS를 한 번 재서 전체와 열린 단계의 최대값을 갱신합니다."""
+        python_rss, children_rss = sample_rss()
+        with self._lock:
+            self.current = (python_rss, children_rss)
+            self.overall.observe(python_rss, children_rss)
+            for stats in self._open_stages:
+                stats.observe(python_rss, children_rss)
+        if self.tracer is not None and python_rss is not None:
+            self.tracer.gauge("memory.python_rss_mb", round(python_rss / MB, 1))
+            if children_rss is not None:
+                self.tracer.gauge("memory.browser_rss_mb", round(children_rss / MB, 1))
+        return python_rss, children_rss
+
+    @contextmanager
+    def stage(self, name):
+        """구간 동안의 RSS 최대값(과 tracemalloc이 켜져 있으면 Python 힙 최대값, 가장 많이 늘어난 할당 위치)을 기록합니다."""
+        stats = _StageStats()
+        tracing = self.use_tracemalloc and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            stats._snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            self._open_stages.append(stats)
+            self.stages[name] = stats
+        self.sample()
+        try:
+            yield stats
+        finally:
+            self.sample()
+            with self._lock:
+                self._open_stages.remove(stats)
+            if tracing and tracemalloc.is_tracing():
+                stats.heap_peak = tracemalloc.get_traced_memory()[1]
+                diff = tracemalloc.take_snapshot().compare_to(stats._snapshot, "lineno")
+                stats.top_allocations = [
+                    {"where": str(stat.traceback), "size_diff_kb": round(stat.size_diff / 1024, 1)}
+                    for stat in diff[:5] if stat.size_diff > 0
+                ]
+            stats._snapshot = None
+
+    def budget_pressure(self):
+        """마지막으로 잰 사용량이 예산의 throttle_ratio를 넘으면 그 이유를, 아니면 None을 반환합니다."""
+        if not self.budget_mb:
+            return None
+        python_rss, children_rss = self.current
+        if python_rss is None:
+            return None
+        used_mb = (python_rss + (children_rss or 0)) / MB
+        if used_mb >= self.budget_mb * self.throttle_ratio:
+            return f"memory budget {used_mb:.0f}/{self.budget_mb}MB"
+        return None
+
+    def pressure_check(self):
+        """AdaptiveScheduler의 pressure_check: 메모리 예산을 먼저 보고, 이어서 시스템 전체 메모리/부하를 확인합니다."""
+        return self.budget_pressure() or system_pressure()
+
+    def report(self):
+        with self._lock:
+            overall = self.overall.as_dict()
+            stages = {name: stats.as_dict() for name, stats in self.stages.items()}
+        return {"budget_mb": self.budget_mb, "peak_rss_mb": overall["total_rss_peak_mb"], "stages": stages}
+
+    def format_report(self):
+        report = self.report()
+        lines = ["단계별 최대 메모리 (Python / 브라우저 등 하위 프로세스 / 합계):"]
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.0f}MB"
+
+        for name, stats in report["stages"].items():
+            line = (f"  {name}: {fmt(stats['python_rss_peak_mb'])} / {fmt(stats['browser_rss_peak_mb'])}"
+                    f" / {fmt(stats['total_rss_peak_mb'])}")
+            if stats["python_heap_peak_mb"] is not None:
+                line += f" (Python 힙 최대 {stats['python_heap_peak_mb']:.1f}MB)"
+            lines.append(line)
+        peak = report["peak_rss_mb"]
+        budget = report["budget_mb"]
+        if budget:
+            lines.append(f"  전체 최대: {fmt(peak)} (예산 {budget}MB{', 초과' if peak and peak > budget else ''})")
+        else:
+            lines.append(f"  전체 최대: {fmt(peak)}")
+        return "\n".join(lines)
@@ -1,30 +1,82 @@
 import os
-from notion_client import AsyncClient
+import asyncio
+from block_model import Block
+from config import CHILD_FETCH_CONCURRENCY
+from notion_transport import create_client
+from page_cache import get_page_cache
+from rate_limit import rate_limited_call
+from tracing import span, traced_api_call
+from utils import PageMeta
 
-async def get_root_pages():
-    NOTION_API_KEY = os.getenv("NOTION_API_KEY")
-    notion = AsyncClient(auth=NOTION_API_KEY)
+def create_notion_client(auth=None, **options):
+    """NOTION_API_KEY로 AsyncClient를 만듭니다. 연결 풀/HTTP/2/JSON 디코더 설정은 notion_transport를 따릅니다.
+    notion_client(httpx 포함)는 가져오는 데 시간이 걸리므로 앱 시작 시가 아니라 처음 필요할 때 가져옵니다.
+    """
+    return create_client(auth or os.getenv("NOTION_API_KEY"), **options)
+
+def is_root_page(page, page_ids, top_level_databases=()):
+    """부모 페이지가 page_ids 안에 없으면 루트 페이지입니다.
+    데이터베이스 행은 데이터베이스가 워크스페이스 바로 아래 있을 때만 루트이고, 그 밖에는 데이터베이스가 들어 있는
+    페이지의 하위 페이지로 보입니다 (get_first_child_page_ids).
+    """
+    if page.parent_type == "database_id":
+        return page.parent_id in top_level_databases
+    return not (page.parent_type == "page_id" and page.parent_id in page_ids)
+
+async def get_root_pages(notion=None):
+    """전체 페이지를 검색해 (루트 페이지, 전체 페이지)를 PageMeta 목록으로 반환합니다.
+    원본 JSON은 페이지 단위로 바로 PageMeta로 줄이고 보관하지 않습니다.
+    """
+    if notion is None:
+        notion = create_notion_client()
     all_pages = []
     start_cursor = None
     while True:
         response = await notion.search(filter={"property": "object", "value": "page"}, page_size=100, start_cursor=start_cursor)
-        all_pages.extend(response.get("results", []))
+        all_pages.extend(PageMeta.from_page(page) for page in response.get("results", []))
         start_cursor = response.get("next_cursor")
         if not start_cursor:
             break
-    root_pages = []
-    for page in all_pages:
-        parent = page.get("parent", {})
-        parent_type = parent.get("type", "")
-        if parent_type != "database_id" and not (parent_type == "page_id" and parent.get("page_id") in [p['id'] for p in all_pages]):
-            root_pages.append(page)
+    # 검색 결과에 전체 페이지 객체가 있으므로 곧 이어질 pages.retrieve를 대신함
+    get_page_cache().seed(all_pages)
+    page_ids = {page.id for page in all_pages}
+    database_ids = {page.parent_id for page in all_pages if page.parent_type == "database_id" and page.parent_id}
+    top_level_databases = set()
+    if database_ids:
+        from notion_database import find_top_level_databases
+        top_level_databases = await find_top_level_databases(notion, database_ids)
+    root_pages = [page for page in all_pages if is_root_page(page, page_ids, top_level_databases)]
     return root_pages, all_pages
 
+async def search_pages_edited_since(notion, since):
+    """last_edited_time 내림차순으로 검색하며, since보다 오래된 결과가 나오면 중단합니다.
+    Notion의 수정 시각은 분 단위이므로 since와 같은 시각의 페이지는 다시 포함합니다.
+    """
+    changed = []
+    start_cursor = None
+    with span("search_pages_edited_since", since=since or "") as span_args:
+        while True:
+            response = await traced_api_call("notion.search", notion.search(
+                filter={"property": "object", "value": "page"},
+                sort={"direction": "descending", "timestamp": "last_edited_time"},
+                page_size=100, start_cursor=start_cursor))
+            for page in response.get("results", []):
+                if since and page.get("last_edited_time", "") < since:
+                    break
+                changed.append(PageMeta.from_page(page))
+            else:
+                start_cursor = response.get("next_cursor")
+                if start_cursor:
+                    continue
+            get_page_cache().seed(changed)
+            span_args["changed"] = len(changed)
+            return changed
+
 async def get_all_descendant_page_ids(page_id, all_pages):
     ids = [page_id]
-    children = [p for p in all_pages if p.get("parent", {}).get("type") == "page_id" and p.get("parent", {}).get("page_id") == page_id]
+    children = [p for p in all_pages if p.parent_type == "page_id" and p.parent_id == page_id]
     for child in children:
-        ids.extend(await get_all_descendant_page_ids(child['id'], all_pages))
+        ids.extend(await get_all_descendant_page_ids(child.id, all_pages))
     return ids
 
 async def get_synced_block_original_and_top_parent(notion, block):
@@ -33,7 +85,7 @@ async def get_synced_block_original_and_top_parent(notion, block):
         synced_from = current_block['synced_block'].get('synced_from')
         if synced_from and 'block_id' in synced_from:
             try:
-                original_block = await notion.blocks.retrieve(synced_from['block_id'])
+                original_block = await traced_api_call("notion.blocks.retrieve", notion.blocks.retrieve(synced_from['block_id']))
                 return await get_synced_block_original_and_top_parent(notion, original_block)
             except Exception as e:
                 print(f"[get_synced_block] 원본 블록 접근 실패: {e}")
@@ -44,7 +96,7 @@ async def get_synced_block_original_and_top_parent(notion, block):
     while parent_type == 'block_id':
         next_id = parent.get('block_id')
         try:
-            parent_block = await notion.blocks.retrieve(next_id)
+            parent_block = await traced_api_call("notion.blocks.retrieve", notion.blocks.retrieve(next_id))
             parent = parent_block.get('parent', {})
             parent_type = parent.get('type')
             block_id_to_find_parent = parent_block['id']
@@ -60,32 +112,36 @@ async def get_synced_block_original_and_top_parent(notion, block):
         return current_block, None, None
 
 async def fetch_all_child_blocks(notion, block_id):
+    """블록 트리를 가져와 블록 모델(block_model.Block) 튜플로 반환합니다. 가져오지 못하면 빈 튜플."""
+    with span("fetch_all_child_blocks", block_id=block_id) as span_args:
+        blocks = await _fetch_all_child_blocks(notion, block_id) or ()
+        span_args["blocks"] = len(blocks)
+        return blocks
+
+async def _fetch_all_child_blocks(notion, block_id):
+    # 블록 JSON은 한 단계씩 가져오는 즉시 Block으로 줄여, 트리 전체의 원본 JSON을 한꺼번에 들고 있지 않음
+    # 가져오지 못하면 None (상위 블록은 '하위 블록을 아직 가져오지 않음'으로 남아 렌더링 때 다시 시도함)
     blocks = []
     try:
-        response = await notion.blocks.children.list(block_id=block_id, page_size=100)
+        response = await traced_api_call("notion.blocks.children.list", notion.blocks.children.list(block_id=block_id, page_size=100))
         blocks.extend(response['results'])
         next_cursor = response.get('next_cursor')
         while next_cursor:
-            response = await notion.blocks.children.list(block_id=block_id, page_size=100, start_cursor=next_cursor)
+            response = await traced_api_call("notion.blocks.children.list", notion.blocks.children.list(block_id=block_id, page_size=100, start_cursor=next_cursor))
             blocks.extend(response['results'])
             next_cursor = response.get('next_cursor')
     except Exception as e:
         print(f"블록 가져오기 오류: {e}")
-        return []
+        return None
     processed_blocks = []
     for block in blocks:
         if block.get('type') == 'synced_block':
-            orig_block, _, _ = await get_synced_block_original_and_top_parent(notion, block)
-            if orig_block:
-                if orig_block.get('has_children'):
-                    orig_block['children'] = await fetch_all_child_blocks(notion, orig_block['id'])
-                processed_blocks.append(orig_block)
-        elif block.get('has_children'):
-            block['children'] = await fetch_all_child_blocks(notion, block['id'])
-            processed_blocks.append(block)
-        else:
-            processed_blocks.append(block)
-    return processed_blocks
+            block, _, _ = await get_synced_block_original_and_top_parent(notion, block)
+            if not block:
+                continue
+        children = await _fetch_all_child_blocks(notion, block['id']) if block.get('has_children') else None
+        processed_blocks.append(Block.from_notion(block, children))
+    return tuple(processed_blocks)
 
 async def get_first_child_page_ids(page_id, notion_client):
     # Notion blocks.children.list로 실제 children 순서대로 추출
@@ -110,5 +166,95 @@ async def get_first_child_page_ids(page_id, notion_client):
             break 
         if block['type'] == 'child_page':
             child_page_ids.append(block['id'])
+        elif block['type'] == 'child_database':
+            # 데이터베이스의 행도 하위 페이지로 취급 (child_database 블록 ID가 데이터베이스 ID)
+            from notion_database import get_database_page_ids
+            try:
+                child_page_ids.extend(await get_database_page_ids(notion_client, block['id']))
+            except Exception as e:
+                print(f"데이터베이스 행 가져오기 오류 ({block['id']}): {e}")
             
-    return child_page_ids 
\ No newline at end of file
+    return child_page_ids 
+
+async def retrieve_pages_in_order(notion_client, page_ids, known_pages=None, on_progress=None,
+                                  concurrency=CHILD_FETCH_CONCURRENCY, limiter=None):
+    """page_ids의 메타데이터를 공유 레이트 리미터 아래에서 동시에 조회해 원래 순서대로 PageMeta 목록을 반환합니다.
+    - known_pages: {페이지 ID: PageMeta}. 검색 결과 등으로 이미 아는 페이지는 다시 조회하지 않습니다.
+    - on_progress(pages): 앞에서부터 순서가 확정된 페이지가 늘어날 때마다 그때까지의 목록으로 호출됩니다.
+    - 조회에 실패한 페이지는 건너뜁니다.
+    """
+    known_pages = known_pages or {}
+    results = [known_pages.get(page_id) for page_id in page_ids]
+    done = [page is not None for page in results]
+    prefix = 0
+
+    def report():
+        nonlocal prefix
+        start = prefix
+        while prefix < len(done) and done[prefix]:
+            prefix += 1
+        if on_progress and prefix > start:
+            on_progress([page for page in results[:prefix] if page is not None])
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(index, page_id):
+        async with semaphore:
+            try:
+                results[index] = await get_page_cache().retrieve(
+                    notion_client, page_id, lambda make_call: rate_limited_call(make_call, limiter))
+            except Exception as e:
+                print(f"하위 페이지 정보 가져오기 오류 ({page_id}): {e}")
+        done[index] = True
+        report()
+
+    with span("retrieve_pages_in_order", pages=len(page_ids), known=sum(done)):
+        # 이미 아는 앞부분은 바로 보고
+        report()
+        if on_progress and not page_ids:
+            on_progress([])
+        await asyncio.gather(*(fetch(i, page_id) for i, page_id in enumerate(page_ids) if not done[i]))
+    return [page for page in results if page is not None]
+
+async def retrieve_children_of(notion_client, parent_ids, known_pages=None, concurrency=CHILD_FETCH_CONCURRENCY):
+    """여러 부모의 자식 페이지 목록을 한 번에 조회해 {부모 ID: [자식 페이지]}를 반환합니다.
+    자식 메타데이터는 부모를 가리지 않고 retrieve_pages_in_order 한 번(같은 동시 실행 제한)으로 조회합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def list_children(parent_id):
+        async with semaphore:
+            return await get_first_child_page_ids(parent_id, notion_client)
+
+    parent_ids = list(dict.fromkeys(parent_ids))
+    child_ids = await asyncio.gather(*(list_children(parent_id) for parent_id in parent_ids))
+    all_ids = list(dict.fromkeys(cid for ids in child_ids for cid in ids))
+    pages = await retrieve_pages_in_order(notion_client, all_ids, known_pages, concurrency=concurrency)
+    by_id = {page.id: page for page in pages}
+    return {parent_id: [by_id[cid] for cid in ids if cid in by_id]
+            for parent_id, ids in zip(parent_ids, child_ids)}
+
+async def build_page_tree(notion_client, root_pages, progress_callback=None):
+    """루트 페이지부터 하위 페이지를 순서대로 탐색해 {부모 ID: [자식 페이지]}를 만듭니다."""
+    parent_to_children = {}
+    visited = set()
+
+    async def crawl(page_id):
+        if page_id in visited:
+            return
+        visited.add(page_id)
+        # 진행 보고
+        if progress_callback:
+            progress_callback(len(visited))
+        ids = await get_first_child_page_ids(page_id, notion_client)
+        children_pages = []
+        for cid in ids:
+            children_pages.append(await get_page_cache().retrieve(notion_client, cid))
+        parent_to_children[page_id] = children_pages
+        for child in children_pages:
+            await crawl(child.id)
+
+    with span("build_page_tree", roots=len(root_pages)):
+        for page in root_pages:
+            await crawl(page.id)
+    return parent_to_children
@@ -0,0 +1,198 @@
+"""Notion 데이터베이스(행 목록과 인라인 표) 지원.
+
+- 행은 페이지이므로 PageMeta로 줄여 페이지 캐시에 넣고, 표에 필요한 속성 값만 셀(rich_text 목록)로 바꿔 보관합니다.
+- 조회 결과는 데이터베이스의 last_edited_time을 기준으로 디스크에 캐시합니다 (블록 캐시와 같은 형식).
+- notion-client 3.x(API 2025-09-03)는 databases.retrieve의 data_sources를 data_sources.query로 조회하고,
+  그 이전 버전은 databases.query로 조회합니다.
+"""
+import asyncio
+import threading
+from config import DATABASE_CACHE_DIR, CHILD_FETCH_CONCURRENCY
+from block_cache import BlockCache, fetch_page_blocks_cached
+from block_model import BLOCK_MODEL_VERSION, Span, spans_from_notion, spans_to_json, spans_from_json
+from page_cache import get_page_cache
+from rate_limit import ThrottledNotionClient, rate_limited_call
+from tracing import span, count, traced_api_call
+from utils import PageMeta
+
+async def _call(notion, name, make_call, limiter=None):
+    # 이미 레이트 리미터를 거치는 클라이언트면 토큰을 두 번 쓰지 않음
+    if isinstance(notion, ThrottledNotionClient):
+        return await traced_api_call(name, make_call())
+    return await traced_api_call(name, rate_limited_call(make_call, limiter))
+
+async def retrieve_database(notion, database_id, limiter=None):
+    """데이터베이스 객체(제목, 부모, last_edited_time, data_sources 등)를 가져옵니다."""
+    return await _call(notion, "notion.databases.retrieve",
+                       lambda: notion.databases.retrieve(database_id=database_id), limiter)
+
+async def query_database_rows(notion, database, limiter=None):
+    """데이터베이스의 모든 행(페이지 JSON)을 보기 순서대로 가져옵니다. 100개씩 페이지를 넘기며 조회합니다."""
+    data_sources = database.get("data_sources")
+    if data_sources is not None:
+        queries = [("data_sources.query", lambda cursor, ds=ds["id"]: notion.data_sources.query(
+            data_source_id=ds, page_size=100, start_cursor=cursor)) for ds in data_sources]
+    else:
+        queries = [("databases.query", lambda cursor: notion.databases.query(
+            database_id=database["id"], page_size=100, start_cursor=cursor))]
+    rows = []
+    for name, query in queries:
+        cursor = None
+        while True:
+            response = await _call(notion, f"notion.{name}", lambda: query(cursor), limiter)
+            rows.extend(row for row in response.get("results", []) if row.get("object", "page") == "page")
+            cursor = response.get("next_cursor")
+            if not cursor:
+                break
+    return rows
+
+def _property_plain_text(kind, value):
+    if value is None:
+        return ""
+    if kind in ("select", "status"):
+        return value.get("name", "")
+    if kind == "multi_select":
+        return ", ".join(option.get("name", "") for option in value)
+    if kind == "date":
+        start, end = value.get("start") or "", value.get("end")
+        return f"{start} → {end}" if end else start
+    if kind == "checkbox":
+        return "✔" if value else ""
+    if kind == "number":
+        return f"{value:g}" if isinstance(value, float) else str(value)
+    if kind in ("people", "created_by", "last_edited_by"):
+        people = value if isinstance(value, list) else [value]
+        return ", ".join(person.get("name") or "" for person in people)
+    if kind == "files":
+        return ", ".join(f.get("name", "") for f in value)
+    if kind == "relation":
+        return f"{len(value)}개" if value else ""
+    if kind == "unique_id":
+        prefix = value.get("prefix")
+        return f"{prefix}-{value.get('number')}" if prefix else str(value.get("number", ""))
+    if kind in ("formula", "rollup"):
+        inner = value.get("type")
+        if inner == "array":
+            return ", ".join(_property_plain_text(item.get("type"), item.get(item.get("type"))) for item in value["array"])
+        return _property_plain_text(inner, value.get(inner))
+    if kind in ("title", "rich_text"):
+        return "".join(chunk.get("plain_text", "") for chunk in value)
+    return str(value) if isinstance(value, (str, int, float)) else ""
+
+def property_to_spans(prop):
+    """행 속성 하나를 표 셀(Span 튜플)로 바꿉니다."""
+    kind = prop.get("type")
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return spans_from_notion(value)
+    text = _property_plain_text(kind, value)
+    if not text:
+        return ()
+    return (Span(text, value if kind == "url" else None),)
+
+def rows_to_table(database, rows):
+    """데이터베이스와 행 JSON을 캐시에 저장할 작은 표로 줄입니다.
+    {"title", "columns": [속성 이름], "rows": [{"page": PageMeta.to_dict(), "cells": [Span 튜플]}]}
+    제목 속성을 첫 열로 두고, 나머지는 API가 돌려준 순서를 따릅니다.
+    """
+    columns = []
+    for row in rows:
+        for name, prop in row.get("properties", {}).items():
+            if name not in columns:
+                if prop.get("type") == "title":
+                    columns.insert(0, name)
+                else:
+                    columns.append(name)
+    return {
+        "title": "".join(chunk.get("plain_text", "") for chunk in database.get("title") or []),
+        "columns": columns,
+        "rows": [{
+            "page": PageMeta.from_page(row).to_dict(),
+            "cells": [property_to_spans(row.get("properties", {}).get(name) or {}) for name in columns],
+        } for row in rows],
+    }
+
+def _table_to_json(table):
+    rows = [{"page": row["page"], "cells": [spans_to_json(cell) for cell in row["cells"]]} for row in table["rows"]]
+    return {**table, "rows": rows}
+
+def _table_from_json(data):
+    rows = [{"page": row["page"], "cells": [spans_from_json(cell) for cell in row["cells"]]} for row in data["rows"]]
+    return {**data, "rows": rows}
+
+def create_database_cache(cache_dir=DATABASE_CACHE_DIR):
+    """데이터베이스 표를 저장하는 BlockCache (셀의 Span은 블록 캐시와 같은 형식으로 저장, 파일 URL은 보관하지 않음)."""
+    return BlockCache(cache_dir, _table_to_json, _table_from_json, BLOCK_MODEL_VERSION, expiry=None)
+
+_database_cache = None
+_database_cache_lock = threading.Lock()
+
+def get_database_cache() -> BlockCache:
+    """데이터베이스 표 캐시 (블록 캐시와 같은 방식으로 데이터베이스 ID와 last_edited_time을 키로 씀)."""
+    global _database_cache
+    with _database_cache_lock:
+        if _database_cache is None:
+            _database_cache = create_database_cache()
+        return _database_cache
+
+def set_database_cache(cache):
+    global _database_cache
+    with _database_cache_lock:
+        _database_cache = cache
+
+async def get_database_table(notion, database_id, limiter=None):
+    """데이터베이스 표를 반환합니다. 데이터베이스의 last_edited_time이 같으면 캐시를 쓰고, 아니면 행을 다시 조회합니다.
+    행을 새로 조회했을 때만 행 페이지를 페이지 캐시에 넣어, 이어지는 pages.retrieve가 네트워크에 가지 않습니다."""
+    with span("database.table", database_id=database_id) as span_args:
+        database = await retrieve_database(notion, database_id, limiter)
+        cache = get_database_cache()
+        table = cache.get(database_id, database.get("last_edited_time"))
+        span_args["cached"] = table is not None
+        if table is None:
+            count("database_cache.misses")
+            table = rows_to_table(database, await query_database_rows(notion, database, limiter))
+            cache.put(database_id, table, database.get("last_edited_time"))
+            # 방금 조회한 행만 페이지 캐시에 넣음. 행 본문을 고쳐도 데이터베이스의 last_edited_time은 그대로라
+            # 캐시된 표의 행 정보는 오래되었을 수 있으므로, 그때는 각 행을 pages.retrieve로 다시 확인하게 둠
+            get_page_cache().seed([PageMeta.from_dict(row["page"]) for row in table["rows"]])
+        else:
+            count("database_cache.hits")
+        span_args["rows"] = len(table["rows"])
+    return table
+
+async def get_database_page_ids(notion, database_id, limiter=None):
+    """데이터베이스 행 페이지 ID 목록 (보기 순서)."""
+    table = await get_database_table(notion, database_id, limiter)
+    return [row["page"]["id"] for row in table["rows"]]
+
+async def fetch_pages_blocks(notion, pages, concurrency=CHILD_FETCH_CONCURRENCY, limiter=None, low_priority=False):
+    """여러 페이지(PageMeta)의 본문 블록을 공유 레이트 리미터 아래에서 동시에 가져와 블록 캐시에 채웁니다.
+    데이터베이스 행처럼 한 번에 여러 페이지의 본문이 필요할 때 씁니다. 실패한 페이지는 건너뜁니다."""
+    if not isinstance(notion, ThrottledNotionClient):
+        notion = ThrottledNotionClient(notion, limiter, low_priority)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page):
+        async with semaphore:
+            try:
+                await fetch_page_blocks_cached(notion, page.id, page.last_edited_time)
+            except Exception as e:
+                print(f"행 본문 가져오기 오류 ({page.id}): {e}")
+
+    with span("database.fetch_bodies", pages=len(pages)):
+        await asyncio.gather(*(fetch(page) for page in pages))
+
+async def find_top_level_databases(notion, database_ids, limiter=None):
+    """database_ids 중 워크스페이스 바로 아래 있는(어느 페이지에도 들어 있지 않은) 데이터베이스 ID 집합.
+    조회에 실패한 데이터베이스도 포함합니다 (행이 어디에도 보이지 않게 되는 것보다 루트에 보이는 편이 나음)."""
+    async def check(database_id):
+        try:
+            database = await retrieve_database(notion, database_id, limiter)
+        except Exception as e:
+            print(f"데이터베이스 정보 가져오기 오류 ({database_id}): {e}")
+            return database_id
+        parent = database.get("parent") or {}
+        return database_id if parent.get("type") == "workspace" else None
+
+    results = await asyncio.gather(*(check(database_id) for database_id in database_ids))
+    return {database_id for database_id in results if database_id}
@@ -0,0 +1,55 @@
+"""Notion 클라이언트의 HTTP 전송 설정.
+
+- 크기를 정한 keep-alive 연결 풀을 씁니다 (NOTION_HTTP_MAX_CONNECTIONS / NOTION_HTTP_MAX_KEEPALIVE).
+- NOTION_HTTP2가 켜져 있고 h2 패키지가 있으면 HTTP/2로 한 연결에서 여러 요청을 동시에 보냅니다 (pip install "httpx[http2]").
+- orjson이 있으면 응답 JSON을 orjson으로 디코딩합니다 (pip install orjson).
+- 응답 본문의 바이트 수를 현재 트레이서의 notion.response_bytes에 집계합니다 (트레이서가 없으면 집계하지 않음).
+httpx와 notion_client는 가져오는 데 시간이 걸리므로 클라이언트를 만들 때 가져옵니다.
+"""
+import json
+import importlib.util
+from config import (NOTION_HTTP_MAX_CONNECTIONS, NOTION_HTTP_MAX_KEEPALIVE, NOTION_HTTP_KEEPALIVE_EXPIRY_SEC,
+                    NOTION_HTTP2, NOTION_FAST_JSON)
+from tracing import count
+
+def has_http2():
+    return importlib.util.find_spec("h2") is not None
+
+def json_decoder(fast=NOTION_FAST_JSON):
+    """응답 디코딩에 쓸 함수 (bytes -> 객체). fast이고 orjson이 있으면 orjson.loads."""
+    if fast and importlib.util.find_spec("orjson") is not None:
+        import orjson
+        return orjson.loads
+    return json.loads
+
+def create_http_client(max_connections=NOTION_HTTP_MAX_CONNECTIONS, max_keepalive=NOTION_HTTP_MAX_KEEPALIVE,
+                       keepalive_expiry=NOTION_HTTP_KEEPALIVE_EXPIRY_SEC, http2=NOTION_HTTP2):
+    """연결 풀 크기와 HTTP/2 사용 여부를 정한 httpx.AsyncClient를 만듭니다."""
+    import httpx
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                          keepalive_expiry=keepalive_expiry)
+    return httpx.AsyncClient(limits=limits, http2=http2 and has_http2())
+
+_client_classes = {}
+
+def _client_class(loads):
+    """응답 크기를 집계하고 응답을 loads로 디코딩하는 AsyncClient 하위 클래스 (디코더별로 한 번만 만듦)."""
+    if loads not in _client_classes:
+        from notion_client import AsyncClient
+
+        class TransportAsyncClient(AsyncClient):
+            def _parse_response(self, response):
+                count("notion.response_bytes", len(response.content))
+                if response.is_success:
+                    return loads(response.content)
+                # 오류 응답은 notion_client의 예외 변환을 그대로 사용
+                return super()._parse_response(response)
+
+        _client_classes[loads] = TransportAsyncClient
+    return _client_classes[loads]
+
+def create_client(auth, http_client=None, fast_json=NOTION_FAST_JSON, **options):
+    """전송 설정을 적용한 notion_client.AsyncClient를 만듭니다.
+    options는 notion_client의 ClientOptions(base_url, timeout_ms 등)로 전달됩니다."""
+    client_class = _client_class(json_decoder(fast_json))
+    return client_class(auth=auth, client=http_client or create_http_client(), **options)
@@ -0,0 +1,43 @@
+"""선택 패키지(requirements-optional.txt)와, 없을 때 대신 쓰는 방식.
+
+선택 패키지가 없어도 내보내기는 되지만 일부 기능이 약해지므로, 내보내기 요약과 버튼 설명에 어떤 대체 방식이
+쓰이고 있는지 표시합니다. 모듈을 실제로 가져오지 않고 find_spec으로 설치 여부만 확인합니다 (앱 시작 시간 유지).
+"""
+import importlib.util
+from config import NOTION_FAST_JSON, NOTION_HTTP2
+
+# (모듈 이름, pip 패키지 이름, 없을 때 대체 방식)
+OPTIONAL_PACKAGES = (
+    ("PIL", "Pillow", "용량 최적화에서 이미지를 축소하지 않고 Flate 이미지만 다시 압축"),
+    ("pikepdf", "pikepdf", "용량 최적화에서 선형화(웹 보기용)와 객체 스트림 압축 생략"),
+    ("psutil", "psutil", "시스템 메모리 확인 없이 부하(os.getloadavg)로만 렌더링 수 조절, 리눅스 밖에서는 메모리 측정 제한"),
+    ("orjson", "orjson", "Notion 응답을 표준 json으로 디코딩 (느림)"),
+    ("h2", "httpx[http2]", "HTTP/2 대신 HTTP/1.1 연결 풀 사용"),
+)
+
+def _is_used(module):
+    # 설정에서 끈 기능의 패키지는 없어도 대체 방식이 아님
+    if module == "orjson":
+        return NOTION_FAST_JSON
+    if module == "h2":
+        return NOTION_HTTP2
+    return True
+
+def missing_optional_packages(modules=None):
+    """설치되지 않은 선택 패키지의 [(pip 패키지 이름, 대체 방식)]. modules를 넘기면 그 모듈만 확인합니다."""
+    missing = []
+    for module, package, fallback in OPTIONAL_PACKAGES:
+        if modules is not None and module not in modules:
+            continue
+        if _is_used(module) and importlib.util.find_spec(module) is None:
+            missing.append((package, fallback))
+    return missing
+
+def format_fallbacks(modules=None):
+    """대체 방식이 쓰이고 있으면 안내 문구를, 아니면 빈 문자열을 반환합니다."""
+    missing = missing_optional_packages(modules)
+    if not missing:
+        return ""
+    lines = ["선택 패키지가 없어 대체 방식을 사용 중 (pip install -r requirements-optional.txt):"]
+    lines += [f"  - {package} 없음: {fallback}" for package, fallback in missing]
+    return "\n".join(lines)
@@ -0,0 +1,29 @@
+import os
+
+class OutputVariant:
+    """한 번 가져온 페이지로 만들 출력물 하나 (용지 크기, 스타일시트, 여백).
+    - paper_format: Playwright page.pdf의 format 값 ("A4", "Letter" 등)
+    - stylesheet: CSS 파일 경로 (None이면 기본 portfolio_style.css)
+    - margins: {"top", "right", "bottom", "left"} CSS 길이 (None이면 CSS의 @page 설정을 따름)
+    """
+    __slots__ = ("output_path", "paper_format", "stylesheet", "margins")
+
+    def __init__(self, output_path, paper_format="A4", stylesheet=None, margins=None):
+        self.output_path = output_path
+        self.paper_format = paper_format
+        self.stylesheet = stylesheet
+        self.margins = dict(margins) if margins else None
+
+    @property
+    def name(self):
+        return os.path.splitext(os.path.basename(self.output_path))[0]
+
+    def pdf_options(self):
+        """page.pdf에 넘길 옵션 (path 제외)."""
+        options = {"format": self.paper_format, "print_background": True}
+        if self.margins:
+            options["margin"] = self.margins
+        return options
+
+    def __repr__(self):
+        return f"OutputVariant({self.output_path!r}, {self.paper_format!r}, stylesheet={self.stylesheet!r})"
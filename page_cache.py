@@ -0,0 +1,122 @@
+import time
+import asyncio
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from config import PAGE_CACHE_TTL_SEC, PAGE_CACHE_MAX_ENTRIES
+from tracing import count, traced_api_call
+from utils import PageMeta
+
+class _FetchAbandoned(Exception):
+    """요청을 맡은 쪽이 취소되어 결과를 기다리던 쪽이 직접 다시 요청해야 함."""
+
+class PageCache:
+    """pages.retrieve 결과(PageMeta)를 프로세스 전체에서 공유하는 짧은 TTL 캐시.
+    - 같은 페이지를 동시에 요청하면 스레드/이벤트 루프가 달라도 요청 하나의 결과를 함께 기다립니다.
+    - search 결과에 전체 페이지 객체가 들어 있으므로 seed()로 미리 채워 두면 대부분의 조회가 네트워크에 가지 않습니다.
+    - TTL이 지나면 다시 조회합니다 (수정 시각이 블록 캐시의 유효성 기준이므로 오래 보관하지 않음).
+    """
+
+    def __init__(self, ttl=PAGE_CACHE_TTL_SEC, max_entries=PAGE_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, page_id):
+        """TTL 안에 저장된 PageMeta를 반환합니다. 없거나 만료되면 None."""
+        with self._lock:
+            entry = self._entries.get(page_id)
+            if entry is None:
+                return None
+            stored_at, page = entry
+            if self.clock() - stored_at > self.ttl:
+                del self._entries[page_id]
+                return None
+            return page
+
+    def put(self, page):
+        page = PageMeta.from_page(page)
+        with self._lock:
+            self._entries.pop(page.id, None)
+            self._entries[page.id] = (self.clock(), page)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return page
+
+    def seed(self, pages):
+        """검색 결과(페이지 JSON 또는 PageMeta)로 캐시를 채웁니다."""
+        for page in pages:
+            self.put(page)
+        count("page_cache.seeded", len(pages))
+
+    def invalidate(self, page_id):
+        with self._lock:
+            self._entries.pop(page_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def retrieve(self, notion, page_id, wrap=None):
+        """캐시에 있으면 바로, 누가 이미 요청 중이면 그 결과를, 아니면 pages.retrieve로 가져와 PageMeta로 반환합니다.
+        wrap(make_call)을 넘기면 실제 호출을 감쌉니다 (예: rate_limit.rate_limited_call)."""
+        while True:
+            page = self.get(page_id)
+            if page is not None:
+                count("page_cache.hits")
+                return page
+            with self._lock:
+                future = self._inflight.get(page_id)
+                owner = future is None
+                if owner:
+                    future = concurrent.futures.Future()
+                    # 기다리는 쪽의 취소가 공유 요청을 취소하지 않도록 실행 중으로 표시
+                    future.set_running_or_notify_cancel()
+                    self._inflight[page_id] = future
+            if not owner:
+                count("page_cache.shared")
+                try:
+                    return await asyncio.shield(asyncio.wrap_future(future))
+                except _FetchAbandoned:
+                    continue
+            count("page_cache.misses")
+            make_call = lambda: traced_api_call("notion.pages.retrieve", notion.pages.retrieve(page_id=page_id))
+            try:
+                page = self.put(await (wrap(make_call) if wrap else make_call()))
+            except Exception as e:
+                self._finish(page_id, future, error=e)
+                raise
+            except BaseException:
+                self._finish(page_id, future, error=_FetchAbandoned())
+                raise
+            self._finish(page_id, future, page=page)
+            return page
+
+    def _finish(self, page_id, future, page=None, error=None):
+        with self._lock:
+            if self._inflight.get(page_id) is future:
+                del self._inflight[page_id]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(page)
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache() -> PageCache:
+    """프로세스 전역 페이지 메타데이터 캐시를 반환합니다."""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
+
+def set_page_cache(cache):
+    """전역 페이지 캐시를 교체합니다 (벤치마크에서 반복마다 비우는 경우 등)."""
+    global _page_cache
+    with _page_cache_lock:
+        _page_cache = cache
@@ -0,0 +1,491 @@
+from array import array
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QFont
+from search_index import PageSearchIndex
+
+ROOT = -1
+FLAG_HIDDEN = 0x1            # 숨김 마커(✅)가 있는 페이지
+FLAG_HAS_CHILDREN = 0x2      # 자식이 있을 수 있음 (펼칠 때 네트워크로 불러옴)
+FLAG_CHILDREN_LOADED = 0x4   # 자식 목록을 이미 알고 있음
+
+class PageIndex:
+    """트리 표시에 필요한 최소 정보(ID, 제목, 부모, 플래그)만 병렬 배열로 보관합니다.
+    노드 번호(int)로 접근하며, 페이지 dict는 보관하지 않습니다.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.ids = []
+        self.titles = []
+        self.parents = array('i')
+        self.rows = array('i')       # 부모의 자식 목록 안에서의 위치
+        self.flags = bytearray()
+        self.children = {ROOT: []}   # 노드 -> 자식 노드 목록
+        self.node_of = {}
+
+    def __len__(self):
+        return len(self.node_of)
+
+    def add(self, page_id, title, flags=0):
+        """페이지를 추가하거나(이미 있으면) 제목/플래그를 갱신하고 노드 번호를 반환합니다."""
+        node = self.node_of.get(page_id)
+        if node is None:
+            node = len(self.ids)
+            self.ids.append(page_id)
+            self.titles.append(title)
+            self.parents.append(ROOT)
+            self.rows.append(0)
+            self.flags.append(flags)
+            self.node_of[page_id] = node
+        else:
+            self.titles[node] = title
+            keep = self.flags[node] & (FLAG_HAS_CHILDREN | FLAG_CHILDREN_LOADED)
+            self.flags[node] = flags | keep
+        return node
+
+    def add_page(self, page, flags=0):
+        # page는 PageMeta: 제목과 숨김 여부는 수집 시점에 이미 계산됨
+        if page.hidden:
+            flags |= FLAG_HIDDEN
+        return self.add(page.id, page.tree_title, flags)
+
+    def set_children(self, parent, child_nodes):
+        old = self.children.get(parent, [])
+        keep = set(child_nodes)
+        for node in old:
+            # 다른 부모로 옮겨 간 노드는 새 부모 쪽에서 관리하므로 떼어내지 않음
+            if node not in keep and self.parents[node] == parent:
+                self.detach(node)
+        for node in child_nodes:
+            previous = self.parents[node]
+            if previous != ROOT and previous != parent:
+                self.unlink(node)
+        self.children[parent] = list(child_nodes)
+        for row, node in enumerate(child_nodes):
+            self.parents[node] = parent
+            self.rows[node] = row
+        if parent != ROOT:
+            self.flags[parent] |= FLAG_CHILDREN_LOADED
+            if not child_nodes:
+                self.flags[parent] &= ~FLAG_HAS_CHILDREN & 0xFF
+
+    def detach(self, node):
+        """노드와 그 하위 트리를 인덱스에서 제거합니다 (배열 자리는 재사용하지 않음)."""
+        for child in self.children.pop(node, []):
+            if self.parents[child] == node:
+                self.detach(child)
+        if self.node_of.get(self.ids[node]) == node:
+            del self.node_of[self.ids[node]]
+        self.parents[node] = ROOT
+        self.titles[node] = ""
+
+    def unlink(self, node):
+        """노드를 현재 부모의 자식 목록에서만 빼고 뒤 형제의 행 번호를 당깁니다 (하위 트리는 유지)."""
+        kids = self.children.get(self.parents[node], [])
+        if node not in kids:
+            return None
+        row = kids.index(node)
+        del kids[row]
+        for later in kids[row:]:
+            self.rows[later] -= 1
+        return row
+
+    def remove_child(self, parent, node):
+        kids = self.children.get(parent, [])
+        row = kids.index(node)
+        del kids[row]
+        for later in kids[row:]:
+            self.rows[later] -= 1
+        self.detach(node)
+        return row
+
+class PageTreeModel(QAbstractItemModel):
+    """PageIndex 위에서 동작하는 가상화 트리 모델.
+    - 행은 부모가 펼쳐질 때 FETCH_BATCH개씩 노출됩니다 (canFetchMore/fetchMore).
+    - 자식 목록을 모르는 노드(FLAG_HAS_CHILDREN)는 펼칠 때 children_requested를 보냅니다.
+    - apply_search로 검색 결과와 그 조상만 보이도록 거를 수 있습니다 (검색 중에는 지연 로드 없음).
+    """
+    children_requested = Signal(str)
+    FETCH_BATCH = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pages = PageIndex()
+        self._fetched = {ROOT: 0}
+        self._requested = set()
+        # 구조 변경 신호 처리 중에는 행을 새로 노출하지 않음 (리스너의 재진입 방지)
+        self._changing = False
+        self.search_index = PageSearchIndex()
+        self._search = None      # (query, include_hidden)
+        self._filter = None      # 노드 -> 보이는 자식 노드 목록
+        self._filter_rows = {}
+        self._matches = set()
+
+    # --- QAbstractItemModel ---
+    def _node(self, index):
+        return index.internalId() if index.isValid() else ROOT
+
+    def _kids(self, node):
+        if self._filter is not None:
+            return self._filter.get(node, [])
+        return self.pages.children.get(node, [])
+
+    def _row(self, node):
+        if self._filter is not None:
+            return self._filter_rows[node]
+        return self.pages.rows[node]
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        parent_node = self._node(parent)
+        if row >= self._fetched.get(parent_node, 0):
+            return QModelIndex()
+        return self.createIndex(row, 0, self._kids(parent_node)[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = self.pages.parents[index.internalId()]
+        if parent_node == ROOT:
+            return QModelIndex()
+        return self.createIndex(self._row(parent_node), 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self._fetched.get(self._node(parent), 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        if self._kids(node):
+            return True
+        return node != ROOT and self._needs_load(node)
+
+    def canFetchMore(self, parent):
+        if self._changing:
+            return False
+        node = self._node(parent)
+        if self._fetched.get(node, 0) < len(self._kids(node)):
+            return True
+        return node != ROOT and self._needs_load(node) and node not in self._requested
+
+    def fetchMore(self, parent):
+        if self._changing:
+            return
+        node = self._node(parent)
+        kids = self._kids(node)
+        fetched = self._fetched.get(node, 0)
+        if fetched < len(kids):
+            count = min(self.FETCH_BATCH, len(kids) - fetched)
+            self._changing = True
+            self.beginInsertRows(parent, fetched, fetched + count - 1)
+            self._fetched[node] = fetched + count
+            self.endInsertRows()
+            self._changing = False
+        elif node != ROOT and self._needs_load(node) and node not in self._requested:
+            self._requested.add(node)
+            self.children_requested.emit(self.pages.ids[node])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalId()
+        if role == Qt.DisplayRole:
+            return self.pages.titles[node]
+        if role == Qt.UserRole:
+            return self.pages.ids[node]
+        if role == Qt.FontRole and node in self._matches:
+            font = QFont()
+            font.setBold(True)
+            return font
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    # --- 조회 ---
+    def _needs_load(self, node):
+        if self._filter is not None:
+            return False
+        flags = self.pages.flags[node]
+        return bool(flags & FLAG_HAS_CHILDREN) and not flags & FLAG_CHILDREN_LOADED
+
+    def _is_exposed(self, node):
+        while node != ROOT:
+            parent = self.pages.parents[node]
+            if self._filter is not None and node not in self._filter_rows:
+                return False
+            if self._row(node) >= self._fetched.get(parent, 0):
+                return False
+            node = parent
+        return True
+
+    def _index_of(self, node):
+        if node == ROOT or not self._is_exposed(node):
+            return QModelIndex()
+        return self.createIndex(self._row(node), 0, node)
+
+    def contains(self, page_id):
+        return page_id in self.pages.node_of
+
+    def page_id(self, index):
+        return self.pages.ids[index.internalId()] if index.isValid() else None
+
+    def title(self, index):
+        return self.pages.titles[index.internalId()] if index.isValid() else ""
+
+    def index_for_id(self, page_id):
+        node = self.pages.node_of.get(page_id)
+        return QModelIndex() if node is None else self._index_of(node)
+
+    def root_ids(self):
+        return [self.pages.ids[node] for node in self.pages.children[ROOT]]
+
+    # --- 변경 ---
+    def _add_page(self, page, flags=0):
+        # 트리 인덱스와 검색 인덱스를 함께 갱신
+        self.search_index.add_page(page)
+        return self.pages.add_page(page, flags)
+
+    def _filtered_change(self, change):
+        """검색 필터가 걸린 상태의 구조 변경은 변경 후 필터를 다시 계산해 리셋으로 반영합니다."""
+        self._changing = True
+        self.beginResetModel()
+        change()
+        self._compute_filter()
+        self.endResetModel()
+        self._changing = False
+
+    def reset_roots(self, root_pages, flags=0):
+        self._changing = True
+        self.beginResetModel()
+        self.pages.clear()
+        self.search_index.clear()
+        self._fetched = {}
+        self._requested.clear()
+        self.pages.set_children(ROOT, [self._add_page(page, flags) for page in root_pages])
+        self._fetched[ROOT] = min(self.FETCH_BATCH, len(root_pages))
+        self._compute_filter()
+        self.endResetModel()
+        self._changing = False
+
+    def set_tree(self, parent_to_children):
+        """{부모 ID: [자식 페이지]}로 전체 트리를 한 번에 구성합니다 (루트는 유지)."""
+        self._changing = True
+        self.beginResetModel()
+        roots = self.pages.children[ROOT]
+        self._fetched = {ROOT: min(self.FETCH_BATCH, len(roots))}
+        self._requested.clear()
+        pending = list(roots)
+        seen = set(pending)
+        while pending:
+            node = pending.pop()
+            children_pages = parent_to_children.get(self.pages.ids[node])
+            if children_pages is None:
+                continue
+            child_nodes = []
+            for page in children_pages:
+                child = self._add_page(page)
+                if child in seen:
+                    continue
+                seen.add(child)
+                child_nodes.append(child)
+            self.pages.set_children(node, child_nodes)
+            pending.extend(child_nodes)
+        self.search_index.prepare()
+        self._compute_filter()
+        self.endResetModel()
+        self._changing = False
+
+    def set_children(self, parent_id, children_pages):
+        """한 노드의 자식 목록을 교체합니다. 이미 있던 자식은 하위 트리째 유지됩니다."""
+        node = self.pages.node_of.get(parent_id)
+        if node is None:
+            return
+        self._requested.discard(node)
+        if self._filter is not None:
+            self._filtered_change(lambda: self.pages.set_children(node, [self._add_page(page) for page in children_pages]))
+            return
+        parent_index = self._index_of(node)
+        exposed = node == ROOT or parent_index.isValid()
+        fetched = self._fetched.get(node, 0)
+        old_nodes = list(self.pages.children.get(node, []))
+        child_nodes = [self._add_page(page) for page in children_pages]
+        self._take_moved(node, child_nodes)
+        if old_nodes and child_nodes[:len(old_nodes)] == old_nodes:
+            # 기존 목록 뒤에 이어 붙는 경우 (점진적 로드, 변경 없는 새로고침): 행을 유지하고 끝에만 추가
+            self._append_children(node, parent_index, exposed, fetched, old_nodes, child_nodes)
+            return
+        if exposed and fetched:
+            self._changing = True
+            self.beginRemoveRows(parent_index, 0, fetched - 1)
+            self._fetched[node] = 0
+            self.endRemoveRows()
+            self._changing = False
+        self.pages.set_children(node, child_nodes)
+        self._fetched[node] = 0
+        if exposed and fetched:
+            # 펼쳐져 있던 노드는 바로 다시 노출
+            self.fetchMore(parent_index)
+        elif exposed:
+            self.dataChanged.emit(parent_index, parent_index)
+
+    def _take_moved(self, parent, child_nodes):
+        """다른 부모 밑에 있던 자식을 이전 부모의 목록(노출된 행 포함)에서 먼저 뺍니다."""
+        for child in child_nodes:
+            previous = self.pages.parents[child]
+            if previous == ROOT or previous == parent:
+                continue
+            row = self.pages.rows[child]
+            fetched = self._fetched.get(previous, 0)
+            previous_index = self._index_of(previous)
+            exposed = previous_index.isValid() and row < fetched
+            if exposed:
+                self._changing = True
+                self.beginRemoveRows(previous_index, row, row)
+            if self.pages.unlink(child) is not None and row < fetched:
+                self._fetched[previous] = fetched - 1
+            if exposed:
+                self.endRemoveRows()
+                self._changing = False
+
+    def _append_children(self, node, parent_index, exposed, fetched, old_nodes, child_nodes):
+        if exposed and fetched:
+            # 제목이 바뀌었을 수 있는 기존 행 갱신
+            self.dataChanged.emit(self.index(0, 0, parent_index), self.index(fetched - 1, 0, parent_index))
+        first, last = len(old_nodes), len(child_nodes) - 1
+        if exposed and fetched == len(old_nodes) and last >= first:
+            self._changing = True
+            self.beginInsertRows(parent_index, first, last)
+            self.pages.set_children(node, child_nodes)
+            self._fetched[node] = last + 1
+            self.endInsertRows()
+            self._changing = False
+            return
+        self.pages.set_children(node, child_nodes)
+        if exposed and node != ROOT:
+            self.dataChanged.emit(parent_index, parent_index)
+
+    def set_has_children(self, page_id, has_children):
+        node = self.pages.node_of.get(page_id)
+        if node is None or self.pages.flags[node] & FLAG_CHILDREN_LOADED:
+            return
+        if has_children:
+            self.pages.flags[node] |= FLAG_HAS_CHILDREN
+        else:
+            self.pages.flags[node] &= ~FLAG_HAS_CHILDREN & 0xFF
+        index = self._index_of(node)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def add_root(self, page):
+        roots = self.pages.children[ROOT]
+        node = self._add_page(page)
+        if node in roots:
+            return
+
+        def append():
+            self.pages.parents[node] = ROOT
+            self.pages.rows[node] = len(roots)
+            roots.append(node)
+
+        if self._filter is not None:
+            self._filtered_change(append)
+            return
+        row = len(roots)
+        all_exposed = self._fetched[ROOT] == row
+        if all_exposed:
+            self.beginInsertRows(QModelIndex(), row, row)
+        append()
+        if all_exposed:
+            self._fetched[ROOT] = row + 1
+            self.endInsertRows()
+
+    def update_page(self, page):
+        node = self.pages.node_of.get(page.id)
+        if node is None:
+            return
+        if self._filter is not None:
+            self._filtered_change(lambda: self._add_page(page))
+            return
+        self._add_page(page)
+        index = self._index_of(node)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+    def remove_page(self, page_id):
+        node = self.pages.node_of.get(page_id)
+        if node is None:
+            return
+        parent = self.pages.parents[node]
+        self.search_index.remove(page_id)
+        if self._filter is not None:
+            self._filtered_change(lambda: self.pages.remove_child(parent, node))
+            return
+        row = self.pages.rows[node]
+        parent_index = self._index_of(parent)
+        exposed = (parent == ROOT or parent_index.isValid()) and row < self._fetched.get(parent, 0)
+        if exposed:
+            self.beginRemoveRows(parent_index, row, row)
+        self.pages.remove_child(parent, node)
+        if exposed:
+            self._fetched[parent] -= 1
+            self.endRemoveRows()
+        elif row < self._fetched.get(parent, 0):
+            self._fetched[parent] -= 1
+
+    # --- 검색 필터 ---
+    def apply_search(self, query, include_hidden=True):
+        """검색어와 일치하는 페이지와 그 조상만 보이도록 합니다. 빈 검색어면 필터를 해제합니다.
+        일치하는 페이지 수를 반환합니다.
+        """
+        query = (query or "").strip()
+        self._search = (query, include_hidden) if query or not include_hidden else None
+        self._changing = True
+        self.beginResetModel()
+        if self._search is None:
+            self._filter = None
+            self._filter_rows = {}
+            self._matches = set()
+            # 필터 해제 시 루트만 노출하고 나머지는 다시 펼칠 때 노출
+            self._fetched = {ROOT: min(self.FETCH_BATCH, len(self.pages.children[ROOT]))}
+        else:
+            self._compute_filter()
+        self.endResetModel()
+        self._changing = False
+        return len(self._matches)
+
+    def _compute_filter(self):
+        if self._search is None:
+            return
+        query, include_hidden = self._search
+        node_of = self.pages.node_of
+        if query:
+            matched = [node_of[pid] for pid in self.search_index.search(query, include_hidden) if pid in node_of]
+        else:
+            matched = [node for node in node_of.values() if not self.pages.flags[node] & FLAG_HIDDEN]
+        visible = set()
+        for node in matched:
+            # 조상까지 보이도록 (이미 방문한 조상에서 멈춤)
+            while node != ROOT and node not in visible:
+                visible.add(node)
+                node = self.pages.parents[node]
+        self._matches = set(matched) if query else set()
+        self._filter = {}
+        self._filter_rows = {}
+        for parent in [ROOT] + list(visible):
+            kids = [kid for kid in self.pages.children.get(parent, []) if kid in visible]
+            if kids:
+                self._filter[parent] = kids
+                for row, kid in enumerate(kids):
+                    self._filter_rows[kid] = row
+        # 검색 결과는 모두 노출 (펼치기만 하면 보이도록)
+        self._fetched = {node: len(kids) for node, kids in self._filter.items()}
@@ -0,0 +1,224 @@
+"""병합된 PDF 후처리: 이미지 재압축/축소, 압축되지 않은 스트림 압축, 웹 보기용 선형화.
+
+    python -m pdf_optimize input.pdf [-o output.pdf] [--preset screen|ebook|print] [--workers N]
+
+- 이미지 재압축은 페이지 묶음 단위로 프로세스 풀에서 병렬 처리합니다.
+- Pillow가 있으면 이미지를 축소하고 JPEG로 다시 인코딩합니다. 없으면 Flate 이미지만 최대 압축률로 다시 압축합니다.
+- pikepdf가 있으면 선형화(Fast Web View)와 객체 스트림 압축까지 합니다. 없으면 선형화는 건너뜁니다.
+"""
+import os
+import io
+import sys
+import zlib
+import importlib.util
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, NameObject, NumberObject, StreamObject
+from config import PDF_OPTIMIZE_PRESET, PDF_OPTIMIZE_WORKERS
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+# 프리셋: (이미지 긴 변 최대 픽셀, JPEG 품질)
+PRESETS = {
+    "screen": (1200, 60),
+    "ebook": (1800, 75),
+    "print": (3000, 90),
+}
+
+def _image_task(obj):
+    """재압축할 수 있는 이미지면 (필터, 폭, 높이, 채널 수, 원본 데이터)를, 아니면 None을 반환합니다."""
+    if obj.get("/Subtype") != "/Image" or obj.get("/ImageMask") or "/Decode" in obj:
+        return None
+    if obj.get("/BitsPerComponent") != 8:
+        return None
+    image_filter = obj.get("/Filter")
+    if isinstance(image_filter, ArrayObject):
+        image_filter = image_filter[0] if len(image_filter) == 1 else None
+    if image_filter not in ("/FlateDecode", "/DCTDecode"):
+        return None
+    params = obj.get("/DecodeParms")
+    if image_filter == "/FlateDecode" and params and params.get_object().get("/Predictor", 1) > 1:
+        return None
+    colorspace = obj.get("/ColorSpace")
+    colorspace = colorspace.get_object() if colorspace is not None else None
+    if colorspace == "/DeviceRGB":
+        components = 3
+    elif colorspace == "/DeviceGray":
+        components = 1
+    elif isinstance(colorspace, ArrayObject) and colorspace and colorspace[0] == "/ICCBased":
+        components = colorspace[1].get_object().get("/N")
+    else:
+        return None
+    return str(image_filter), int(obj["/Width"]), int(obj["/Height"]), components, obj._data
+
+def _recompress_image(image_module, image_filter, width, height, components, data, max_side, quality):
+    """이미지 하나를 다시 인코딩합니다. 더 작아질 때만 (데이터, 필터, 폭, 높이)를 반환합니다."""
+    try:
+        if image_module is None:
+            if image_filter != "/FlateDecode":
+                return None
+            new_data = zlib.compress(zlib.decompress(data), 9)
+            return (new_data, "/FlateDecode", width, height) if len(new_data) < len(data) else None
+        mode = {1: "L", 3: "RGB"}.get(components)
+        if mode is None:
+            return None
+        if image_filter == "/DCTDecode":
+            image = image_module.open(io.BytesIO(data))
+            if image.mode != mode:
+                return None
+        else:
+            raw = zlib.decompress(data)
+            if len(raw) != width * height * components:
+                return None
+            image = image_module.frombytes(mode, (width, height), raw)
+        scale = max_side / max(width, height)
+        if scale < 1:
+            image = image.resize((max(1, round(width * scale)), max(1, round(height * scale))), image_module.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=quality, optimize=True)
+        new_data = out.getvalue()
+        if len(new_data) >= len(data):
+            return None
+        return new_data, "/DCTDecode", image.width, image.height
+    except Exception:
+        # 디코딩할 수 없는 이미지는 그대로 둠
+        return None
+
+def _recompress_images(tasks, max_side, quality):
+    """워커 프로세스 진입점: 페이지 묶음의 이미지들을 재압축해 [(키, 결과)]를 반환합니다."""
+    try:
+        from PIL import Image as image_module
+    except ImportError:
+        image_module = None
+    return [(key, _recompress_image(image_module, *task, max_side, quality)) for key, task in tasks]
+
+def _page_images(resources, seen):
+    """페이지 리소스(하위 Form XObject 포함)에서 처음 보는 이미지 XObject를 (키, 객체)로 나열합니다."""
+    xobjects = resources.get("/XObject") if resources else None
+    if not xobjects:
+        return
+    for ref in xobjects.get_object().values():
+        obj = ref.get_object()
+        key = getattr(ref, "idnum", id(obj))
+        if key in seen:
+            continue
+        seen.add(key)
+        if obj.get("/Subtype") == "/Image":
+            yield key, obj
+        elif obj.get("/Subtype") == "/Form":
+            yield from _page_images(obj.get("/Resources"), seen)
+
+def _chunks(items, count):
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def optimize_pdf(input_path, output_path=None, preset=PDF_OPTIMIZE_PRESET, workers=PDF_OPTIMIZE_WORKERS, linearize=True):
+    """PDF를 최적화해 output_path(없으면 input_path 덮어쓰기)에 저장합니다.
+    반환값: {"path", "before_bytes", "after_bytes", "images", "resized", "linearized"} (resized: Pillow로 이미지를 축소했는지)
+    """
+    max_side, quality = PRESETS[preset]
+    output_path = output_path or input_path
+    before_bytes = os.path.getsize(input_path)
+
+    writer = PdfWriter()
+    for page in PdfReader(input_path).pages:
+        writer.add_page(page)
+
+    # 페이지 순서대로 이미지를 모아 페이지 묶음 단위로 나눔 (공유 이미지는 처음 나온 페이지에 배정)
+    seen = set()
+    objects = {}
+    page_tasks = []
+    for page in writer.pages:
+        tasks = []
+        for key, obj in _page_images(page.get("/Resources"), seen):
+            task = _image_task(obj)
+            if task is not None:
+                objects[key] = obj
+                tasks.append((key, task))
+        if tasks:
+            page_tasks.append(tasks)
+
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if len(page_tasks) > 1 and workers > 1:
+        chunks = [[task for tasks in chunk for task in tasks] for chunk in _chunks(page_tasks, workers)]
+        # Qt 스레드에서 호출되므로 fork 대신 spawn
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            for chunk_results in pool.map(_recompress_images, chunks, [max_side] * len(chunks), [quality] * len(chunks)):
+                results.extend(chunk_results)
+    elif page_tasks:
+        results = _recompress_images([task for tasks in page_tasks for task in tasks], max_side, quality)
+
+    replaced = 0
+    for key, result in results:
+        if result is None:
+            continue
+        data, image_filter, width, height = result
+        obj = objects[key]
+        obj._data = data
+        obj[NameObject("/Filter")] = NameObject(image_filter)
+        obj[NameObject("/Width")] = NumberObject(width)
+        obj[NameObject("/Height")] = NumberObject(height)
+        obj.pop("/DecodeParms", None)
+        if hasattr(obj, "decoded_self"):
+            obj.decoded_self = None
+        replaced += 1
+
+    # 필터 없이 저장된 스트림(폰트, 콘텐츠 등) 압축
+    for obj in writer._objects:
+        if isinstance(obj, StreamObject) and "/Filter" not in obj and obj._data:
+            obj._data = zlib.compress(obj._data if isinstance(obj._data, bytes) else obj._data.encode("latin-1"), 9)
+            obj[NameObject("/Filter")] = NameObject("/FlateDecode")
+
+    temp_path = output_path + ".optimizing"
+    with open(temp_path, "wb") as f:
+        writer.write(f)
+    linearized = False
+    if linearize and pikepdf is not None:
+        with pikepdf.open(temp_path) as pdf:
+            pdf.save(output_path, linearize=True, compress_streams=True, recompress_flate=True,
+                     object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        os.remove(temp_path)
+        linearized = True
+    else:
+        os.replace(temp_path, output_path)
+
+    return {
+        "path": output_path,
+        "before_bytes": before_bytes,
+        "after_bytes": os.path.getsize(output_path),
+        "images": replaced,
+        "resized": importlib.util.find_spec("PIL") is not None,
+        "linearized": linearized,
+    }
+
+def format_optimize_result(result):
+    before, after = result["before_bytes"], result["after_bytes"]
+    ratio = after / before * 100 if before else 100
+    text = f"PDF 최적화: {before / 1024 / 1024:.2f} MB -> {after / 1024 / 1024:.2f} MB ({ratio:.0f}%), 이미지 {result['images']}개 재압축"
+    if not result.get("resized", True):
+        text += " (Pillow 없음: 이미지 축소 생략)"
+    if not result["linearized"]:
+        text += " (pikepdf 없음: 선형화 생략)"
+    return text
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF 용량 최적화")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", help="출력 경로 (없으면 입력 파일 덮어쓰기)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=PDF_OPTIMIZE_PRESET)
+    parser.add_argument("--workers", type=int, default=PDF_OPTIMIZE_WORKERS)
+    parser.add_argument("--no-linearize", action="store_true")
+    args = parser.parse_args(argv)
+    result = optimize_pdf(args.input, args.output, args.preset, args.workers, not args.no_linearize)
+    print(format_optimize_result(result))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import time
+import types
+import asyncio
+import threading
+from config import (NOTION_RATE_LIMIT_PER_SEC, NOTION_RATE_LIMIT_BURST, NOTION_RATE_LIMIT_RETRIES,
+                    LOW_PRIORITY_RESERVED_TOKENS)
+
+def is_rate_limited(error) -> bool:
+    """notion_client의 429(rate_limited) 오류인지 확인합니다."""
+    return getattr(error, "code", None) == "rate_limited" or getattr(error, "status", None) == 429
+
+def retry_after_seconds(error, default=1.0) -> float:
+    """오류의 retry_after 값이나 Retry-After 헤더에서 대기 시간(초)을 읽습니다."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(error, "headers", None) or {}
+        value = headers.get("retry-after")
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+class RateLimiter:
+    """스레드 간에 공유되는 토큰 버킷.
+    - rate: 초당 보충되는 토큰 수 (Notion API 평균 허용량 초당 3회)
+    - burst: 한 번에 쓸 수 있는 최대 토큰 수
+    - low_priority_reserve: 우선순위가 낮은 호출(미리 가져오기)이 건드리지 않고 남겨 두는 토큰 수
+    각 QThread는 자기 이벤트 루프를 쓰므로 잠금은 threading.Lock으로 잡고, 대기는 asyncio.sleep으로 합니다.
+    """
+
+    def __init__(self, rate=NOTION_RATE_LIMIT_PER_SEC, burst=NOTION_RATE_LIMIT_BURST,
+                 low_priority_reserve=LOW_PRIORITY_RESERVED_TOKENS):
+        self.rate = rate
+        self.burst = burst
+        self.low_priority_reserve = min(low_priority_reserve, burst - 1)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고, 사용 가능해질 때까지 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self, low_priority=False):
+        if not low_priority:
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return
+        # 낮은 우선순위: 대화형 요청 몫을 남겨 둘 수 있을 때만 토큰을 가져감 (빚을 지지 않음)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1 + self.low_priority_reserve:
+                    self._tokens -= 1
+                    return
+                wait = (1 + self.low_priority_reserve - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """429를 받았을 때 모든 호출자가 seconds 동안 새 요청을 보내지 않도록 토큰을 비웁니다."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """앱 전체에서 공유하는 Notion API 레이트 리미터."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
+
+def set_rate_limiter(limiter):
+    """공유 레이트 리미터를 교체합니다 (벤치마크 등에서 사용)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
+
+async def rate_limited_call(make_call, limiter=None, retries=NOTION_RATE_LIMIT_RETRIES, low_priority=False):
+    """공유 레이트 리미터 토큰을 받은 뒤 make_call()을 await합니다.
+    429를 받으면 Retry-After만큼 리미터 전체를 멈추고 retries번까지 다시 시도합니다.
+    make_call은 호출할 때마다 새 awaitable을 만드는 함수여야 합니다.
+    """
+    limiter = limiter or get_rate_limiter()
+    attempt = 0
+    while True:
+        await limiter.acquire(low_priority)
+        try:
+            return await make_call()
+        except Exception as e:
+            if not is_rate_limited(e) or attempt >= retries:
+                raise
+            attempt += 1
+            limiter.pause(retry_after_seconds(e))
+
+class ThrottledNotionClient:
+    """notion_client.AsyncClient(또는 같은 모양의 클라이언트)를 감싸, 모든 API 호출이
+    공유 레이트 리미터를 거치도록 합니다. client.pages.retrieve(...)처럼 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, client, limiter=None, low_priority=False):
+        self._client = client
+        self._limiter = limiter
+        self._low_priority = low_priority
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name.startswith("_"):
+            return attr
+        if isinstance(attr, types.MethodType):
+            async def call(*args, **kwargs):
+                return await rate_limited_call(lambda: attr(*args, **kwargs), self._limiter,
+                                               low_priority=self._low_priority)
+            return call
+        if isinstance(attr, (str, int, float, bool, type(None), dict, list)):
+            return attr
+        # 엔드포인트 객체 (pages, blocks, blocks.children 등)
+        return ThrottledNotionClient(attr, self._limiter, self._low_priority)
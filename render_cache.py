@@ -0,0 +1,105 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+from config import RENDER_CACHE_DIR, RENDER_CACHE_MAX_MB
+from tracing import count
+
+class RenderCache:
+    """렌더링된 페이지 PDF를 완성된 HTML과 인쇄 옵션의 해시로 저장하는 디스크 캐시.
+    - 같은 HTML을 같은 옵션으로 다시 인쇄하는 일(여러 사람이 같은 페이지를 내보내는 서버 모드 등)을 건너뜁니다.
+    - 전체 크기가 max_mb를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+    """
+
+    def __init__(self, cache_dir=RENDER_CACHE_DIR, max_mb=RENDER_CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._sizes = None
+
+    @staticmethod
+    def key(full_html, pdf_options=None):
+        digest = hashlib.sha256(full_html.encode("utf-8"))
+        digest.update(json.dumps(pdf_options, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def get(self, key, pdf_path):
+        """캐시에 있으면 pdf_path로 복사하고 True를 반환합니다."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, pdf_path)
+            os.utime(path)
+        except OSError:
+            count("render_cache.misses")
+            return False
+        count("render_cache.hits")
+        return True
+
+    def put(self, key, pdf_path):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 여러 작업이 같은 페이지를 동시에 저장할 수 있으므로 임시 파일은 스레드별로
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            shutil.copyfile(pdf_path, tmp_path)
+            os.replace(tmp_path, self._path(key))
+            size = os.path.getsize(self._path(key))
+        except OSError as e:
+            print(f"렌더링 캐시 저장 오류: {e}")
+            return
+        with self._lock:
+            sizes = self._load_sizes()
+            sizes[key] = size
+            self._evict(sizes)
+
+    def _load_sizes(self):
+        if self._sizes is None:
+            self._sizes = {}
+            try:
+                names = os.listdir(self.cache_dir)
+            except OSError:
+                names = []
+            for name in names:
+                if name.endswith(".pdf"):
+                    try:
+                        self._sizes[name[:-4]] = os.path.getsize(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+        return self._sizes
+
+    def _evict(self, sizes):
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def last_used(key):
+            try:
+                return os.path.getmtime(self._path(key))
+            except OSError:
+                return 0.0
+
+        for key in sorted(sizes, key=last_used):
+            if total <= self.max_bytes:
+                break
+            total -= sizes.pop(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            count("render_cache.evictions")
+
+_render_cache = None
+_render_cache_lock = threading.Lock()
+
+def get_render_cache():
+    """set_render_cache()로 켠 렌더링 캐시를 반환합니다. 켜지 않았으면 None (데스크톱 앱 기본값)."""
+    return _render_cache
+
+def set_render_cache(cache):
+    """전역 렌더링 캐시를 켜거나(RenderCache) 끕니다(None)."""
+    global _render_cache
+    with _render_cache_lock:
+        _render_cache = cache
@@ -0,0 +1,136 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from config import (RENDER_MIN_CONCURRENCY, RENDER_MAX_CONCURRENCY, RENDER_INITIAL_CONCURRENCY,
+                    MEMORY_PRESSURE_PERCENT, LOAD_PRESSURE_RATIO)
+from block_cache import get_block_cache
+from block_model import iter_blocks
+from tracing import count
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def system_pressure(memory_percent=MEMORY_PRESSURE_PERCENT, load_ratio=LOAD_PRESSURE_RATIO):
+    """메모리 사용률이나 코어당 부하가 임계값을 넘으면 그 이유를, 아니면 None을 반환합니다.
+    psutil이 없으면 메모리는 확인하지 않고, 부하는 os.getloadavg(유닉스)로만 확인합니다.
+    """
+    if psutil is not None:
+        used = psutil.virtual_memory().percent
+        if used >= memory_percent:
+            return f"memory {used:.0f}%"
+    try:
+        load = psutil.getloadavg()[0] if psutil is not None else os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+    cores = os.cpu_count() or 1
+    if load / cores >= load_ratio:
+        return f"load {load:.1f}/{cores}"
+    return None
+
+def estimate_page_weight(page_id):
+    """블록 캐시로 페이지의 렌더링 비용을 추정합니다 (블록 수 + 이미지 가중치). 캐시에 없으면 None."""
+    blocks = get_block_cache().get(page_id)
+    if blocks is None:
+        return None
+    return sum(20 if block.type in ("image", "video", "embed", "pdf") else 1 for block in iter_blocks(blocks))
+
+class AdaptiveScheduler:
+    """렌더링 슬롯 수를 처리량과 시스템 부하에 맞춰 조절하는 스케줄러.
+    - 한 구간(현재 슬롯 수만큼 완료)마다 처리량을 재서, 좋아지는 동안 같은 방향으로 슬롯을 하나씩 조정하고 아니면 방향을 바꿉니다.
+    - 메모리/부하가 임계값을 넘으면 슬롯을 절반으로 줄입니다 (초당 최대 한 번).
+    - 대기 중인 작업은 priority가 큰 것(큰 페이지)부터 슬롯을 받습니다.
+    """
+
+    def __init__(self, min_slots=RENDER_MIN_CONCURRENCY, max_slots=RENDER_MAX_CONCURRENCY,
+                 initial_slots=RENDER_INITIAL_CONCURRENCY, pressure_check=system_pressure):
+        self.min_slots = max(1, min_slots)
+        # 기본 상한은 코어 수 (코어가 적어도 기존 고정값만큼은 허용)
+        self.max_slots = max(self.min_slots, max_slots or max(os.cpu_count() or 1, initial_slots))
+        self.limit = min(max(initial_slots, self.min_slots), self.max_slots)
+        self.pressure_check = pressure_check
+        self.active = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._window_start = time.perf_counter()
+        self._window_done = 0
+        self._last_throughput = None
+        self._direction = 1
+        self._last_backoff = 0.0
+        count("render.concurrency", self.limit)
+
+    def _set_limit(self, limit):
+        limit = min(max(limit, self.min_slots), self.max_slots)
+        if limit != self.limit:
+            count("render.concurrency", limit - self.limit)
+            self.limit = limit
+            self._wake()
+
+    def _wake(self):
+        while self._waiters and self.active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    async def acquire(self, priority=0):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소됨
+                self.release(completed=False)
+            raise
+
+    def release(self, completed=True):
+        self.active -= 1
+        if completed:
+            self._adjust()
+        self._wake()
+
+    def _adjust(self):
+        self._window_done += 1
+        now = time.perf_counter()
+        pressure = self.pressure_check() if self.pressure_check else None
+        if pressure:
+            if now - self._last_backoff >= 1.0:
+                count("render.pressure_backoffs")
+                self._last_backoff = now
+                self._set_limit(self.limit // 2)
+                # 부하가 풀리면 다시 하나씩 늘려 봄 (AIMD)
+                self._direction = 1
+                self._last_throughput = None
+            self._reset_window(now)
+            return
+        if self._window_done < self.limit:
+            return
+        throughput = self._window_done / max(now - self._window_start, 1e-6)
+        if self._last_throughput is not None and throughput < self._last_throughput * 1.05:
+            # 직전 변경으로 처리량이 좋아지지 않았으면 방향을 바꿈
+            self._direction = -self._direction
+        self._last_throughput = throughput
+        self._set_limit(self.limit + self._direction)
+        self._reset_window(now)
+
+    def _reset_window(self, now=None):
+        self._window_start = now or time.perf_counter()
+        self._window_done = 0
+
+    @asynccontextmanager
+    async def slot(self, priority=0):
+        await self.acquire(priority)
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            self.release(completed)
@@ -0,0 +1,131 @@
+"""페이지 내보내기 감시: 단계별(가져오기 / 로드 / 인쇄) 시간 제한, 멈춘 렌더링 재시도, 느린 페이지 표시.
+
+깨진 임베드나 아주 큰 이미지가 있는 페이지 하나가 set_content(wait_until="networkidle")에서 끝나지 않으면
+전체 내보내기가 그 페이지를 하염없이 기다리게 됩니다. 단계마다 시간을 제한해 멈춘 렌더링을 끊고,
+새 브라우저 컨텍스트에서 한 번 더 시도한 뒤에도 안 되면 그 페이지만 실패로 기록합니다.
+"""
+import time
+import asyncio
+import statistics
+from collections import Counter
+from config import RENDER_TIMEOUT_RETRIES, SLOW_PAGE_FACTOR, SLOW_PAGE_MIN_SEC
+from tracing import count, get_tracer
+
+CLOSE_TIMEOUT_SEC = 10
+STAGES = ("fetch", "html", "render")
+
+class RenderTimeout(TimeoutError):
+    """한 단계가 제한 시간 안에 끝나지 않음. stage는 fetch / load / print 중 하나."""
+
+    def __init__(self, stage, seconds):
+        super().__init__(f"{stage} 단계가 {seconds:g}초 안에 끝나지 않았습니다")
+        self.stage = stage
+        self.seconds = seconds
+
+async def with_timeout(awaitable, seconds, stage):
+    """awaitable을 seconds초 안에 끝내고, 넘기면 취소한 뒤 RenderTimeout을 일으킵니다. seconds가 없으면 제한하지 않습니다."""
+    if not seconds:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, seconds)
+    except asyncio.TimeoutError:
+        count(f"watchdog.{stage}_timeouts")
+        raise RenderTimeout(stage, seconds) from None
+
+async def close_quietly(target, what="브라우저 컨텍스트"):
+    """멈춘 페이지가 있어도 close()가 끝없이 기다리지 않도록 시간을 제한해 닫습니다 (오류는 출력만 함)."""
+    try:
+        await asyncio.wait_for(target.close(), CLOSE_TIMEOUT_SEC)
+    except Exception as e:
+        print(f"{what} 닫기 오류: {type(e).__name__}: {e}")
+
+async def render_with_retry(render, *args, retries=RENDER_TIMEOUT_RETRIES, label="", on_timeout=None):
+    """render(*args)가 시간 제한에 걸리면 retries번까지 다시 시도합니다. 시간 제한에 걸릴 때마다 on_timeout(오류)을 부릅니다.
+    render_pdf는 시도마다 새 브라우저 컨텍스트를 열므로, 다시 시도할 때는 멈춘 탭의 상태를 물려받지 않습니다."""
+    for attempt in range(retries + 1):
+        try:
+            return await render(*args)
+        except RenderTimeout as e:
+            if on_timeout is not None:
+                on_timeout(e)
+            if attempt == retries:
+                raise
+            count("watchdog.render_retries")
+            print(f"렌더링 시간 초과, 새 브라우저 컨텍스트에서 다시 시도합니다 ({label}): {e}")
+
+class PageTimings:
+    """페이지별 단계 소요 시간을 모아, 다른 페이지보다 유난히 느린 페이지를 찾습니다.
+    - record(idx, stage, seconds): 같은 페이지의 같은 단계가 여러 번이면(출력 형식별 렌더링) 가장 긴 값을 씀
+    - 느린 페이지: 단계 소요 시간이 max(중앙값 x factor, min_seconds)를 넘거나, 시간 제한에 걸렸던 페이지
+    """
+
+    def __init__(self, page_ids, factor=SLOW_PAGE_FACTOR, min_seconds=SLOW_PAGE_MIN_SEC):
+        self.page_ids = list(page_ids)
+        self.factor = factor
+        self.min_seconds = min_seconds
+        self.titles = {}
+        self.durations = {stage: {} for stage in STAGES}
+        self.timeouts = {}
+
+    def record(self, idx, stage, seconds):
+        durations = self.durations[stage]
+        durations[idx] = max(durations.get(idx, 0.0), seconds)
+
+    def record_timeout(self, idx, error):
+        self.timeouts.setdefault(idx, []).append(error.stage)
+
+    def measure(self, idx, stage):
+        """with 블록의 소요 시간을 stage에 기록하는 컨텍스트 매니저 (예외로 끝나도 기록, 시간 초과는 record_timeout으로 따로)."""
+        return _Measure(self, idx, stage)
+
+    def outliers(self):
+        """[{"index", "page_id", "title", "stages": {단계: 초}, "medians": {단계: 초}, "timeouts": [단계]}] (느린 순)."""
+        medians = {stage: statistics.median(values.values()) for stage, values in self.durations.items() if values}
+        flagged = {}
+        for stage, values in self.durations.items():
+            if stage not in medians:
+                continue
+            threshold = max(medians[stage] * self.factor, self.min_seconds)
+            for idx, seconds in values.items():
+                if seconds > threshold:
+                    flagged.setdefault(idx, {})[stage] = round(seconds, 2)
+        for idx in self.timeouts:
+            flagged.setdefault(idx, {})
+        outliers = [{
+            "index": idx, "page_id": self.page_ids[idx], "title": self.titles.get(idx, ""),
+            "stages": stages, "medians": {stage: round(medians[stage], 2) for stage in stages},
+            "timeouts": self.timeouts.get(idx, []),
+        } for idx, stages in flagged.items()]
+        outliers.sort(key=lambda o: (not o["timeouts"], -max(o["stages"].values(), default=0)))
+        return outliers
+
+    def format_report(self, outliers=None):
+        outliers = self.outliers() if outliers is None else outliers
+        if not outliers:
+            return ""
+        lines = [f"느린 페이지 {len(outliers)}개 (중앙값의 {self.factor:g}배 이상이거나 시간 제한에 걸림):"]
+        for o in outliers:
+            parts = [f"{stage} {seconds:.2f}초 (중앙값 {o['medians'][stage]:.2f}초)" for stage, seconds in o["stages"].items()]
+            parts += [f"{stage} 시간 초과" + (f" {n}회" if n > 1 else "") for stage, n in Counter(o["timeouts"]).items()]
+            name = f"{o['title']} ({o['page_id']})" if o["title"] else o["page_id"]
+            lines.append(f"  {o['index'] + 1}. {name}: {', '.join(parts)}")
+        return "\n".join(lines)
+
+    def publish(self, tracer=None):
+        """현재 트레이서의 요약(내보내기 보고서)과 트레이스 JSON(metadata.slow_pages)에 느린 페이지를 남깁니다."""
+        tracer = tracer or get_tracer()
+        if tracer is None:
+            return
+        outliers = self.outliers()
+        tracer.add_section("slow_pages", outliers, self.format_report(outliers))
+
+class _Measure:
+    def __init__(self, timings, idx, stage):
+        self.timings, self.idx, self.stage = timings, idx, stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings.record(self.idx, self.stage, time.perf_counter() - self.start)
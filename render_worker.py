@@ -0,0 +1,356 @@
+"""HTML을 받아 PDF로 인쇄해 돌려주는 렌더링 워커와, 여러 워커에 렌더링을 나눠 맡기는 클라이언트 풀.
+
+    python -m render_worker --port 9100 --slots 2                      # 이 컴퓨터에서만 접속
+    python -m render_worker --host 0.0.0.0 --port 9100 --token secret  # 다른 컴퓨터에서 접속 허용
+
+내보내는 쪽은 .env에 RENDER_WORKER_URLS=http://host1:9100,http://host2:9100 (토큰을 쓰면 RENDER_WORKER_TOKEN)을 넣으면
+페이지 렌더링을 이 워커들에 나눠 맡깁니다.
+
+프로토콜 (HTTP/1.1, JSON):
+- GET /health -> {"status": "ok", "slots": 동시 렌더링 수, "active": 렌더링 중인 수, "rendered": 누적 렌더링 수}
+- POST /render {"html": 완성된 HTML, "pdf_options": page.pdf 옵션, "assets": {URL: base64}} -> application/pdf
+  assets에 있는 URL은 워커가 네트워크에서 가져오지 않고 넘겨받은 내용을 씁니다.
+- 토큰을 정한 워커는 "Authorization: Bearer <토큰>" 헤더가 없는 요청을 401로 거절합니다.
+"""
+import os
+import sys
+import json
+import time
+import hmac
+import base64
+import asyncio
+import argparse
+import tempfile
+import threading
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import (RENDER_WORKER_URLS, RENDER_WORKER_TIMEOUT_SEC, RENDER_WORKER_HEALTH_TIMEOUT_SEC,
+                    RENDER_WORKER_RECHECK_SEC)
+from tracing import span, count
+
+class RenderWorkerError(Exception):
+    """렌더링을 맡길 수 있는 워커가 없거나, 워커가 요청 자체를 거절함."""
+
+# ---------------------------------------------------------------- 워커 (서버)
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "RenderWorker/1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.server.worker.token
+        given = self.headers.get("Authorization") or ""
+        return not token or hmac.compare_digest(given.encode(), f"Bearer {token}".encode())
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": f"지원하지 않는 요청: GET {self.path}"})
+            return
+        if not self._authorized():
+            self._send_json(401, {"error": "인증 토큰이 올바르지 않습니다"})
+            return
+        self._send_json(200, self.server.worker.health())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.path != "/render":
+            self._send_json(404, {"error": f"지원하지 않는 요청: POST {self.path}"})
+            return
+        if not self._authorized():
+            self._send_json(401, {"error": "인증 토큰이 올바르지 않습니다"})
+            return
+        try:
+            request = json.loads(body)
+            html = request["html"]
+            assets = {url: base64.b64decode(data) for url, data in (request.get("assets") or {}).items()}
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"잘못된 요청: {e}"})
+            return
+        try:
+            pdf = self.server.worker.render(html, request.get("pdf_options"), assets)
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf)))
+        self.end_headers()
+        self.wfile.write(pdf)
+
+class RenderWorker:
+    """HTTP로 렌더링 요청을 받아 미리 띄운 브라우저(WarmBrowser)로 인쇄합니다.
+    요청마다 스레드가 하나씩 돌고, 동시에 인쇄하는 페이지 수는 slots로 제한합니다 (나머지는 차례를 기다림).
+    browser는 render(full_html, pdf_path, page_index, pdf_options, assets) 코루틴을 가진 객체면 됩니다 (기본 WarmBrowser).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, slots=None, token=None, browser=None):
+        if browser is None:
+            from browser_warmup import WarmBrowser
+            # 워커는 요청을 기다리는 것이 일이므로 유휴 시간이 지나도 브라우저를 닫지 않음
+            browser = WarmBrowser(idle_timeout=None)
+        self.browser = browser
+        self.slots = slots or os.cpu_count() or 1
+        self.token = token
+        self.active = 0
+        self.rendered = 0
+        self._semaphore = threading.Semaphore(self.slots)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _WorkerHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.worker = self
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def health(self):
+        with self._lock:
+            return {"status": "ok", "slots": self.slots, "active": self.active, "rendered": self.rendered}
+
+    def render(self, html, pdf_options=None, assets=None):
+        """HTML을 PDF로 인쇄해 바이트로 반환합니다."""
+        with self._semaphore:
+            with self._lock:
+                self.active += 1
+            try:
+                with tempfile.TemporaryDirectory(prefix="render-worker-") as temp_dir:
+                    pdf_path = os.path.join(temp_dir, "page.pdf")
+                    asyncio.run(self.browser.render(html, pdf_path, 0, pdf_options, assets))
+                    with open(pdf_path, "rb") as f:
+                        pdf = f.read()
+                with self._lock:
+                    self.rendered += 1
+                return pdf
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+    def serve_forever(self):
+        start = getattr(self.browser, "start", None)
+        if start is not None:
+            # 첫 요청 전에 브라우저를 띄워 둠
+            start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            close = getattr(self.browser, "close", None)
+            if close is not None:
+                close()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+# ---------------------------------------------------------------- 클라이언트 (내보내는 쪽)
+
+class _WorkerState:
+    __slots__ = ("url", "slots", "active", "healthy", "checked_at", "failures", "rendered")
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.slots = 1
+        self.active = 0
+        self.healthy = True
+        self.checked_at = None
+        self.failures = 0
+        self.rendered = 0
+
+class RenderWorkerPool:
+    """여러 렌더링 워커에 페이지를 나눠 맡깁니다.
+    - 상태 확인(/health)을 통과한 워커 중 슬롯 대비 진행 중인 요청이 가장 적은 워커를 고릅니다.
+    - 연결 실패, 시간 초과, 503이면 그 워커를 제외하고 다른 워커로 다시 보냅니다. 제외된 워커는 recheck_after초 뒤 다시 확인합니다.
+    - 워커가 렌더링 중 오류(500)를 내면 워커는 그대로 두고 다른 워커로 한 번 더 보냅니다.
+    워커 상태는 여러 스레드(이벤트 루프)가 공유하고, HTTP 연결은 session()마다 새로 만듭니다.
+    """
+
+    def __init__(self, urls, token=None, timeout=RENDER_WORKER_TIMEOUT_SEC, health_timeout=RENDER_WORKER_HEALTH_TIMEOUT_SEC,
+                 recheck_after=RENDER_WORKER_RECHECK_SEC, clock=time.monotonic):
+        self.workers = [_WorkerState(url) for url in dict.fromkeys(urls)]
+        self.token = token
+        self.timeout = timeout
+        self.health_timeout = health_timeout
+        self.recheck_after = recheck_after
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    @property
+    def capacity(self):
+        """상태가 좋은 워커들의 슬롯 합계."""
+        with self._lock:
+            return sum(worker.slots for worker in self.workers if worker.healthy)
+
+    async def check_worker(self, client, worker):
+        try:
+            response = await client.get(f"{worker.url}/health", headers=self.headers, timeout=self.health_timeout)
+            if response.status_code != 200:
+                self._mark_down(worker, _error_message(response))
+                return False
+            slots = max(1, int(response.json().get("slots") or 1))
+        except Exception as e:
+            self._mark_down(worker, e)
+            return False
+        with self._lock:
+            worker.slots = slots
+            worker.healthy = True
+            worker.checked_at = self.clock()
+        return True
+
+    async def check_health(self, client):
+        """모든 워커의 상태를 동시에 확인하고, 상태가 좋은 워커 수를 반환합니다."""
+        results = await asyncio.gather(*(self.check_worker(client, worker) for worker in self.workers))
+        return sum(results)
+
+    def _mark_down(self, worker, error):
+        with self._lock:
+            if worker.healthy:
+                print(f"렌더링 워커 제외 ({worker.url}): {error}")
+            worker.healthy = False
+            worker.checked_at = self.clock()
+            worker.failures += 1
+        count("render.worker_down")
+
+    def _candidates(self, tried):
+        """(바로 쓸 워커, 다시 확인해 볼 워커) 목록."""
+        now = self.clock()
+        with self._lock:
+            ready = [worker for worker in self.workers if worker.healthy and worker.url not in tried]
+            recheck = [worker for worker in self.workers
+                       if not worker.healthy and worker.url not in tried and now - worker.checked_at >= self.recheck_after]
+        return ready, recheck
+
+    async def _pick(self, client, tried):
+        ready, recheck = self._candidates(tried)
+        for worker in recheck:
+            if await self.check_worker(client, worker):
+                ready.append(worker)
+        if not ready:
+            return None
+        with self._lock:
+            worker = min(ready, key=lambda w: (w.active / w.slots, w.failures))
+            worker.active += 1
+        return worker
+
+    async def render(self, client, full_html, pdf_path, page_index=0, pdf_options=None, assets=None):
+        """워커 하나에 렌더링을 맡겨 pdf_path에 저장합니다. 실패하면 아직 시도하지 않은 다른 워커로 다시 보냅니다."""
+        payload = {"html": full_html, "pdf_options": pdf_options,
+                   "assets": {url: base64.b64encode(body).decode("ascii") for url, body in (assets or {}).items()}}
+        tried = set()
+        last_error = None
+        while True:
+            worker = await self._pick(client, tried)
+            if worker is None:
+                raise RenderWorkerError(f"렌더링을 맡길 워커가 없습니다 (마지막 오류: {last_error})")
+            tried.add(worker.url)
+            if len(tried) > 1:
+                count("render.worker_retries")
+            try:
+                with span("render.remote", page_index=page_index, worker=worker.url) as span_args:
+                    response = await client.post(f"{worker.url}/render", json=payload, headers=self.headers,
+                                                 timeout=self.timeout)
+                    span_args["status"] = response.status_code
+                if response.status_code == 200:
+                    with open(pdf_path, "wb") as f:
+                        f.write(response.content)
+                    with self._lock:
+                        worker.rendered += 1
+                    count("pdf.rendered_bytes", len(response.content))
+                    return pdf_path
+                message = _error_message(response)
+                if response.status_code in (400, 401, 413):
+                    # 요청이나 설정이 잘못된 경우는 다른 워커도 마찬가지로 거절함
+                    raise RenderWorkerError(f"{worker.url}: {message}")
+                last_error = f"{worker.url}: {message}"
+                if response.status_code != 500:
+                    self._mark_down(worker, message)
+            except RenderWorkerError:
+                raise
+            except Exception as e:
+                # httpx 연결 오류와 시간 초과
+                last_error = f"{worker.url}: {type(e).__name__}: {e}"
+                self._mark_down(worker, e)
+            finally:
+                with self._lock:
+                    worker.active -= 1
+
+    @asynccontextmanager
+    async def session(self):
+        """현재 이벤트 루프에서 쓸 HTTP 연결을 열고, 워커 상태를 확인한 뒤 render(...)를 가진 객체를 넘겨줍니다."""
+        import httpx
+        async with httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=64)) as client:
+            await self.check_health(client)
+            yield _RenderSession(self, client)
+
+class _RenderSession:
+    def __init__(self, pool, client):
+        self.pool = pool
+        self.client = client
+
+    @property
+    def capacity(self):
+        return self.pool.capacity
+
+    async def render(self, full_html, pdf_path, page_index=0, pdf_options=None, assets=None):
+        return await self.pool.render(self.client, full_html, pdf_path, page_index, pdf_options, assets)
+
+def _error_message(response):
+    try:
+        return f"{response.status_code} {response.json().get('error')}"
+    except ValueError:
+        return f"{response.status_code} {response.text[:200]}"
+
+_render_worker_pool = None
+_render_worker_pool_lock = threading.Lock()
+
+def get_render_worker_pool():
+    """RENDER_WORKER_URLS(환경 변수 또는 config)에 워커가 있으면 공유 RenderWorkerPool을, 없으면 None을 반환합니다."""
+    global _render_worker_pool
+    with _render_worker_pool_lock:
+        if _render_worker_pool is None:
+            env_urls = os.getenv("RENDER_WORKER_URLS")
+            urls = [url.strip() for url in env_urls.split(",") if url.strip()] if env_urls else list(RENDER_WORKER_URLS)
+            if not urls:
+                return None
+            _render_worker_pool = RenderWorkerPool(urls, os.getenv("RENDER_WORKER_TOKEN"))
+        return _render_worker_pool
+
+def set_render_worker_pool(pool):
+    """전역 워커 풀을 교체합니다 (벤치마크 등). None이면 다음 호출 때 설정을 다시 읽습니다."""
+    global _render_worker_pool
+    with _render_worker_pool_lock:
+        _render_worker_pool = pool
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTML을 PDF로 인쇄해 주는 렌더링 워커")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--slots", type=int, default=None, help="동시에 인쇄할 페이지 수 (기본: 코어 수)")
+    parser.add_argument("--token", default=os.getenv("RENDER_WORKER_TOKEN"), help="요청에 필요한 인증 토큰")
+    args = parser.parse_args(argv)
+    worker = RenderWorker(args.host, args.port, args.slots, args.token)
+    # 벤치마크가 포트를 읽을 수 있도록 첫 줄에 주소를 출력
+    print(worker.url, flush=True)
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import unicodedata
+from bisect import bisect_right
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+# 호환 자모(ㄱ, ㅏ ...) -> 조합형 자모. 입력 중인 글자("프로ㅈ")를 분해형 제목과 비교하기 위함
+_COMPAT_TO_CONJOINING = {
+    **{c: chr(0x1100 + i) for i, c in enumerate(_CHOSEONG)},
+    **{chr(0x314F + i): chr(0x1161 + i) for i in range(21)},
+}
+_SEP = "\x00"
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").casefold().strip()
+
+def decompose(text: str) -> str:
+    """한글 음절을 자모로 분해합니다. 마지막 글자가 조합 중이어도 부분 일치가 되도록 합니다."""
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(_COMPAT_TO_CONJOINING.get(ch, ch) for ch in decomposed)
+
+def choseong(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 글자는 그대로 둔 문자열 (예: 프로젝트 -> ㅍㄹㅈㅌ)."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+            out.append(_CHOSEONG[(code - _SYLLABLE_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def _is_choseong_query(query: str) -> bool:
+    # 초성이 있고 완성된 음절이 없으면 초성 문자열에서 찾음 (숫자/영문 섞임 허용)
+    has_choseong = any(ch in _CHOSEONG for ch in query)
+    return has_choseong and not any(_SYLLABLE_BASE <= ord(ch) <= _SYLLABLE_LAST or "ㅏ" <= ch <= "ㅣ" for ch in query)
+
+class PageSearchIndex:
+    """페이지 제목 검색 인덱스 (메모리).
+    - 원본 제목(PageMeta.title)과 숨김 마커 여부를 보관합니다.
+    - 부분 문자열/접두어 일치, 초성 검색(ㅍㄹㅈ), 조합 중인 마지막 글자(프로제 -> 프로젝트)를 지원합니다.
+    - 추가/삭제는 즉시 반영되고, 검색용 연결 문자열은 다음 검색 때 한 번만 다시 만듭니다.
+    """
+
+    def __init__(self):
+        self._entries = {}   # page_id -> (정규화 제목, 분해 제목, 초성 제목, 숨김 여부)
+        self._dirty = True
+        self._ids = []
+        self._haystacks = {}
+        self._field_offsets = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, page_id):
+        return page_id in self._entries
+
+    def add(self, page_id, raw_title, hidden=False):
+        title = normalize(raw_title)
+        entry = (title, decompose(title), choseong(title), hidden)
+        if self._entries.get(page_id) != entry:
+            self._entries[page_id] = entry
+            self._dirty = True
+
+    def add_page(self, page):
+        self.add(page.id, page.title, page.hidden)
+
+    def remove(self, page_id):
+        if self._entries.pop(page_id, None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = True
+
+    def is_hidden(self, page_id):
+        entry = self._entries.get(page_id)
+        return bool(entry and entry[3])
+
+    def prepare(self):
+        """변경분이 있으면 검색용 문자열을 미리 만들어 첫 검색 지연을 없앱니다."""
+        if self._dirty:
+            self._rebuild()
+
+    def _rebuild(self):
+        # 필드별로 제목들을 구분자로 이어 붙인 문자열 하나를 만들고 str.find로 훑음 (페이지당 파이썬 루프 없음)
+        self._ids = list(self._entries)
+        entries = [self._entries[page_id] for page_id in self._ids]
+        self._haystacks = {}
+        self._field_offsets = {}
+        for field in (0, 1, 2):
+            offsets = []
+            offset = 0
+            for entry in entries:
+                offsets.append(offset)   # 각 제목 앞 구분자의 위치
+                offset += len(entry[field]) + 1
+            self._field_offsets[field] = offsets
+            self._haystacks[field] = _SEP + _SEP.join(entry[field] for entry in entries) + _SEP
+        self._dirty = False
+
+    def _scan(self, field, needle):
+        """field 문자열에서 needle을 포함하는 항목 번호와 접두어 일치 여부를 돌려줍니다."""
+        haystack = self._haystacks[field]
+        offsets = self._field_offsets[field]
+        matches = {}
+        start = haystack.find(needle)
+        while start != -1:
+            item = bisect_right(offsets, start - 1) - 1
+            if item >= 0:
+                is_prefix = offsets[item] == start - 1
+                matches[item] = matches.get(item, False) or is_prefix
+                # 같은 항목의 나머지 부분은 건너뜀
+                next_start = offsets[item + 1] if item + 1 < len(offsets) else len(haystack)
+            else:
+                next_start = start + 1
+            start = haystack.find(needle, max(next_start, start + 1))
+        return matches
+
+    def search(self, query, include_hidden=True, limit=None):
+        """query와 일치하는 페이지 ID 목록. 접두어 일치가 먼저 오고, 그 안에서는 추가 순서를 따릅니다."""
+        query = normalize(query)
+        if not query:
+            return []
+        self.prepare()
+        if _is_choseong_query(query):
+            matches = self._scan(2, query)
+        else:
+            matches = self._scan(0, query)
+            if any("ㄱ" <= ch <= "ㆎ" or "가" <= ch <= "힣" for ch in query):
+                for item, is_prefix in self._scan(1, decompose(query)).items():
+                    matches[item] = matches.get(item, False) or is_prefix
+        ordered = sorted(matches, key=lambda item: (not matches[item], item))
+        result = []
+        for item in ordered:
+            page_id = self._ids[item]
+            if not include_hidden and self._entries[page_id][3]:
+                continue
+            result.append(page_id)
+            if limit and len(result) >= limit:
+                break
+        return result
@@ -0,0 +1,391 @@
+"""여러 사람이 함께 쓰는 내보내기 서버 (창 없이 실행).
+
+    python -m server --port 8800                       # 이 컴퓨터에서만 접속
+    python -m server --host 0.0.0.0 --token secret     # 다른 컴퓨터에서 접속 허용
+
+모든 요청이 Notion 클라이언트 하나(공유 레이트 리미터를 거침), 블록/페이지 캐시, 렌더링 캐시, 미리 띄운 브라우저
+(또는 RENDER_WORKER_URLS의 렌더링 워커)를 함께 써서, 사람마다 캐시를 데우고 브라우저를 띄우는 비용을 한 번만 냅니다.
+
+API (JSON):
+- POST /jobs {"page_ids": [...], "output_name": "My_Portfolio", "optimize": "ebook" 또는 null, "children": false}
+  -> 202 {"id", "status", ...}. children=true면 화면의 내보내기처럼 각 페이지를 첫 번째 하위 페이지들로 바꿉니다.
+- GET /jobs -> {"jobs": [...]}
+- GET /jobs/<id> -> {"id", "status": queued|running|done|failed, "current", "total", "error", "failures", "summary"}
+- GET /jobs/<id>/events -> 진행 상황 스트림 (text/event-stream, 작업이 끝나면 닫힘)
+- GET /jobs/<id>/download -> 병합된 PDF
+- GET /health -> {"status", "jobs", "running", "fallbacks": 없는 선택 패키지와 대체 방식}
+토큰을 정하면 "Authorization: Bearer <토큰>" 헤더가 없는 요청은 401로 거절합니다.
+"""
+import os
+import sys
+import json
+import time
+import hmac
+import uuid
+import shutil
+import unicodedata
+import asyncio
+import argparse
+import threading
+from urllib.parse import quote, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import (SERVER_PORT, SERVER_OUTPUT_DIR, SERVER_MAX_CONCURRENT_JOBS, SERVER_MAX_FINISHED_JOBS,
+                    RENDER_CACHE_DIR, TRACE_DIR)
+from tracing import Tracer, use_tracer
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+class ExportJob:
+    """서버가 맡은 내보내기 작업 하나. 상태는 작업 루프 스레드에서만 바뀝니다."""
+
+    def __init__(self, page_ids, output_dir, output_name="My_Portfolio", optimize_preset=None, children=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.page_ids = list(dict.fromkeys(page_ids))
+        name = os.path.basename(output_name or "My_Portfolio")
+        # 제어 문자(줄바꿈 등)는 파일 이름과 응답 헤더에 쓸 수 없으므로 제거
+        name = "".join(ch for ch in name if unicodedata.category(ch) != "Cc").strip() or "My_Portfolio"
+        if not name.lower().endswith(".pdf"):
+            name += ".pdf"
+        # 작업마다 폴더를 따로 두어 같은 이름으로 내보내도 겹치지 않음
+        self.output_path = os.path.join(output_dir, self.id, name)
+        self.optimize_preset = optimize_preset
+        self.children = children
+        self.status = STATUS_QUEUED
+        self.current = 0
+        self.total = 0
+        self.error = None
+        self.failures = None
+        self.summary = None
+        self.result_path = None
+        self.trace_path = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # 상태가 바뀔 때마다 올라가는 번호 (진행 스트림이 바뀐 것만 보내도록)
+        self.version = 0
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_FAILED)
+
+    def as_dict(self):
+        return {
+            "id": self.id, "status": self.status, "current": self.current, "total": self.total,
+            "pages": len(self.page_ids), "error": self.error, "failures": self.failures, "summary": self.summary,
+            "created_at": self.created_at, "started_at": self.started_at, "finished_at": self.finished_at,
+            "download": f"/jobs/{self.id}/download" if self.result_path else None,
+        }
+
+class ExportServer:
+    """작업 API를 제공하는 HTTP 서버와, 작업을 실행하는 이벤트 루프 스레드.
+    Notion 클라이언트는 이벤트 루프에 묶이므로 모든 작업은 한 루프에서 돌고, 동시에 실행되는 작업 수는 max_jobs로 제한합니다.
+    notion_client를 넘기면 그 클라이언트를 그대로 씁니다 (부하 테스트용 픽스처 클라이언트 등).
+    """
+
+    def __init__(self, host="127.0.0.1", port=SERVER_PORT, output_dir=SERVER_OUTPUT_DIR, max_jobs=SERVER_MAX_CONCURRENT_JOBS,
+                 notion_client=None, token=None, warm_browser=True, render_cache=True,
+                 max_finished_jobs=SERVER_MAX_FINISHED_JOBS):
+        self.output_dir = output_dir
+        self.max_jobs = max_jobs
+        self.token = token
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self._jobs_lock = threading.Lock()
+        # 진행 스트림 요청 스레드를 깨우는 조건 변수
+        self._changed = threading.Condition()
+        self._notion = notion_client
+        self._warm_browser = warm_browser
+        self._render_cache = render_cache
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = None
+        self._job_slots = None
+        self.httpd = ThreadingHTTPServer((host, port), _ServerHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.export_server = self
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """작업 루프와 공유 자원을 준비하고, HTTP 요청은 백그라운드 스레드에서 받기 시작합니다."""
+        self._start_loop()
+        threading.Thread(target=self.httpd.serve_forever, name="export-server", daemon=True).start()
+        return self.url
+
+    def serve_forever(self):
+        self._start_loop()
+        self.httpd.serve_forever()
+
+    def _start_loop(self):
+        from render_cache import RenderCache, get_render_cache, set_render_cache
+        from render_worker import get_render_worker_pool
+        if self._render_cache and get_render_cache() is None:
+            set_render_cache(RenderCache(RENDER_CACHE_DIR))
+        if self._warm_browser and get_render_worker_pool() is None:
+            from browser_warmup import start_warm_browser
+            # 유휴 시간이 지나도 닫지 않음 (서버는 요청을 기다리는 것이 일)
+            start_warm_browser(idle_timeout=None)
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="export-jobs", daemon=True)
+        self._loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+    async def _setup(self):
+        self._job_slots = asyncio.Semaphore(self.max_jobs)
+        if self._notion is None:
+            from notion_api import create_notion_client
+            from rate_limit import ThrottledNotionClient
+            # 모든 작업의 API 호출이 공유 레이트 리미터를 거치도록 감쌈
+            self._notion = ThrottledNotionClient(create_notion_client())
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def submit(self, page_ids, output_name="My_Portfolio", optimize_preset=None, children=False):
+        """작업을 등록하고 바로 반환합니다. 실행은 작업 루프에서 차례로 진행됩니다."""
+        job = ExportJob(page_ids, self.output_dir, output_name, optimize_preset, children)
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+            self._prune_finished()
+        asyncio.run_coroutine_threadsafe(self._run_job(job), self._loop)
+        return job
+
+    def get(self, job_id):
+        with self._jobs_lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self._jobs_lock:
+            return list(self.jobs.values())
+
+    def _prune_finished(self):
+        finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.finished_at)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
+            shutil.rmtree(os.path.dirname(job.output_path), ignore_errors=True)
+            if job.trace_path:
+                try:
+                    os.remove(job.trace_path)
+                except OSError:
+                    pass
+
+    def _update(self, job, **changes):
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.version += 1
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait_for_change(self, job, version, timeout):
+        """job.version이 version과 달라지거나 timeout초가 지날 때까지 기다립니다 (요청 스레드에서 호출)."""
+        with self._changed:
+            self._changed.wait_for(lambda: job.version != version, timeout)
+
+    async def _run_job(self, job):
+        from exporter import export_and_merge_pdf
+        from export_manifest import ExportManifest
+        from watch import expand_first_children
+        async with self._job_slots:
+            self._update(job, status=STATUS_RUNNING, started_at=time.time())
+            tracer = Tracer(f"job {job.id}")
+
+            def progress(current, total):
+                # 내보내기 중 호출되며 모두 같은 루프 스레드
+                self._update(job, current=current, total=total)
+
+            try:
+                with use_tracer(tracer):
+                    page_ids = job.page_ids
+                    if job.children:
+                        page_ids = await expand_first_children(self._notion, page_ids)
+                    os.makedirs(os.path.dirname(job.output_path), exist_ok=True)
+                    manifest = ExportManifest.open(page_ids, job.output_path)
+                    result = await export_and_merge_pdf(page_ids, job.output_path, progress, notion_client=self._notion,
+                                                        optimize_preset=job.optimize_preset, manifest=manifest)
+                summary = tracer.format_summary()
+                try:
+                    # 작업 목록에서 빠질 때(_prune_finished) 결과 PDF와 함께 지움
+                    job.trace_path = tracer.write(os.path.join(TRACE_DIR, f"server_{job.id}.json"))
+                    summary += f"\n트레이스 파일: {os.path.abspath(job.trace_path)}"
+                except OSError as e:
+                    summary += f"\n트레이스 저장 실패: {e}"
+                if result is None:
+                    self._update(job, status=STATUS_FAILED, error="성공한 페이지가 없습니다",
+                                 failures=manifest.format_failure_report() or None, summary=summary, finished_at=time.time())
+                else:
+                    self._update(job, status=STATUS_DONE, result_path=result,
+                                 failures=manifest.format_failure_report() or None, summary=summary, finished_at=time.time())
+            except Exception as e:
+                print(f"내보내기 작업 오류 ({job.id}): {e}")
+                self._update(job, status=STATUS_FAILED, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+
+class _ServerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "NotionExportServer/1"
+    # 진행 스트림에서 변화가 없을 때 연결 유지용 주석을 보내는 간격 (초)
+    stream_heartbeat = 15
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def export_server(self):
+        return self.server.export_server
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.export_server.token
+        given = self.headers.get("Authorization") or ""
+        if not token or hmac.compare_digest(given.encode(), f"Bearer {token}".encode()):
+            return True
+        self._send_json(401, {"error": "인증 토큰이 올바르지 않습니다"})
+        return False
+
+    def _job_or_404(self, job_id):
+        job = self.export_server.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"작업을 찾을 수 없습니다: {job_id}"})
+        return job
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        parts = [part for part in urlsplit(self.path).path.split("/") if part]
+        if parts == ["health"]:
+            jobs = self.export_server.list_jobs()
+            from optional_packages import missing_optional_packages
+            self._send_json(200, {"status": "ok", "jobs": len(jobs),
+                                  "running": sum(job.status == STATUS_RUNNING for job in jobs),
+                                  "fallbacks": [f"{package}: {fallback}" for package, fallback in missing_optional_packages()]})
+        elif parts == ["jobs"]:
+            self._send_json(200, {"jobs": [job.as_dict() for job in self.export_server.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._send_json(200, job.as_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._stream_events(job)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "download":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._send_file(job)
+        else:
+            self._send_json(404, {"error": f"지원하지 않는 요청: GET {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if not self._authorized():
+            return
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": f"지원하지 않는 요청: POST {self.path}"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다")
+            page_ids = request["page_ids"]
+            if not isinstance(page_ids, list) or not page_ids or not all(isinstance(i, str) for i in page_ids):
+                raise ValueError("page_ids는 페이지 ID 문자열 목록이어야 합니다")
+            output_name = request.get("output_name")
+            if output_name is not None and not isinstance(output_name, str):
+                raise ValueError("output_name은 문자열이어야 합니다")
+            optimize = request.get("optimize")
+            if optimize is not None:
+                from pdf_optimize import PRESETS
+                if optimize not in PRESETS:
+                    raise ValueError(f"optimize는 {', '.join(sorted(PRESETS))} 중 하나이거나 null이어야 합니다")
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"잘못된 요청: {e}"})
+            return
+        job = self.export_server.submit(page_ids, output_name, optimize, bool(request.get("children")))
+        self._send_json(202, job.as_dict())
+
+    def _stream_events(self, job):
+        # 길이를 모르는 응답이므로 스트림이 끝나면 연결을 닫음
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        version = None
+        try:
+            while True:
+                if job.version != version:
+                    version = job.version
+                    event = "done" if job.finished else "progress"
+                    data = json.dumps(job.as_dict(), ensure_ascii=False)
+                    self.wfile.write(f"event: {event}\ndata: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    if job.finished:
+                        return
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                self.export_server.wait_for_change(job, version, self.stream_heartbeat)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_file(self, job):
+        if job.status != STATUS_DONE or not job.result_path:
+            self._send_json(409, {"error": f"아직 내려받을 수 없습니다 (상태: {job.status})"})
+            return
+        try:
+            size = os.path.getsize(job.result_path)
+            f = open(job.result_path, "rb")
+        except OSError:
+            self._send_json(410, {"error": "결과 파일이 삭제되었습니다"})
+            return
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(size))
+            self.send_header("Content-Disposition", _content_disposition(os.path.basename(job.result_path)))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+def _content_disposition(filename):
+    """헤더는 latin-1만 보낼 수 있으므로 ASCII 대체 이름과 UTF-8 이름(RFC 6266 filename*)을 함께 보냅니다."""
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    fallback = fallback.replace('"', "_").replace("\\", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 사람이 함께 쓰는 내보내기 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--jobs", type=int, default=SERVER_MAX_CONCURRENT_JOBS, help="동시에 실행할 작업 수")
+    parser.add_argument("--output-dir", default=SERVER_OUTPUT_DIR)
+    parser.add_argument("--token", default=os.getenv("EXPORT_SERVER_TOKEN"), help="요청에 필요한 인증 토큰")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    if not os.getenv("NOTION_API_KEY"):
+        print("NOTION_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
+        return 1
+    server = ExportServer(args.host, args.port, args.output_dir, args.jobs, token=args.token or None)
+    print(f"내보내기 서버: {server.url} (동시 작업 {args.jobs}개, Ctrl+C로 종료)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
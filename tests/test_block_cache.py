@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from block_cache import BlockCache
+from block_model import Block
+
+def iso(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def image(expiry=None):
+    attrs = {"url": "https://files.example/a.png?sig"}
+    if expiry:
+        attrs["expiry"] = expiry
+    return Block("image", attrs=attrs)
+
+def test_entry_is_checked_against_last_edited_time(tmp_path):
+    cache = BlockCache(str(tmp_path))
+    cache.put("p1", (Block("paragraph"),), "t1")
+    assert cache.get("p1", "t1") is not None
+    assert cache.get("p1", "t2") is None
+    # 디스크에서 다시 읽어도 같음
+    assert BlockCache(str(tmp_path)).get("p1", "t1")[0].type == "paragraph"
+
+def test_entry_with_expiring_file_url_is_stale(tmp_path):
+    clock = FakeClock(1_000_000)
+    cache = BlockCache(str(tmp_path), margin=600, clock=clock)
+    cache.put("p1", (Block("paragraph"), image(iso(clock.now + 3600))), "t1")
+    assert cache.get("p1", "t1") is not None
+    # 만료 10분 전부터는 다시 가져오도록 없는 것으로 봄
+    clock.now += 3600 - 600
+    assert cache.get("p1", "t1") is None
+    assert BlockCache(str(tmp_path), margin=600, clock=clock).get("p1", "t1") is None
+
+def test_external_images_never_expire(tmp_path):
+    clock = FakeClock(1_000_000)
+    cache = BlockCache(str(tmp_path), clock=clock)
+    cache.put("p1", (image(),), "t1")
+    clock.now += 365 * 86400
+    assert cache.get("p1", "t1") is not None
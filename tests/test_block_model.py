@@ -0,0 +1,90 @@
+import json
+from block_model import (Block, Span, BOLD, CODE, ITALIC, blocks_from_json, blocks_from_notion, blocks_to_json,
+                         earliest_expiry, iter_blocks)
+
+def rich_text(text, href=None, color="default", **annotations):
+    return {"plain_text": text, "href": href, "annotations": {"color": color, **annotations}}
+
+def notion_block(block_id, block_type, payload, has_children=False):
+    return {"id": block_id, "type": block_type, block_type: payload, "has_children": has_children,
+            "created_time": "2026-01-01T00:00:00.000Z", "last_edited_by": {"object": "user", "id": "u"}}
+
+def assert_same(a, b):
+    assert (a.type, a.text, a.attrs, a.id) == (b.type, b.text, b.attrs, b.id)
+    assert (a.children is None) == (b.children is None)
+    for child_a, child_b in zip(a.children or (), b.children or ()):
+        assert_same(child_a, child_b)
+    assert len(a.children or ()) == len(b.children or ())
+
+def test_span_trims_trailing_defaults():
+    assert Span("plain").to_json() == ["plain"]
+    assert Span("bold", flags=BOLD).to_json() == ["bold", BOLD]
+    assert Span("red", color="red").to_json() == ["red", 0, "red"]
+    assert Span("link", href="https://example.com").to_json() == ["link", 0, "default", "https://example.com"]
+
+def test_span_round_trip():
+    for span in (Span("a"), Span("b", flags=BOLD | ITALIC), Span("c", color="blue_background"),
+                 Span("d", "https://example.com", CODE, "gray")):
+        assert Span.from_json(json.loads(json.dumps(span.to_json()))) == span
+
+def test_span_from_notion_flags():
+    span = Span.from_notion(rich_text("x", bold=True, code=True, italic=False))
+    assert span.bold and span.code and not span.italic
+    assert span.flags == BOLD | CODE
+
+def test_block_trims_trailing_defaults():
+    # 텍스트도 값도 하위 블록도 없는 블록은 종류만 남음
+    assert Block("divider").to_json() == ["divider"]
+    paragraph = Block.from_notion(notion_block("p1", "paragraph", {"rich_text": [rich_text("hi")]}))
+    assert paragraph.to_json() == ["paragraph", [["hi"]]]
+    # 하위 블록을 아직 가져오지 않았으면 children 자리에 null, id 유지
+    toggle = Block.from_notion(notion_block("t1", "toggle", {"rich_text": []}, has_children=True))
+    assert toggle.children is None
+    assert toggle.to_json() == ["toggle", [], 0, None, "t1"]
+
+def test_block_drops_ids_it_does_not_need():
+    paragraph = Block.from_notion(notion_block("p1", "paragraph", {"rich_text": []}))
+    child_page = Block.from_notion(notion_block("c1", "child_page", {"title": "Sub"}))
+    assert paragraph.id is None
+    assert child_page.id == "c1" and child_page.attr("title") == "Sub"
+
+def test_blocks_round_trip():
+    image = notion_block("i1", "image", {"type": "file", "file": {"url": "https://example.com/a.png"},
+                                          "caption": [rich_text("cap", italic=True)]})
+    table_row = notion_block("r1", "table_row", {"cells": [[rich_text("a")], [], [rich_text("b", bold=True)]]})
+    table = Block.from_notion(notion_block("tb", "table", {"has_column_header": True}, has_children=True),
+                              children=[Block.from_notion(table_row)])
+    blocks = (
+        Block.from_notion(notion_block("h", "heading_1", {"rich_text": [rich_text("Title", color="red")]})),
+        Block.from_notion(notion_block("c", "code", {"rich_text": [rich_text("x = 1")], "language": "python"})),
+        Block.from_notion(notion_block("co", "callout", {"rich_text": [], "icon": {"type": "emoji", "emoji": "💡"},
+                                                         "color": "gray_background"})),
+        Block.from_notion(image),
+        table,
+        *blocks_from_notion([notion_block("t", "toggle", {"rich_text": []}, has_children=True)]),
+    )
+    data = json.loads(json.dumps(blocks_to_json(blocks)))
+    restored = blocks_from_json(data)
+    assert len(restored) == len(blocks)
+    for original, copy in zip(blocks, restored):
+        assert_same(original, copy)
+    # Span 튜플 값도 그대로 복원됨
+    assert restored[3].attr("caption") == (Span("cap", flags=ITALIC),)
+    assert restored[4].children[0].attr("cells")[2] == (Span("b", flags=BOLD),)
+
+def test_iter_blocks_is_depth_first():
+    tree = (Block("a", children=(Block("b", children=(Block("c"),)), Block("d"))), Block("e", children=None))
+    assert [block.type for block in iter_blocks(tree)] == ["a", "b", "c", "d", "e"]
+
+def test_hosted_image_keeps_url_expiry():
+    hosted = Block.from_notion(notion_block("i1", "image", {
+        "type": "file", "file": {"url": "https://files.example/a.png?sig", "expiry_time": "2026-01-01T01:00:00.000Z"}}))
+    external = Block.from_notion(notion_block("i2", "image", {"type": "external", "external": {"url": "https://example.com/b.png"}}))
+    assert hosted.attr("expiry") == "2026-01-01T01:00:00.000Z"
+    assert external.attr("expiry") is None
+    restored = blocks_from_json(json.loads(json.dumps(blocks_to_json((hosted, external)))))
+    assert restored[0].attr("expiry") == "2026-01-01T01:00:00.000Z"
+    nested = (Block("toggle", children=(hosted, Block.from_notion(notion_block("i3", "image", {
+        "type": "file", "file": {"url": "u", "expiry_time": "2026-01-01T00:30:00.000Z"}})))), external)
+    assert earliest_expiry(nested) == "2026-01-01T00:30:00.000Z"
+    assert earliest_expiry((external,)) is None
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import asyncio
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+import exporter
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.workspace import generate_workspace
+from block_cache import BlockCache, set_block_cache
+from export_manifest import ExportManifest, STATUS_DONE, STATUS_PENDING, prune_jobs
+from page_cache import PageCache, set_page_cache
+
+def write_pdf(path):
+    writer = PdfWriter()
+    writer.add_blank_page(100, 100)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+@pytest.fixture
+def export_env(tmp_path, monkeypatch):
+    """픽스처 클라이언트와, 렌더링 대신 빈 PDF를 쓰고 렌더링한 페이지 인덱스를 기록하는 내보내기 파이프라인."""
+    fixture = generate_workspace(2, 2, 3)
+    client = FixtureNotionClient(fixture)
+    set_block_cache(BlockCache(str(tmp_path / "blocks")))
+    set_page_cache(PageCache())
+    rendered = []
+    failing = set()
+
+    async def fake_pipeline(notion, page_ids, pending, variants, job_dirs, on_done, on_failed, pressure_check=None,
+                            timings=None, edited_times=None):
+        for idx, variant_indexes in pending:
+            page = await notion.pages.retrieve(page_id=page_ids[idx])
+            if page_ids[idx] in failing:
+                on_failed(idx, variant_indexes, RuntimeError("boom"))
+                continue
+            edited_times[page_ids[idx]] = page["last_edited_time"]
+            for variant_index in variant_indexes:
+                rendered.append(idx)
+                on_done(idx, variant_index, write_pdf(os.path.join(job_dirs[variant_index], f"page_{idx}.pdf")))
+
+    monkeypatch.setattr(exporter, "run_export_pipeline", fake_pipeline)
+    yield fixture, client, rendered, failing
+    set_page_cache(PageCache())
+
+def edit_page(fixture, client, page_id, edited):
+    fixture["pages"][page_id]["last_edited_time"] = edited
+    client._encoded["pages"][page_id] = json.dumps(fixture["pages"][page_id], ensure_ascii=False)
+    set_page_cache(PageCache())
+
+def export(page_ids, output_path, client, base_dir, keep_artifacts=False):
+    manifest = ExportManifest.open(page_ids, output_path, base_dir=str(base_dir))
+    result = asyncio.run(exporter.export_and_merge_pdf(page_ids, output_path, notion_client=client, manifest=manifest,
+                                                       keep_artifacts=keep_artifacts))
+    return result, manifest
+
+def test_resume_renders_only_failed_pages(tmp_path, export_env):
+    fixture, client, rendered, failing = export_env
+    page_ids = list(fixture["pages"])[:5]
+    output_path = str(tmp_path / "out.pdf")
+    failing.update(page_ids[1:3])
+
+    result, manifest = export(page_ids, output_path, client, tmp_path / "jobs")
+    assert sorted(rendered) == [0, 3, 4]
+    assert len(PdfReader(result).pages) == 3
+    assert [idx for idx, _, _ in manifest.failures()] == [1, 2]
+    assert os.path.exists(manifest.path)
+
+    rendered.clear()
+    failing.clear()
+    result, manifest = export(page_ids, output_path, client, tmp_path / "jobs")
+    assert sorted(rendered) == [1, 2]
+    assert len(PdfReader(result).pages) == 5
+    # 모두 성공하면 작업 폴더를 지움
+    assert not os.path.exists(manifest.job_dir)
+
+def test_resume_rerenders_pages_edited_since_checkpoint(tmp_path, export_env):
+    fixture, client, rendered, _ = export_env
+    page_ids = list(fixture["pages"])[:4]
+    output_path = str(tmp_path / "out.pdf")
+
+    _, manifest = export(page_ids, output_path, client, tmp_path / "jobs", keep_artifacts=True)
+    assert all(entry["last_edited_time"] for entry in manifest.pages)
+
+    rendered.clear()
+    edit_page(fixture, client, page_ids[2], "2099-01-01T00:00:00.000Z")
+    _, manifest = export(page_ids, output_path, client, tmp_path / "jobs", keep_artifacts=True)
+    assert rendered == [2]
+    assert manifest.pages[2]["last_edited_time"] == "2099-01-01T00:00:00.000Z"
+
+    rendered.clear()
+    _, manifest = export(page_ids, output_path, client, tmp_path / "jobs", keep_artifacts=True)
+    assert rendered == []
+
+def test_missing_artifact_is_pending(tmp_path):
+    manifest = ExportManifest.open(["a", "b"], str(tmp_path / "out.pdf"), base_dir=str(tmp_path))
+    os.makedirs(manifest.job_dir)
+    manifest.mark_done(0, write_pdf(os.path.join(manifest.job_dir, "a.pdf")), "t1")
+    manifest.mark_done(1, write_pdf(os.path.join(manifest.job_dir, "b.pdf")), "t1")
+    os.remove(manifest.pages[1]["artifact"])
+
+    reopened = ExportManifest.open(["a", "b"], str(tmp_path / "out.pdf"), base_dir=str(tmp_path))
+    assert reopened.pending_indexes() == [1]
+    assert reopened.pages[0]["last_edited_time"] == "t1"
+
+def test_drop_stale_removes_artifact(tmp_path):
+    manifest = ExportManifest.open(["a", "b", "c"], str(tmp_path / "out.pdf"), base_dir=str(tmp_path))
+    os.makedirs(manifest.job_dir)
+    for idx, page_id in enumerate("abc"):
+        manifest.mark_done(idx, write_pdf(os.path.join(manifest.job_dir, f"{page_id}.pdf")), "t1")
+    artifact = manifest.pages[1]["artifact"]
+
+    # c는 현재 수정 시각을 모르므로 그대로 둠
+    assert manifest.drop_stale({"a": "t1", "b": "t2"}) == 1
+    assert not os.path.exists(artifact)
+    assert [entry["status"] for entry in manifest.pages] == [STATUS_DONE, STATUS_PENDING, STATUS_DONE]
+    assert manifest.pending_indexes() == [1]
+
+def test_page_list_or_output_change_starts_a_new_job(tmp_path):
+    base_dir = str(tmp_path)
+    first = ExportManifest.open(["a", "b"], "out.pdf", base_dir=base_dir)
+    assert first.job_id != ExportManifest.open(["b", "a"], "out.pdf", base_dir=base_dir).job_id
+    assert first.job_id != ExportManifest.open(["a", "b"], "other.pdf", base_dir=base_dir).job_id
+    assert first.job_id == ExportManifest.open(["a", "b"], "out.pdf", base_dir=base_dir).job_id
+
+def test_prune_jobs_by_age_and_count(tmp_path):
+    now = time.time()
+    for i in range(5):
+        job_dir = tmp_path / f"job{i}"
+        job_dir.mkdir()
+        manifest_path = job_dir / "manifest.json"
+        manifest_path.write_text("{}")
+        os.utime(manifest_path, (now - i * 3 * 86400,) * 2)
+    # 매니페스트가 없는 폴더는 작업 폴더가 아니므로 건드리지 않음
+    (tmp_path / "other").mkdir()
+
+    assert prune_jobs(str(tmp_path), max_age_days=7, max_count=4, now=now) == 2
+    assert sorted(os.listdir(tmp_path)) == ["job0", "job1", "job2", "other"]
+    # 지금 여는 작업은 개수에 포함하되 지우지 않음
+    assert prune_jobs(str(tmp_path), max_age_days=7, max_count=2, keep="job2", now=now) == 1
+    assert sorted(os.listdir(tmp_path)) == ["job0", "job2", "other"]
@@ -0,0 +1,23 @@
+import asyncio
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.workspace import generate_workspace
+from notion_api import get_first_child_page_ids, retrieve_children_of
+from page_cache import PageCache, set_page_cache
+
+def test_retrieve_children_of_matches_per_parent_order():
+    fixture = generate_workspace(2, 3, 2)
+    parents = list(fixture["pages"])[:4]
+    client = FixtureNotionClient(fixture)
+    set_page_cache(PageCache())
+
+    async def run():
+        expected = {pid: await get_first_child_page_ids(pid, client) for pid in parents}
+        children = await retrieve_children_of(client, parents + parents[:1])
+        return expected, children
+
+    expected, children = asyncio.run(run())
+    assert list(children) == parents
+    assert any(expected.values())
+    assert {pid: [page.id for page in pages] for pid, pages in children.items()} == expected
+    # 부모가 여럿이어도 자식 페이지는 한 번씩만 조회
+    assert client.calls["pages.retrieve"] == len({cid for ids in expected.values() for cid in ids})
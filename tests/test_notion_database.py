@@ -0,0 +1,58 @@
+import json
+import asyncio
+import pytest
+import notion_database
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.workspace import generate_workspace
+from block_cache import BlockCache, set_block_cache
+from exporter import fetch_page_source
+from page_cache import PageCache, set_page_cache
+
+@pytest.fixture
+def database_env(tmp_path):
+    fixture = generate_workspace(2, 2, 3, database_rows=3)
+    set_block_cache(BlockCache(str(tmp_path / "blocks")))
+    notion_database.set_database_cache(notion_database.create_database_cache(str(tmp_path / "databases")))
+    set_page_cache(PageCache())
+    yield fixture, FixtureNotionClient(fixture)
+    set_page_cache(PageCache())
+
+def update(client, kind, obj):
+    client.fixture[kind][obj["id"]] = obj
+    client._encoded[kind][obj["id"]] = json.dumps(obj, ensure_ascii=False)
+
+def first_text_block(fixture, page_id):
+    for block_id in fixture["children"][page_id]:
+        block = fixture["blocks"][block_id]
+        if block[block["type"]].get("rich_text"):
+            return block
+    raise AssertionError("텍스트 블록이 없는 픽스처 페이지")
+
+def test_cached_table_does_not_hide_row_edits(database_env):
+    fixture, client = database_env
+    database_id = next(iter(fixture["databases"]))
+
+    async def run():
+        table = await notion_database.get_database_table(client, database_id)
+        row_id = table["rows"][0]["page"]["id"]
+        await fetch_page_source(client, row_id)
+
+        # 행 본문만 고침: 행의 last_edited_time은 바뀌고 데이터베이스의 last_edited_time은 그대로
+        block = first_text_block(fixture, row_id)
+        block[block["type"]]["rich_text"][0]["plain_text"] = "고친 문단"
+        update(client, "blocks", block)
+        row = dict(fixture["pages"][row_id], last_edited_time="2099-01-01T00:00:00.000Z")
+        update(client, "pages", row)
+        # 앱을 다시 켜거나 페이지 캐시 TTL이 지난 상황
+        set_page_cache(PageCache())
+        client.calls.clear()
+
+        cached = await notion_database.get_database_table(client, database_id)
+        assert client.calls["data_sources.query"] == 0
+        assert [r["page"]["id"] for r in cached["rows"]] == [r["page"]["id"] for r in table["rows"]]
+        _, blocks = await fetch_page_source(client, row_id)
+        assert client.calls["pages.retrieve"] == 1
+        return blocks
+
+    blocks = asyncio.run(run())
+    assert any(span.text == "고친 문단" for block in blocks for span in block.text)
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import pytest
+from benchmarks.fixture_client import FixtureNotionClient
+from benchmarks.workspace import generate_workspace
+from page_cache import PageCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def workspace():
+    fixture = generate_workspace(2, 2, 3)
+    return fixture, list(fixture["pages"])
+
+def test_concurrent_gets_share_one_request(workspace):
+    fixture, page_ids = workspace
+    client = FixtureNotionClient(fixture, latency_ms=30)
+    cache = PageCache()
+
+    async def run():
+        return await asyncio.gather(*(cache.retrieve(client, page_ids[0]) for _ in range(10)))
+
+    pages = asyncio.run(run())
+    assert client.calls["pages.retrieve"] == 1
+    assert {page.id for page in pages} == {page_ids[0]}
+
+def test_concurrent_gets_from_other_threads_share_one_request(workspace):
+    fixture, page_ids = workspace
+    client = FixtureNotionClient(fixture, latency_ms=50)
+    cache = PageCache()
+    results = []
+    start = threading.Barrier(4)
+
+    def worker():
+        start.wait()
+        # 스레드마다 자기 이벤트 루프에서 요청
+        results.append(asyncio.run(cache.retrieve(client, page_ids[1])))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.calls["pages.retrieve"] == 1
+    assert len(results) == 4 and all(page.id == page_ids[1] for page in results)
+
+def test_failed_request_is_not_cached(workspace):
+    fixture, _ = workspace
+    client = FixtureNotionClient(fixture, latency_ms=20)
+    cache = PageCache()
+
+    async def run():
+        return await asyncio.gather(*(cache.retrieve(client, "missing") for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, KeyError) for error in errors)
+    assert client.calls["pages.retrieve"] == 1
+    with pytest.raises(KeyError):
+        asyncio.run(cache.retrieve(client, "missing"))
+    assert client.calls["pages.retrieve"] == 2
+
+def test_entries_expire_after_ttl(workspace):
+    fixture, page_ids = workspace
+    client = FixtureNotionClient(fixture)
+    clock = FakeClock()
+    cache = PageCache(ttl=30, clock=clock)
+
+    asyncio.run(cache.retrieve(client, page_ids[0]))
+    clock.now = 29
+    asyncio.run(cache.retrieve(client, page_ids[0]))
+    assert client.calls["pages.retrieve"] == 1
+    clock.now = 31
+    assert cache.get(page_ids[0]) is None
+    asyncio.run(cache.retrieve(client, page_ids[0]))
+    assert client.calls["pages.retrieve"] == 2
+
+def test_seeded_pages_skip_the_request(workspace):
+    fixture, page_ids = workspace
+    client = FixtureNotionClient(fixture)
+    cache = PageCache()
+    cache.seed(fixture["pages"].values())
+    page = asyncio.run(cache.retrieve(client, page_ids[2]))
+    assert page.id == page_ids[2]
+    assert client.calls["pages.retrieve"] == 0
+
+def test_oldest_entries_are_evicted(workspace):
+    fixture, page_ids = workspace
+    cache = PageCache(max_entries=2)
+    for page_id in page_ids[:3]:
+        cache.put(fixture["pages"][page_id])
+    assert cache.get(page_ids[0]) is None
+    assert cache.get(page_ids[1]) is not None and cache.get(page_ids[2]) is not None
@@ -0,0 +1,39 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, QModelIndex
+from page_tree_model import ROOT, PageIndex, PageTreeModel
+from utils import PageMeta
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+def test_moved_page_survives_old_parent_refresh():
+    index = PageIndex()
+    a, b, x, y = (index.add(page_id, page_id.upper()) for page_id in ("a", "b", "x", "y"))
+    index.set_children(ROOT, [a, b])
+    index.set_children(a, [x, y])
+    # x가 A에서 B로 이동: B 새로고침이 먼저 도착
+    index.set_children(b, [x])
+    assert index.children[a] == [y]
+    assert index.rows[y] == 0
+    assert index.parents[x] == b
+    # 뒤이은 A 새로고침이 옮겨 간 x를 떼어내면 안 됨
+    index.set_children(a, [y])
+    assert index.node_of["x"] == x
+    assert index.titles[x] == "X"
+    assert index.children[b] == [x]
+
+def test_model_removes_moved_row_from_old_parent(app):
+    model = PageTreeModel()
+    model.reset_roots([PageMeta("a", "A"), PageMeta("b", "B")])
+    model.fetchMore(QModelIndex())
+    model.set_children("a", [PageMeta("x", "X", "page_id", "a"), PageMeta("y", "Y", "page_id", "a")])
+    a_index = model.index_for_id("a")
+    model.fetchMore(a_index)
+    assert model.rowCount(a_index) == 2
+    model.set_children("b", [PageMeta("x", "X", "page_id", "b")])
+    assert model.rowCount(a_index) == 1
+    assert model.page_id(model.index(0, 0, a_index)) == "y"
+    b_index = model.index_for_id("b")
+    model.fetchMore(b_index)
+    assert model.page_id(model.index(0, 0, b_index)) == "x"
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from render_worker import RenderWorkerError, RenderWorkerPool
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, content=b""):
+        self.status_code = status_code
+        self._body = body or {}
+        self.content = content
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+class StubClient:
+    """httpx.AsyncClient의 get/post 대신 워커 URL별로 정한 응답을 돌려줍니다.
+    workers: {URL: {"slots": n, "health": 상태 코드 또는 예외, "render": 상태 코드 또는 예외}}"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.renders = []
+
+    def _respond(self, url, kind):
+        worker = self.workers[url]
+        result = worker.get(kind, 200)
+        if isinstance(result, Exception):
+            raise result
+        if kind == "health":
+            return FakeResponse(result, {"status": "ok", "slots": worker.get("slots", 1)})
+        if result == 200:
+            return FakeResponse(200, content=b"%PDF-" + url.encode())
+        return FakeResponse(result, {"error": "stub error"})
+
+    async def get(self, url, headers=None, timeout=None):
+        return self._respond(url.rsplit("/health", 1)[0], "health")
+
+    async def post(self, url, json=None, headers=None, timeout=None):
+        worker_url = url.rsplit("/render", 1)[0]
+        self.renders.append(worker_url)
+        return self._respond(worker_url, "render")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+A, B, C = "http://a:9100", "http://b:9100", "http://c:9100"
+
+def render(pool, client, pdf_path):
+    return asyncio.run(pool.render(client, "<p>page</p>", str(pdf_path)))
+
+def test_health_check_sets_capacity():
+    client = StubClient({A: {"slots": 2}, B: {"slots": 3}, C: {"health": ConnectionError("refused")}})
+    pool = RenderWorkerPool([A, B, C])
+    assert asyncio.run(pool.check_health(client)) == 2
+    assert pool.capacity == 5
+    assert [worker.healthy for worker in pool.workers] == [True, True, False]
+
+def test_connection_error_fails_over_to_another_worker(tmp_path):
+    client = StubClient({A: {"render": ConnectionError("reset")}, B: {}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+
+    path = render(pool, client, tmp_path / "page.pdf")
+    assert client.renders == [A, B]
+    assert open(path, "rb").read() == b"%PDF-" + B.encode()
+    # 연결이 끊긴 워커는 제외되어 다음 페이지는 바로 B로 감
+    assert [worker.healthy for worker in pool.workers] == [False, True]
+    render(pool, client, tmp_path / "next.pdf")
+    assert client.renders == [A, B, B]
+
+def test_render_error_retries_elsewhere_but_keeps_worker(tmp_path):
+    client = StubClient({A: {"render": 500}, B: {}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+
+    render(pool, client, tmp_path / "page.pdf")
+    assert client.renders == [A, B]
+    assert all(worker.healthy for worker in pool.workers)
+
+def test_busy_worker_is_marked_down(tmp_path):
+    client = StubClient({A: {"render": 503}, B: {}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+    render(pool, client, tmp_path / "page.pdf")
+    assert [worker.healthy for worker in pool.workers] == [False, True]
+
+def test_bad_request_is_not_retried(tmp_path):
+    client = StubClient({A: {"render": 401}, B: {"render": 401}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+    with pytest.raises(RenderWorkerError):
+        render(pool, client, tmp_path / "page.pdf")
+    assert len(client.renders) == 1
+
+def test_all_workers_failing_raises(tmp_path):
+    client = StubClient({A: {"render": ConnectionError("reset")}, B: {"render": 500}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+    with pytest.raises(RenderWorkerError, match="렌더링을 맡길 워커가 없습니다"):
+        render(pool, client, tmp_path / "page.pdf")
+    assert sorted(client.renders) == [A, B]
+    assert all(worker.active == 0 for worker in pool.workers)
+
+def test_down_worker_is_rechecked_after_delay(tmp_path):
+    clock = FakeClock()
+    client = StubClient({A: {"health": ConnectionError("refused")}, B: {"render": 500}})
+    pool = RenderWorkerPool([A, B], recheck_after=30, clock=clock)
+    asyncio.run(pool.check_health(client))
+    assert pool.capacity == 1
+
+    # A가 다시 살아나도 recheck_after가 지나기 전에는 쓰지 않음
+    client.workers[A] = {}
+    with pytest.raises(RenderWorkerError):
+        render(pool, client, tmp_path / "page.pdf")
+    assert client.renders == [B]
+
+    clock.now = 31
+    render(pool, client, tmp_path / "page.pdf")
+    assert client.renders == [B, B, A]
+    assert pool.workers[0].healthy
+
+def test_least_loaded_worker_is_picked_first(tmp_path):
+    client = StubClient({A: {"slots": 1}, B: {"slots": 4}})
+    pool = RenderWorkerPool([A, B])
+    asyncio.run(pool.check_health(client))
+    pool.workers[0].active = 1
+    render(pool, client, tmp_path / "page.pdf")
+    assert client.renders == [B]
@@ -0,0 +1,58 @@
+import pytest
+from search_index import PageSearchIndex, choseong, decompose, normalize
+
+@pytest.fixture
+def index():
+    index = PageSearchIndex()
+    index.add("p1", "프로젝트 회고")
+    index.add("p2", "개인 프로젝트")
+    index.add("p3", "Project Notes")
+    index.add("p4", "✅ 숨긴 프로필", hidden=True)
+    index.add("p5", "포트폴리오 2024")
+    return index
+
+def test_choseong():
+    assert choseong("프로젝트") == "ㅍㄹㅈㅌ"
+    assert choseong("포트폴리오 2024") == "ㅍㅌㅍㄹㅇ 2024"
+
+def test_normalize_is_case_and_form_insensitive():
+    assert normalize("  PROJECT ") == "project"
+    assert normalize(decompose("프로젝트")) == "프로젝트"
+
+def test_substring_and_prefix_order(index):
+    # 접두어 일치(p1)가 중간 일치(p2)보다 먼저
+    assert index.search("프로젝트") == ["p1", "p2"]
+    assert index.search("회고") == ["p1"]
+    assert index.search("project") == ["p3"]
+    assert index.search("notes") == ["p3"]
+
+def test_choseong_query(index):
+    assert index.search("ㅍㄹㅈㅌ") == ["p1", "p2"]
+    assert index.search("ㅍㅌㅍㄹㅇ") == ["p5"]
+    # 초성과 숫자가 섞인 입력
+    assert index.search("ㅍㅌㅍㄹㅇ 20") == ["p5"]
+
+def test_partial_last_syllable(index):
+    # 마지막 글자를 조합하는 중인 입력도 일치
+    assert index.search("프로제") == ["p1", "p2"]
+    assert index.search("프로ㅈ") == ["p1", "p2"]
+    assert index.search("포ㅌ") == ["p5"]
+
+def test_hidden_pages(index):
+    assert index.search("프로") == ["p1", "p2", "p4"]
+    assert index.search("프로", include_hidden=False) == ["p1", "p2"]
+    assert index.is_hidden("p4") and not index.is_hidden("p1")
+
+def test_updates_are_visible_to_the_next_search(index):
+    assert index.search("회고") == ["p1"]
+    index.add("p1", "프로젝트 계획")
+    index.remove("p2")
+    index.add("p6", "회고 모음")
+    assert index.search("회고") == ["p6"]
+    assert index.search("프로젝트") == ["p1"]
+    assert "p2" not in index and len(index) == 5
+
+def test_limit_and_empty_query(index):
+    assert index.search("프로", limit=2) == ["p1", "p2"]
+    assert index.search("   ") == []
+    assert index.search("없는 제목") == []
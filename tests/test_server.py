@@ -0,0 +1,12 @@
+from server import ExportJob, _content_disposition
+
+def test_output_name_drops_control_characters(tmp_path):
+    job = ExportJob(["p1"], str(tmp_path), 'report"\r\nSet-Cookie: a=b')
+    assert "\r" not in job.output_path and "\n" not in job.output_path
+    assert job.output_path.endswith('report"Set-Cookie: a=b.pdf')
+
+def test_content_disposition_is_latin1_safe():
+    header = _content_disposition('포트폴리오 "최종".pdf')
+    header.encode("latin-1")
+    assert header == ('attachment; filename="_____ ____.pdf"; '
+                      "filename*=UTF-8''%ED%8F%AC%ED%8A%B8%ED%8F%B4%EB%A6%AC%EC%98%A4%20%22%EC%B5%9C%EC%A2%85%22.pdf")
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+
+# 내보내기 작업 단위로 설정되는 현재 트레이서 (asyncio 태스크에 자동 전파)
+_current_tracer = contextvars.ContextVar("current_tracer", default=None)
+
+class Tracer:
+    """구간(span)과 카운터를 기록해 Chrome trace-event JSON으로 저장합니다.
+    chrome://tracing 또는 https://ui.perfetto.dev 에서 열 수 있습니다.
+    """
+
+    def __init__(self, name="export"):
+        self.name = name
+        self.events = []
+        self.counters = {}
+        self.metadata = {}
+        self.summary_sections = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _lane(self):
+        # 동시에 실행되는 asyncio 태스크를 서로 다른 행(tid)으로 표시
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    @contextmanager
+    def span(self, name, cat="export", **args):
+        """구간을 기록합니다. yield된 dict에 값을 넣으면 이벤트 args로 저장됩니다."""
+        tid = self._lane()
+        start = self._now_us()
+        try:
+            yield args
+        finally:
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": tid,
+                "ts": round(start, 1), "dur": round(self._now_us() - start, 1),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+
+    def count(self, name, value=1):
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.events.append({
+                "name": name, "ph": "C", "pid": self.pid, "tid": 0,
+                "ts": round(self._now_us(), 1), "args": {name: total},
+            })
+
+    def gauge(self, name, value):
+        """누적하지 않고 현재 값 그대로 카운터 트랙에 기록합니다 (메모리 사용량 등)."""
+        with self._lock:
+            self.events.append({
+                "name": name, "ph": "C", "pid": self.pid, "tid": 0,
+                "ts": round(self._now_us(), 1), "args": {name: value},
+            })
+
+    def add_section(self, key, data, text=None):
+        """트레이스 JSON의 metadata[key]에 data를 넣고, text가 있으면 요약 끝에 덧붙입니다."""
+        with self._lock:
+            self.metadata[key] = data
+            if text:
+                self.summary_sections.append(text)
+
+    def stage_totals(self):
+        """span 이름별 (횟수, 합계 초, 최대 초)를 반환합니다."""
+        totals = {}
+        with self._lock:
+            events = [e for e in self.events if e["ph"] == "X"]
+        for e in events:
+            count, total, longest = totals.get(e["name"], (0, 0.0, 0.0))
+            dur = e["dur"] / 1_000_000
+            totals[e["name"]] = (count + 1, total + dur, max(longest, dur))
+        return totals
+
+    def format_summary(self):
+        lines = ["단계별 소요 시간 (횟수 / 합계 / 최대):"]
+        totals = sorted(self.stage_totals().items(), key=lambda kv: kv[1][1], reverse=True)
+        for name, (count, total, longest) in totals:
+            lines.append(f"  {name}: {count}회 / {total:.2f}초 / {longest:.2f}초")
+        if self.counters:
+            lines.append("카운터:")
+            for name, value in sorted(self.counters.items()):
+                if name.endswith("bytes"):
+                    lines.append(f"  {name}: {value / 1024:.1f} KB")
+                else:
+                    lines.append(f"  {name}: {value}")
+        lines.extend(self.summary_sections)
+        return "\n".join(lines)
+
+    def write(self, path):
+        """trace-event JSON 파일로 저장하고 경로를 반환합니다."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        events.append({"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": self.name}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "metadata": self.metadata}, f, ensure_ascii=False)
+        return path
+
+def get_tracer():
+    return _current_tracer.get()
+
+@contextmanager
+def use_tracer(tracer):
+    """with 블록(및 그 안에서 생성된 태스크) 동안 tracer를 현재 트레이서로 설정합니다."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+@contextmanager
+def span(name, cat="export", **args):
+    """현재 트레이서가 있으면 구간을 기록하고, 없으면 아무것도 하지 않습니다."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, cat, **args) as span_args:
+        yield span_args
+
+def count(name, value=1):
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        tracer.count(name, value)
+
+async def traced_api_call(name, awaitable):
+    """Notion API 호출을 구간으로 기록하고 호출 수를 집계합니다.
+    응답 크기(notion.response_bytes)는 응답을 다시 직렬화하지 않도록 notion_transport가 받은 바이트 수로 집계합니다."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return await awaitable
+    with tracer.span(name, cat="notion"):
+        response = await awaitable
+    tracer.count("notion.api_calls")
+    return response
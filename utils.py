@@ -13,6 +13,8 @@ def _title_starts_with_hide_emoji(title: str) -> bool:
 
 def has_hide_marker(page_info) -> bool:
     """페이지의 아이콘 또는 타이틀 선두 이모지로 숨김 여부를 판별합니다."""
+    if isinstance(page_info, PageMeta):
+        return page_info.hidden
     try:
         # 페이지 아이콘(emoji) 우선 확인
         icon = page_info.get('icon')
@@ -37,6 +39,8 @@ def extract_page_title(page_info):
     - 숨김 마커(페이지 아이콘 또는 타이틀 선두 이모지)가 있으면 빈 문자열을 반환합니다.
     - 과거 호환: 괄호 규칙은 제거하고, 이모지 기반만 사용합니다.
     """
+    if isinstance(page_info, PageMeta):
+        return "" if page_info.hidden else page_info.title
     try:
         if has_hide_marker(page_info):
             return ""
@@ -53,6 +57,8 @@ def extract_page_title(page_info):
 
 def extract_page_title_raw(page_info):
     """괄호 필터 없이 원본 타이틀 그대로 추출합니다."""
+    if isinstance(page_info, PageMeta):
+        return page_info.title
     try:
         properties = page_info.get('properties', {})
         for _, prop_data in properties.items():
@@ -80,5 +86,65 @@ def strip_hide_marker_from_title(title: str) -> str:
 
 def extract_page_title_for_tree(page_info) -> str:
     """트리에 표시할 제목: 원본 제목에서 숨김 이모지는 보이지 않게 제거합니다."""
+    if isinstance(page_info, PageMeta):
+        return page_info.tree_title
     raw = extract_page_title_raw(page_info)
-    return strip_hide_marker_from_title(raw)
\ No newline at end of file
+    return strip_hide_marker_from_title(raw)
+
+class PageMeta:
+    """페이지 메타데이터 요약 레코드. Notion 페이지 JSON 대신 보관합니다.
+    제목과 숨김 여부는 수집 시점에 한 번만 계산합니다.
+    """
+    __slots__ = ("id", "parent_type", "parent_id", "title", "tree_title", "icon",
+                 "hidden", "last_edited_time", "archived")
+
+    def __init__(self, id, title="Untitled", parent_type="workspace", parent_id=None, icon=None,
+                 hidden=False, last_edited_time=None, archived=False):
+        self.id = id
+        self.parent_type = parent_type
+        self.parent_id = parent_id
+        self.title = title
+        self.tree_title = strip_hide_marker_from_title(title)
+        self.icon = icon
+        self.hidden = hidden
+        self.last_edited_time = last_edited_time
+        self.archived = archived
+
+    @classmethod
+    def from_page(cls, page_info):
+        """Notion 페이지 JSON(dict)에서 만듭니다. 이미 PageMeta면 그대로 반환합니다."""
+        if isinstance(page_info, PageMeta):
+            return page_info
+        parent = page_info.get('parent') or {}
+        parent_type = parent.get('type', '')
+        if parent_type == 'data_source_id' and parent.get('database_id'):
+            # API 2025-09-03부터 행의 부모는 데이터 소스이지만, 트리에서는 데이터베이스 기준으로 다룸
+            parent_type = 'database_id'
+        icon = page_info.get('icon') or {}
+        return cls(
+            page_info['id'],
+            title=extract_page_title_raw(page_info),
+            parent_type=parent_type,
+            parent_id=parent.get(parent_type) if parent_type in ('page_id', 'database_id', 'block_id') else None,
+            icon=icon.get('emoji') if icon.get('type') == 'emoji' else None,
+            hidden=has_hide_marker(page_info),
+            last_edited_time=page_info.get('last_edited_time'),
+            archived=bool(page_info.get('archived') or page_info.get('in_trash')),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        del data['tree_title']
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, PageMeta):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"PageMeta({self.id!r}, {self.title!r})"
\ No newline at end of file
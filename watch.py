@@ -0,0 +1,178 @@
+"""선택한 페이지가 바뀌면 PDF를 자동으로 다시 만드는 watch 모드.
+
+    python -m watch <page_id> [<page_id> ...] -o My_Portfolio.pdf [--children] [--optimize ebook]
+
+- 수정 시각 내림차순 검색(대개 호출 1회)으로 마지막 확인 이후 바뀐 페이지를 찾아, 선택한 페이지만 골라냅니다.
+- 변경이 없으면 확인 간격을 점점 늘리고(최대 WATCH_MAX_INTERVAL_SEC), 변경이 생기면 최소 간격으로 돌아갑니다.
+- 마지막 변경 후 WATCH_DEBOUNCE_SEC 동안 추가 변경이 없을 때 한 번만 다시 내보내며, 바뀐 페이지만 다시 렌더링합니다.
+"""
+import sys
+import time
+import asyncio
+import argparse
+from config import WATCH_MIN_INTERVAL_SEC, WATCH_MAX_INTERVAL_SEC, WATCH_BACKOFF, WATCH_DEBOUNCE_SEC, PDF_OPTIMIZE_PRESET
+from export_manifest import ExportManifest, STATUS_DONE
+from exporter import export_and_merge_pdf
+from notion_api import create_notion_client, search_pages_edited_since, get_first_child_page_ids
+from rate_limit import ThrottledNotionClient
+from tracing import count
+
+class ExportWatcher:
+    """page_ids를 output_path로 내보내고, 페이지가 바뀔 때마다 바뀐 페이지만 다시 렌더링해 병합합니다.
+    페이지별 PDF와 렌더링 당시의 수정 시각은 ExportManifest에 남겨, 다시 시작해도 바뀐 페이지만 렌더링합니다.
+    on_event(메시지)로 진행 상황을 알립니다.
+    """
+
+    def __init__(self, page_ids, output_path, notion_client=None, optimize_preset=None,
+                 min_interval=WATCH_MIN_INTERVAL_SEC, max_interval=WATCH_MAX_INTERVAL_SEC, backoff=WATCH_BACKOFF,
+                 debounce=WATCH_DEBOUNCE_SEC, on_event=print, clock=time.monotonic):
+        self.page_ids = list(dict.fromkeys(page_ids))
+        self.output_path = output_path
+        self.notion = notion_client or create_notion_client()
+        # 변경 확인은 배경 작업이므로 내보내기/화면 요청에 호출 한도를 양보
+        self.poll_client = ThrottledNotionClient(self.notion, low_priority=True)
+        self.optimize_preset = optimize_preset
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.debounce = debounce
+        self.on_event = on_event
+        self.clock = clock
+        self.interval = min_interval
+        self.last_edited = {}
+        self.since = None
+        self.pending = set()
+        self.last_change_at = None
+        self.rebuilds = 0
+        self._watched = set(self.page_ids)
+
+    def _observe(self, pages):
+        """검색 결과로 확인 기준 시각을 옮기고, 수정 시각이 달라진 선택 페이지 ID를 반환합니다."""
+        changed = []
+        for page in pages:
+            edited = page.last_edited_time
+            if edited and (self.since is None or edited > self.since):
+                self.since = edited
+            if page.id in self._watched and edited and self.last_edited.get(page.id) != edited:
+                self.last_edited[page.id] = edited
+                changed.append(page.id)
+        return changed
+
+    async def snapshot(self):
+        """시작할 때 한 번 전체 검색으로 선택 페이지의 현재 수정 시각과 확인 기준 시각을 정합니다."""
+        self._observe(await search_pages_edited_since(self.poll_client, None))
+
+    async def poll(self):
+        """마지막 확인 이후 바뀐 선택 페이지 ID 목록을 반환합니다.
+        Notion의 수정 시각은 분 단위라 같은 분의 페이지가 다시 나오지만, 수정 시각이 같으면 변경으로 보지 않습니다."""
+        count("watch.polls")
+        return self._observe(await search_pages_edited_since(self.poll_client, self.since))
+
+    async def rebuild(self, changed_ids=None):
+        """바뀐 페이지(와 렌더링된 결과가 없거나 렌더링 뒤 수정된 페이지)만 다시 렌더링하고 병합합니다."""
+        manifest = ExportManifest.open(self.page_ids, self.output_path)
+        edited_at_start = dict(self.last_edited)
+        stale = [entry["page_id"] for entry in manifest.pages
+                 if entry.get("last_edited_time") != edited_at_start.get(entry["page_id"])]
+        manifest.invalidate(set(changed_ids or ()) | set(stale))
+        pending = len(manifest.pending_indexes())
+        if not pending:
+            self.on_event("변경된 페이지 없음: 다시 내보내지 않습니다")
+            return self.output_path
+        self.on_event(f"다시 내보내는 중: {pending}/{len(self.page_ids)}개 페이지")
+        start_time = time.perf_counter()
+        result = await export_and_merge_pdf(self.page_ids, self.output_path, notion_client=self.notion,
+                                            optimize_preset=self.optimize_preset, manifest=manifest, keep_artifacts=True,
+                                            edited_times=edited_at_start)
+        # 렌더링을 시작할 때 알던 수정 시각을 기록 (렌더링 중에 바뀐 페이지는 다음 확인 때 다시 잡힘)
+        for entry in manifest.pages:
+            if entry["status"] == STATUS_DONE:
+                entry["last_edited_time"] = edited_at_start.get(entry["page_id"])
+        manifest.save()
+        self.rebuilds += 1
+        count("watch.rebuilds")
+        failure_report = manifest.format_failure_report()
+        self.on_event(f"다시 내보내기 완료 ({time.perf_counter() - start_time:.1f}초): {result}"
+                      + (f"\n{failure_report}" if failure_report else ""))
+        return result
+
+    def next_delay(self):
+        """다음 확인까지 기다릴 시간. 다시 내보내기를 기다리는 중이면 디바운스가 끝나는 시각을 넘기지 않습니다."""
+        if self.pending:
+            remaining = self.debounce - (self.clock() - self.last_change_at)
+            return max(0.0, min(self.interval, remaining))
+        return self.interval
+
+    async def step(self):
+        """한 번 확인하고, 디바운스가 끝났으면 다시 내보냅니다."""
+        try:
+            changed = await self.poll()
+        except Exception as e:
+            self.on_event(f"변경 확인 오류: {e}")
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            return
+        now = self.clock()
+        if changed:
+            self.pending.update(changed)
+            self.last_change_at = now
+            self.interval = self.min_interval
+            self.on_event(f"변경 감지: {len(changed)}개 페이지 (대기 중 {len(self.pending)}개)")
+        elif not self.pending:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        if self.pending and now - self.last_change_at >= self.debounce:
+            changed_ids, self.pending = self.pending, set()
+            try:
+                await self.rebuild(changed_ids)
+            except Exception as e:
+                self.on_event(f"다시 내보내기 실패: {e}")
+
+    async def run(self, stop_event=None):
+        """stop_event가 설정될 때까지 변경을 확인하며 다시 내보냅니다."""
+        stop_event = stop_event or asyncio.Event()
+        await self.snapshot()
+        await self.rebuild()
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), self.next_delay())
+                break
+            except asyncio.TimeoutError:
+                pass
+            await self.step()
+
+async def expand_first_children(notion, page_ids):
+    """화면의 내보내기와 같이, 하위 페이지가 있는 페이지는 첫 번째 하위 페이지들로 바꿉니다."""
+    expanded = []
+    for page_id in page_ids:
+        expanded.extend(await get_first_child_page_ids(page_id, notion) or [page_id])
+    return list(dict.fromkeys(expanded))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지가 바뀌면 PDF를 자동으로 다시 내보냅니다")
+    parser.add_argument("page_ids", nargs="+")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--children", action="store_true", help="선택한 페이지 대신 첫 번째 하위 페이지들을 내보냄 (화면과 같은 방식)")
+    parser.add_argument("--optimize", nargs="?", const=PDF_OPTIMIZE_PRESET, default=None, help="병합 후 용량 최적화 프리셋")
+    parser.add_argument("--min-interval", type=float, default=WATCH_MIN_INTERVAL_SEC)
+    parser.add_argument("--max-interval", type=float, default=WATCH_MAX_INTERVAL_SEC)
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE_SEC)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    async def run():
+        notion = create_notion_client()
+        page_ids = await expand_first_children(notion, args.page_ids) if args.children else args.page_ids
+        watcher = ExportWatcher(page_ids, args.output, notion, args.optimize, args.min_interval, args.max_interval,
+                                debounce=args.debounce)
+        print(f"감시 시작: {len(watcher.page_ids)}개 페이지 -> {args.output} (Ctrl+C로 종료)")
+        await watcher.run()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import json
+from config import WORKSPACE_SNAPSHOT_PATH
+from notion_api import is_root_page
+from utils import PageMeta
+
+SNAPSHOT_VERSION = 3
+
+class WorkspaceSnapshot:
+    """워크스페이스 페이지 메타데이터와 부모/자식 그래프의 로컬 스냅샷.
+    - pages: {페이지 ID: PageMeta}
+    - tree: {부모 ID: [자식 ID, ...]} (본문 순서 기준, BuildFullTreeThread 결과)
+    - last_sync: 마지막 동기화 시점까지 본 가장 최근 last_edited_time
+    - top_level_databases: 워크스페이스 바로 아래 있는 데이터베이스 ID (그 행은 루트 페이지)
+    """
+
+    def __init__(self, pages=None, tree=None, last_sync=None, path=WORKSPACE_SNAPSHOT_PATH, top_level_databases=None):
+        self.pages = pages or {}
+        self.tree = tree or {}
+        self.last_sync = last_sync
+        self.path = path
+        self.top_level_databases = set(top_level_databases or ())
+
+    @classmethod
+    def from_pages(cls, all_pages, path=WORKSPACE_SNAPSHOT_PATH, root_pages=None):
+        """root_pages(get_root_pages 결과)가 있으면 루트인 데이터베이스 행에서 최상위 데이터베이스 ID를 기록해,
+        스냅샷에서 다시 만든 루트 목록이 get_root_pages와 같게 합니다."""
+        top_level_databases = {page.parent_id for page in root_pages or () if page.parent_type == "database_id"}
+        snapshot = cls(path=path, top_level_databases=top_level_databases)
+        snapshot.apply_changes(all_pages)
+        return snapshot
+
+    @classmethod
+    def load(cls, path=WORKSPACE_SNAPSHOT_PATH):
+        """저장된 스냅샷을 읽습니다. 없거나 형식이 맞지 않으면 None."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SNAPSHOT_VERSION:
+            return None
+        pages = {page_id: PageMeta.from_dict(page) for page_id, page in (data.get("pages") or {}).items()}
+        return cls(pages, data.get("tree"), data.get("last_sync"), path, data.get("top_level_databases"))
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            pages = {page_id: page.to_dict() for page_id, page in self.pages.items()}
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": SNAPSHOT_VERSION, "pages": pages, "tree": self.tree,
+                           "last_sync": self.last_sync,
+                           "top_level_databases": sorted(self.top_level_databases)}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"워크스페이스 스냅샷 저장 오류: {e}")
+
+    def root_pages(self):
+        page_ids = set(self.pages)
+        return [page for page in self.pages.values() if is_root_page(page, page_ids, self.top_level_databases)]
+
+    def all_pages(self):
+        return list(self.pages.values())
+
+    def children_of(self, page_id):
+        return [self.pages[cid] for cid in self.tree.get(page_id, []) if cid in self.pages]
+
+    def tree_pages(self):
+        """{부모 ID: [자식 페이지]} 형태로 반환합니다 (on_full_tree_ready 입력 형식)."""
+        return {parent_id: self.children_of(parent_id) for parent_id in self.tree}
+
+    def set_children(self, parent_id, children_pages):
+        for page in children_pages:
+            self.pages[page.id] = page
+        self.tree[parent_id] = [page.id for page in children_pages]
+
+    def set_tree(self, parent_to_children):
+        self.tree = {}
+        for parent_id, children_pages in parent_to_children.items():
+            self.set_children(parent_id, children_pages)
+
+    def apply_changes(self, changed_pages):
+        """변경된 페이지 목록을 반영하고 diff를 반환합니다.
+        반환값: {"added": [...], "updated": [...], "removed": [...]} (페이지 ID 목록)
+        """
+        diff = {"added": [], "updated": [], "removed": []}
+        for page in changed_pages:
+            page_id = page.id
+            edited = page.last_edited_time
+            if edited and (not self.last_sync or edited > self.last_sync):
+                self.last_sync = edited
+            if page.archived:
+                if self.pages.pop(page_id, None) is not None:
+                    self.tree.pop(page_id, None)
+                    for children in self.tree.values():
+                        if page_id in children:
+                            children.remove(page_id)
+                    diff["removed"].append(page_id)
+                continue
+            previous = self.pages.get(page_id)
+            if previous is None:
+                diff["added"].append(page_id)
+            elif previous != page:
+                diff["updated"].append(page_id)
+            self.pages[page_id] = page
+        return diff